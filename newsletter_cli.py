@@ -0,0 +1,1109 @@
+"""
+AIDT Weekly 뉴스레터 명령줄 도구
+
+Streamlit 화면 없이 발송 등의 작업을 실행하고, 로컬 테스트용 대체 서버를 띄웁니다.
+
+    $ python newsletter_cli.py smtp-debug --port 1025
+    $ python newsletter_cli.py generate --issue 12 --editions ko,en --profile
+    $ python newsletter_cli.py send --html issue.html --recipients subscribers.csv --sender news@example.com
+    $ python newsletter_cli.py retry
+    $ python newsletter_cli.py bench-merge --count 10000
+    $ python newsletter_cli.py stub-backends --openai-latency 2.0
+    $ python newsletter_cli.py load-test --concurrency 1,2,4,8
+    $ python newsletter_cli.py rerender-archive --workers 8
+    $ python newsletter_cli.py precompute-evergreen --start 12 --count 8 --wait
+"""
+import argparse
+import base64
+import json
+import os
+import random
+import re
+import socket
+import socketserver
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.parser import BytesParser
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import requests
+from PIL import Image
+
+import streamlit_app as app
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """발송 테스트에 필요한 최소한의 SMTP 명령(EHLO/MAIL/RCPT/DATA/RSET/NOOP/QUIT)만 처리합니다."""
+
+    def _reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode("ascii"))
+
+    def handle(self):
+        server = self.server
+        mail_from = None
+        rcpts = []
+        self._reply("220 localhost AIDT debug SMTP ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode("utf-8", "replace").strip()
+            verb = command[:4].upper()
+            if verb in ("EHLO", "HELO"):
+                if verb == "EHLO":
+                    self._reply("250-localhost")
+                    self._reply("250-8BITMIME")
+                    self._reply("250 SIZE 52428800")
+                else:
+                    self._reply("250 localhost")
+            elif verb == "MAIL":
+                mail_from = command[10:].strip()
+                rcpts = []
+                self._reply("250 OK")
+            elif verb == "RCPT":
+                address = command[8:].strip().strip("<>")
+                domain = address.rpartition("@")[2].lower()
+                if domain in server.tempfail_domains:
+                    self._reply("451 4.3.0 Temporary failure, try again later")
+                elif domain in server.reject_domains:
+                    self._reply("550 5.1.1 Mailbox unavailable")
+                else:
+                    rcpts.append(address)
+                    self._reply("250 OK")
+            elif verb == "DATA":
+                if not rcpts:
+                    self._reply("503 5.5.1 No valid recipients")
+                    continue
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                chunks = []
+                while True:
+                    data_line = self.rfile.readline()
+                    if not data_line or data_line in (b".\r\n", b".\n"):
+                        break
+                    if data_line.startswith(b".."):
+                        data_line = data_line[1:]
+                    chunks.append(data_line)
+                if server.latency:
+                    time.sleep(server.latency)
+                server.store(mail_from, rcpts, b"".join(chunks))
+                rcpts = []
+                self._reply("250 OK: queued")
+            elif verb == "RSET":
+                mail_from = None
+                rcpts = []
+                self._reply("250 OK")
+            elif verb == "NOOP":
+                self._reply("250 OK")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 5.5.2 Command not implemented")
+
+
+class LocalDebugSMTPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """
+    발송 기능을 끝까지 테스트하기 위한 로컬 SMTP 서버입니다.
+    받은 메시지 수를 세고, maildir을 지정하면 .eml 파일로 저장합니다.
+    tempfail_domains/reject_domains의 수신자는 각각 451/550으로 거부합니다.
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host="127.0.0.1", port=1025, maildir=None, latency=0.0, tempfail_domains=(), reject_domains=()):
+        super().__init__((host, port), _SMTPHandler)
+        self.maildir = maildir
+        self.latency = latency
+        self.tempfail_domains = {domain.lower() for domain in tempfail_domains}
+        self.reject_domains = {domain.lower() for domain in reject_domains}
+        self.message_count = 0
+        self.recipient_count = 0
+        self._lock = threading.Lock()
+        if maildir:
+            os.makedirs(maildir, exist_ok=True)
+
+    def store(self, mail_from, rcpts, data):
+        with self._lock:
+            self.message_count += 1
+            self.recipient_count += len(rcpts)
+            number = self.message_count
+        if self.maildir:
+            with open(os.path.join(self.maildir, f"{number:07d}.eml"), "wb") as f:
+                f.write(data)
+
+    def start(self):
+        """백그라운드 스레드에서 서버를 시작하고 자기 자신을 반환합니다."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class _StubBackendHandler(BaseHTTPRequestHandler):
+    """NewsAPI, 네이버 검색 API, OpenAI Chat Completions의 응답 형식만 흉내 내는 요청 처리기입니다."""
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        parsed = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        if parsed.path == "/_stats":
+            self._send_json(server.stats())
+        elif parsed.path == "/v2/everything":
+            server.delay("newsapi")
+            self._send_json(server.newsapi_response(params.get("q", ""), int(params.get("pageSize", 20)), int(params.get("page", 1))))
+        elif parsed.path in ("/v1/search/news.json", "/v1/search/blog.json"):
+            server.delay("naver")
+            self._send_json(server.naver_response(params.get("query", ""), int(params.get("display", 10)), parsed.path.endswith("blog.json")))
+        elif re.search(r"/batches/[^/]+$", parsed.path) and parsed.path.rsplit("/", 1)[1] in server.batches:
+            self._send_json(server.batch(parsed.path.rsplit("/", 1)[1]))
+        elif re.search(r"/files/[^/]+/content$", parsed.path) and parsed.path.split("/")[-2] in server.files:
+            self._send_bytes(server.files[parsed.path.split("/")[-2]]["data"])
+        elif re.fullmatch(r"/images/\d+/\d+\.jpg", parsed.path):
+            server.delay("images")
+            self._send_bytes(server.image(parsed.path), "image/jpeg")
+        elif re.fullmatch(r"/(articles|naver)/\d+/\d+", parsed.path):
+            server.delay("pages")
+            self._send_bytes(server.article_page(parsed.path).encode("utf-8"), "text/html; charset=utf-8")
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        path = urlparse(self.path).path
+        if path.endswith("/files"):
+            self._send_json(server.upload_file(self.headers.get("Content-Type", ""), body))
+        elif path.endswith("/batches"):
+            self._send_json(server.create_batch(json.loads(body or b"{}")))
+        elif path.endswith("/chat/completions"):
+            server.delay("openai")
+            self._send_json(server.openai_response(json.loads(body or b"{}")))
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def _send_bytes(self, data, content_type="application/octet-stream"):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class StubBackendServer(ThreadingHTTPServer):
+    """
+    부하 테스트용 로컬 대체 백엔드입니다. 외부 API 대신 고정된 형식의 응답을 돌려주며,
+    백엔드별 응답 지연(초)과 지연 편차(jitter, 비율)를 설정할 수 있습니다.
+    앱에서는 NEWSAPI_BASE_URL, NAVER_API_BASE_URL, OPENAI_BASE_URL(.../v1)로 이 서버를 가리키게 합니다.
+    OpenAI Batch API(파일 업로드, 작업 생성/조회, 결과 파일 다운로드)도 흉내 내며, 작업은 OpenAI 응답 지연 한 번 뒤에 완료됩니다.
+    기사 링크는 대표 이미지(og:image)가 있는 원문 페이지를, 이미지 주소는 JPEG 이미지를 돌려줍니다.
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host="127.0.0.1", port=8765, newsapi_latency=0.3, naver_latency=0.1, openai_latency=2.0,
+                 jitter=0.2, articles=40, image_latency=0.1):
+        super().__init__((host, port), _StubBackendHandler)
+        self.latencies = {"newsapi": newsapi_latency, "naver": naver_latency, "openai": openai_latency,
+                          "images": image_latency, "pages": image_latency}
+        self.jitter = jitter
+        self.articles = articles
+        self.request_counts = {backend: 0 for backend in self.latencies}
+        self.files = {}
+        self.batches = {}
+        self.images = {}
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def delay(self, backend):
+        with self._lock:
+            self.request_counts[backend] += 1
+        latency = self.latencies[backend] * random.uniform(1 - self.jitter, 1 + self.jitter)
+        if latency > 0:
+            time.sleep(latency)
+
+    def stats(self):
+        with self._lock:
+            return {"requests": dict(self.request_counts), "latencies": dict(self.latencies), "jitter": self.jitter}
+
+    def newsapi_response(self, query, page_size=20, page=1):
+        """NewsAPI처럼 전체 기사 중 요청한 페이지(기본 20건)만 돌려줍니다."""
+        now = datetime.now(timezone.utc)
+        articles = [
+            {
+                "source": {"id": None, "name": f"Stub News {i % 5}"},
+                "title": f"{query} update {i}: AI transformation in telecom networks",
+                "description": f"Operators report results from AI pilots ({i}).",
+                "url": f"{self.url}/articles/{abs(hash(query)) % 10000}/{i}",
+                "urlToImage": f"{self.url}/images/{abs(hash(query)) % 10000}/{i}.jpg",
+                "publishedAt": (now - timedelta(hours=i)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            }
+            for i in range((page - 1) * page_size, min(page * page_size, self.articles))
+        ]
+        return {"status": "ok", "totalResults": self.articles, "articles": articles}
+
+    def naver_response(self, query, display, blog=False):
+        now = datetime.now(timezone.utc)
+        items = []
+        for i in range(min(display, self.articles)):
+            item = {
+                "title": f"<b>{query}</b> 관련 소식 {i}",
+                "description": f"{query}에 대한 국내 사례와 동향을 정리했습니다 ({i}).",
+                "link": f"{self.url}/naver/{abs(hash(query)) % 10000}/{i}",
+            }
+            if blog:
+                item["bloggername"] = f"스텁 블로그 {i % 3}"
+            else:
+                item["originallink"] = item["link"]
+                item["pubDate"] = format_datetime(now - timedelta(hours=i))
+            items.append(item)
+        return {"total": len(items), "display": len(items), "items": items}
+
+    def image(self, path):
+        """경로마다 색이 다른 기사 대표 이미지(1200x630 JPEG)를 만들어 돌려줍니다."""
+        with self._lock:
+            if path not in self.images:
+                seed = sum(int(part) for part in re.findall(r"\d+", path))
+                image = Image.new("RGB", (1200, 630), ((seed * 37) % 256, (seed * 71) % 256, (seed * 113) % 256))
+                buffer = BytesIO()
+                image.save(buffer, "JPEG", quality=90)
+                self.images[path] = buffer.getvalue()
+            return self.images[path]
+
+    def article_page(self, path):
+        """대표 이미지(og:image)와 본문 문단이 있는 기사 원문 페이지"""
+        _, kind, group, index = path.split("/")
+        paragraphs = "".join(
+            f"<p>스텁 기사 {index}의 본문 {n}번째 문단입니다. 실제 기사와 비슷한 길이로 통신 분야 AI 도입 사례와 성과를 설명합니다.</p>"
+            for n in range(1, 6)
+        )
+        return (
+            f'<html><head><title>Stub article {index}</title>'
+            f'<meta property="og:image" content="/images/{group}/{index}.jpg"></head>'
+            f"<body><article><h1>Stub article {index}</h1>{paragraphs}</article></body></html>"
+        )
+
+    def openai_response(self, request):
+        messages = request.get("messages") or [{}]
+        prompt = messages[-1].get("content") or ""
+        if "JSON" in (messages[0].get("content") or ""):
+            # 번역/기사 평가 요청: 입력의 기사 번호마다 항목 하나씩
+            ids = sorted({int(i) for i in re.findall(r'"id": (\d+)', prompt) + re.findall(r"^\s*\[(\d+)\]", prompt, re.MULTILINE)})
+            content = json.dumps(
+                [{"id": i, "score": 10 - i % 10, "summary": f"스텁 요약 {i}", "title": f"스텁 제목 {i}", "description": f"스텁 설명 {i}"} for i in ids],
+                ensure_ascii=False
+            )
+        elif "AT/DT 팁" in prompt:
+            templates = "".join(
+                f"- {n} 프롬프트 템플릿 (Chain of Thought 활용):\n  예시: 주간 장애 보고서 요약\n  프롬프트: 단계별로 원인과 조치를 정리해 주세요.\n\n"
+                for n in ("첫 번째", "두 번째", "세 번째")
+            )
+            content = (
+                "## 이번 주 팁: 스텁 팁 제목\n\n스텁 팁의 배경 설명입니다. 실제 모델 출력과 비슷한 길이의 문단입니다.\n\n"
+                f"**핵심 프롬프트 예시:**\n{templates}이 팁을 활용하면 보고서 작성 시간이 줄어듭니다."
+            )
+        elif "주요 소식" in prompt:
+            links = re.findall(r"URL: (\S+)", prompt)[:2] or ["https://example.com"]
+            content = "".join(
+                f"## 스텁 주요 소식 {n}은 주목할만합니다.\n\n스텁 주요 소식 요약 문장입니다. 실제 모델 출력과 비슷한 길이의 문단입니다. [출처]({link})\n\n"
+                for n, link in enumerate(links, 1)
+            )
+        elif "성공 사례" in prompt:
+            content = "".join(
+                f"## 스텁{n} 기업의 AI 혁신 사례\n\n" + "스텁 성공 사례 단락입니다. 실제 모델 출력과 비슷한 길이의 문단입니다.\n\n" * 3
+                for n in ("한국", "해외")
+            )
+        else:
+            content = "## 스텁 응답 제목\n\n부하 테스트용 스텁 응답입니다. 실제 모델 출력과 비슷한 길이의 문단입니다.\n\n" * 2
+        prompt_tokens = sum(len(m.get("content") or "") for m in messages) // 3
+        completion_tokens = len(content) // 3
+        return {
+            "id": f"chatcmpl-stub-{random.getrandbits(32):08x}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "stub"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens},
+        }
+
+    def upload_file(self, content_type, body):
+        """multipart/form-data로 올라온 파일을 보관하고 파일 객체를 반환합니다."""
+        message = BytesParser().parsebytes(f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body)
+        fields = {part.get_param("name", header="content-disposition"): part for part in message.get_payload()}
+        part = fields["file"]
+        file_id = f"file-stub-{random.getrandbits(32):08x}"
+        data = part.get_payload(decode=True)
+        with self._lock:
+            self.files[file_id] = {"data": data, "filename": part.get_filename() or "upload.jsonl"}
+        purpose = fields["purpose"].get_payload(decode=True).decode("utf-8") if "purpose" in fields else "batch"
+        return {"id": file_id, "object": "file", "bytes": len(data), "created_at": int(time.time()),
+                "filename": self.files[file_id]["filename"], "purpose": purpose, "status": "processed"}
+
+    def create_batch(self, request):
+        """입력 파일의 요청을 백그라운드에서 처리하는 일괄 작업을 만들고 작업 객체를 반환합니다."""
+        batch_id = f"batch_stub_{random.getrandbits(32):08x}"
+        lines = [json.loads(line) for line in self.files[request["input_file_id"]]["data"].decode("utf-8").splitlines() if line.strip()]
+        batch = {
+            "id": batch_id, "object": "batch", "endpoint": request.get("endpoint", "/v1/chat/completions"),
+            "input_file_id": request["input_file_id"], "completion_window": request.get("completion_window", "24h"),
+            "status": "in_progress", "created_at": int(time.time()), "output_file_id": None, "error_file_id": None,
+            "metadata": request.get("metadata"), "request_counts": {"total": len(lines), "completed": 0, "failed": 0},
+        }
+        with self._lock:
+            self.batches[batch_id] = batch
+        threading.Thread(target=self._run_batch, args=(batch_id, lines), daemon=True).start()
+        return batch
+
+    def batch(self, batch_id):
+        with self._lock:
+            return dict(self.batches[batch_id])
+
+    def _run_batch(self, batch_id, lines):
+        self.delay("openai")
+        output = []
+        for line in lines:
+            output.append(json.dumps({
+                "id": f"batch_req_{random.getrandbits(32):08x}",
+                "custom_id": line["custom_id"],
+                "response": {"status_code": 200, "request_id": f"req_{random.getrandbits(32):08x}", "body": self.openai_response(line["body"])},
+                "error": None,
+            }, ensure_ascii=False))
+        file_id = f"file-stub-{random.getrandbits(32):08x}"
+        with self._lock:
+            self.files[file_id] = {"data": "\n".join(output).encode("utf-8"), "filename": f"{batch_id}_output.jsonl"}
+            self.batches[batch_id].update(
+                status="completed", output_file_id=file_id, completed_at=int(time.time()),
+                request_counts={"total": len(lines), "completed": len(lines), "failed": 0}
+            )
+
+    def start(self):
+        """백그라운드 스레드에서 서버를 시작하고 자기 자신을 반환합니다."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+def _read_text(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def _smtp_settings(args):
+    return {
+        "host": args.smtp_host,
+        "port": args.smtp_port,
+        "username": args.smtp_user,
+        "password": os.environ.get("SMTP_PASSWORD", ""),
+        "use_tls": args.smtp_tls,
+    }
+
+
+def _print_report(report):
+    summary = {key: report[key] for key in ("issue_id", "total", "sent", "deferred", "failed", "duration_seconds", "report_path")}
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+
+
+def cmd_smtp_debug(args):
+    server = LocalDebugSMTPServer(
+        args.host, args.port, args.maildir, args.latency,
+        tempfail_domains=args.tempfail_domain, reject_domains=args.reject_domain
+    )
+    print(f"로컬 디버그 SMTP 서버 실행 중: {args.host}:{args.port} (종료: Ctrl+C)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"수신한 메시지: {server.message_count}건")
+
+
+def cmd_generate(args):
+    # API 키는 명령줄 기록에 남지 않도록 환경 변수로 전달 (대체 백엔드는 *_BASE_URL로 지정)
+    keys = [os.environ.get(name, "") for name in ("OPENAI_API_KEY", "NEWS_API_KEY", "NAVER_CLIENT_ID", "NAVER_CLIENT_SECRET")]
+    if not keys[0] and not (keys[2] and keys[3]):
+        sys.exit("OPENAI_API_KEY 또는 NAVER_CLIENT_ID/NAVER_CLIENT_SECRET 환경 변수가 필요합니다.")
+    editions = [edition.strip() for edition in args.editions.split(",") if edition.strip()]
+    sections = [section.strip() for section in args.sections.split(",") if section.strip()] if args.sections else None
+    run_id = app.new_run_id()
+    settings = {
+        "news_query_en": args.query_en, "news_query_ko": args.query_ko, "language": args.language,
+        "main_news_mode": args.main_news_mode, "enrich_articles": args.enrich, "sections": sections, "run_id": run_id,
+    }
+    os.makedirs(args.output_dir, exist_ok=True)
+    started = time.perf_counter()
+    with app.profile_run(run_id, enabled=args.profile, interval=args.sampling_interval / 1000, trace_memory=not args.no_tracemalloc) as profiler:
+        issues = app.generate_newsletter_editions(
+            *keys, args.query_en, args.query_ko, args.language, issue_num=args.issue, enrich_articles=args.enrich,
+            main_news_mode=args.main_news_mode, editions=editions, sections=sections, use_thumbnails=not args.no_thumbnails
+        )
+        for edition, issue in issues.items():
+            try:
+                app.archive_issue(issue, dict(settings, edition=edition))
+            except OSError as e:
+                print(f"아카이브 저장 오류: {str(e)}")
+            for name, data in app.build_issue_artifacts(issue, dict(settings, edition=edition)).items():
+                os.makedirs(os.path.dirname(os.path.join(args.output_dir, name)), exist_ok=True)
+                with open(os.path.join(args.output_dir, name), "wb") as f:
+                    f.write(data)
+                print(f"  {os.path.join(args.output_dir, name)}")
+    print(f"실행 {run_id}: {len(issues)}개 에디션 생성 ({time.perf_counter() - started:.2f}초)")
+    if profiler is not None and profiler.summary:
+        summary = profiler.summary
+        print(f"프로파일: {summary['directory']} (CPU 샘플 {summary['cpu_samples']}개, 최대 추적 메모리 {summary.get('memory_peak_mb', '-')} MB)")
+        for row in summary["top_functions"][:10]:
+            print(f"  {row['자체 시간(초)']:>7.3f}s  {row['누적 시간(초)']:>7.3f}s  {row['함수']}")
+
+
+def cmd_send(args):
+    recipients = app.parse_recipients(_read_text(args.recipients))
+    if not recipients:
+        sys.exit("발송할 수신자가 없습니다.")
+    body = _read_text(args.html)
+    if args.compact:
+        # 인라인 CSS로 만든 파일은 클래스를 무시하는 클라이언트를 위해 style 속성을 그대로 둠
+        body = app.compact_html(body, dedupe_styles=not args.inlined)
+    size = len(body.encode("utf-8"))
+    if args.budget_kb and size > args.budget_kb * 1024:
+        sys.exit(f"본문 크기 {size / 1024:.1f}KB가 예산 {args.budget_kb}KB를 넘습니다. (--compact로 축약하거나 --budget-kb 0으로 검사 생략)")
+    report = app.send_newsletter_bulk(
+        body, args.subject, recipients, args.sender, _smtp_settings(args),
+        max_workers=args.workers, batch_size=args.batch_size,
+        per_domain_concurrency=args.domain_concurrency, per_domain_rate=args.domain_rate
+    )
+    _print_report(report)
+
+
+def cmd_retry(args):
+    reports = app.process_retry_queue(
+        _smtp_settings(args), max_workers=args.workers,
+        per_domain_concurrency=args.domain_concurrency, per_domain_rate=args.domain_rate
+    )
+    if not reports:
+        print("재시도할 발송 건이 없습니다.")
+    for report in reports:
+        _print_report(report)
+
+
+def build_sample_issue(merge_slots=True):
+    """벤치마크용으로 기본 콘텐츠만 사용한 뉴스레터 HTML을 만듭니다."""
+    newsletter_content = {
+        "main_news": app.get_default_success_story(),
+        "naver_news": app.get_default_ai_use_case(),
+        "aidt_tips": app.get_default_tips_content(),
+        "ai_use_case": app.get_default_ai_use_case(),
+        "success_story": app.get_default_success_story(),
+    }
+    highlight_settings = {
+        "title": "중부Infra AT/DT 뉴스레터 개시",
+        "subtitle": "AI, 어떻게 시작할지 막막하다면?",
+        "link_text": "AT/DT 추진방향 →",
+        "link_url": "#",
+    }
+    date = app.datetime.now().strftime('%Y년 %m월 %d일')
+    return newsletter_content, highlight_settings, date, app.generate_combined_html_template(
+        newsletter_content, 1, date, highlight_settings, merge_slots=merge_slots
+    )
+
+
+def cmd_bench_merge(args):
+    newsletter_content, highlight_settings, date, issue_html = build_sample_issue()
+    teams = [f"팀{i}" for i in range(args.teams)]
+    team_highlights = {team: {"title": f"{team} 이번 주 소식", "body": f"{team}의 AI 적용 현황을 공유합니다.", "link_url": "#"} for team in teams}
+    recipients = [{"email": f"user{i}@example.com", "name": f"구독자{i}", "team": teams[i % len(teams)]} for i in range(args.count)]
+
+    started = time.perf_counter()
+    renderer = app.MergeRenderer(app.CompiledMergeTemplate(issue_html), team_highlights)
+    compile_seconds = time.perf_counter() - started
+
+    total_bytes = 0
+    started = time.perf_counter()
+    with open(os.devnull, "wb") as out:
+        for recipient in recipients:
+            document = renderer.render(recipient)
+            total_bytes += len(document)
+            out.write(document)
+    merge_seconds = time.perf_counter() - started
+
+    # 비교: 수신자마다 전체 템플릿을 다시 생성하는 방식 (일부만 측정 후 환산)
+    sample = recipients[:min(args.baseline_sample, len(recipients))]
+    started = time.perf_counter()
+    for recipient in sample:
+        app.generate_combined_html_template(newsletter_content, 1, date, highlight_settings).encode("utf-8")
+    baseline_seconds = (time.perf_counter() - started) / max(len(sample), 1) * len(recipients)
+
+    print(f"수신자 수: {len(recipients)}명, 팀 수: {len(teams)}개, 문서 평균 크기: {total_bytes // max(len(recipients), 1)} bytes")
+    print(f"템플릿 컴파일: {compile_seconds * 1000:.2f} ms")
+    print(f"개인화 렌더링: {merge_seconds:.3f} s ({len(recipients) / merge_seconds:,.0f} 건/초)")
+    print(f"전체 템플릿 재생성 방식 (추정): {baseline_seconds:.3f} s")
+    print(f"속도 향상: {baseline_seconds / merge_seconds:.1f}배")
+
+
+def cmd_stub_backends(args):
+    server = StubBackendServer(
+        args.host, args.port, args.newsapi_latency, args.naver_latency, args.openai_latency, args.jitter,
+        image_latency=args.image_latency
+    )
+    print(f"대체 백엔드 실행 중: {server.url} (종료: Ctrl+C)")
+    print(f"  NEWSAPI_BASE_URL={server.url} NAVER_API_BASE_URL={server.url} OPENAI_BASE_URL={server.url}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(server.stats(), ensure_ascii=False))
+
+
+def _process_resources(pid):
+    """프로세스의 상주 메모리(RSS, bytes)와 스레드 수를 /proc에서 읽습니다. 읽을 수 없으면 (None, None)."""
+    rss = threads = None
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    rss = int(line.split()[1]) * 1024
+                elif line.startswith("Threads:"):
+                    threads = int(line.split()[1])
+    except OSError:
+        pass
+    return rss, threads
+
+
+class ResourceSampler:
+    """부하 구간 동안 서버 프로세스의 RSS와 스레드 수를 주기적으로 기록합니다."""
+
+    def __init__(self, pid, interval=0.2):
+        self.pid = pid
+        self.interval = interval
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self):
+        rss, threads = _process_resources(self.pid)
+        if rss is not None:
+            self.samples.append((rss, threads))
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._sample()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        return self
+
+
+class StreamlitSessionClient:
+    """
+    브라우저 대신 Streamlit 서버의 /_stcore/stream WebSocket에 연결하는 최소한의 세션 클라이언트입니다.
+    위젯 값을 담은 재실행 요청(BackMsg)을 보내고, 스크립트 실행이 끝날 때까지 받은 메시지(ForwardMsg)를 모읍니다.
+    """
+
+    def __init__(self, host, port, timeout=300):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        key = base64.b64encode(os.urandom(16)).decode("ascii")
+        self.sock.sendall(
+            f"GET /_stcore/stream HTTP/1.1\r\nHost: {host}:{port}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\nSec-WebSocket-Protocol: streamlit\r\n\r\n".encode("ascii")
+        )
+        self._reader = self.sock.makefile("rb")
+        status = self._reader.readline()
+        if b" 101 " not in status:
+            raise ConnectionError(f"WebSocket 연결 실패: {status.decode('latin-1').strip()}")
+        while self._reader.readline() not in (b"\r\n", b""):
+            pass
+        self.widget_ids = {}
+
+    def _read_exact(self, size):
+        data = self._reader.read(size)
+        if len(data) < size:
+            raise ConnectionError("서버가 연결을 닫았습니다.")
+        return data
+
+    def _send_frame(self, payload, opcode=0x2):
+        # 클라이언트가 보내는 프레임은 항상 마스킹해야 함 (RFC 6455)
+        header = bytearray([0x80 | opcode])
+        if len(payload) < 126:
+            header.append(0x80 | len(payload))
+        elif len(payload) < 65536:
+            header.append(0x80 | 126)
+            header += struct.pack(">H", len(payload))
+        else:
+            header.append(0x80 | 127)
+            header += struct.pack(">Q", len(payload))
+        mask = os.urandom(4)
+        masked = bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+        self.sock.sendall(bytes(header) + mask + masked)
+
+    def _receive_message(self):
+        message = b""
+        while True:
+            first, second = self._read_exact(2)
+            length = second & 0x7F
+            if length == 126:
+                length = struct.unpack(">H", self._read_exact(2))[0]
+            elif length == 127:
+                length = struct.unpack(">Q", self._read_exact(8))[0]
+            if second & 0x80:
+                mask = self._read_exact(4)
+                data = bytes(byte ^ mask[i % 4] for i, byte in enumerate(self._read_exact(length)))
+            else:
+                data = self._read_exact(length)
+            opcode = first & 0x0F
+            if opcode == 0x8:
+                raise ConnectionError("서버가 연결을 닫았습니다.")
+            if opcode == 0x9:
+                self._send_frame(data, 0xA)
+                continue
+            if opcode == 0xA:
+                continue
+            message += data
+            if first & 0x80:
+                return message
+
+    def run(self, widget_values=None, triggers=()):
+        """
+        위젯 값(라벨 기준)과 누를 버튼을 지정해 스크립트를 다시 실행하고 실행이 끝날 때까지 기다립니다.
+        (성공 메시지 목록, 오류 메시지 목록)을 반환합니다.
+        """
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        request = BackMsg()
+        request.rerun_script.query_string = ""
+        for label, value in (widget_values or {}).items():
+            request.rerun_script.widget_states.widgets.append(WidgetState(id=self.widget_ids[label], string_value=value))
+        for label in triggers:
+            request.rerun_script.widget_states.widgets.append(WidgetState(id=self.widget_ids[label], trigger_value=True))
+        self._send_frame(request.SerializeToString())
+
+        successes = []
+        errors = []
+        while True:
+            message = ForwardMsg()
+            message.ParseFromString(self._receive_message())
+            kind = message.WhichOneof("type")
+            if kind == "script_finished":
+                if message.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    errors.append("스크립트 컴파일 오류")
+                if message.script_finished != ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY:
+                    return successes, errors
+            elif kind == "delta" and message.delta.WhichOneof("type") == "new_element":
+                element = message.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type in ("text_input", "button"):
+                    widget = getattr(element, element_type)
+                    self.widget_ids[widget.label] = widget.id
+                elif element_type == "alert":
+                    if element.alert.format == element.alert.SUCCESS:
+                        successes.append(element.alert.body)
+                    elif element.alert.format == element.alert.ERROR:
+                        errors.append(element.alert.body)
+                elif element_type == "exception":
+                    errors.append(f"{element.exception.type}: {element.exception.message}")
+
+    def close(self):
+        try:
+            self._send_frame(b"", 0x8)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+# 부하 테스트 세션이 입력하는 값 (대체 백엔드는 키를 검사하지 않음)
+_LOAD_TEST_INPUTS = {
+    "OpenAI API 키 입력": "stub-openai-key",
+    "News API 키 입력": "stub-newsapi-key",
+    "네이버 Client ID 입력": "stub-naver-id",
+    "네이버 Client Secret 입력": "stub-naver-secret",
+}
+
+
+def _run_session(host, port, iterations, timeout, start_barrier, latencies, failures):
+    """세션 하나를 열어 API 키를 입력하고 '뉴스레터 생성'을 iterations번 누릅니다."""
+    client = None
+    try:
+        client = StreamlitSessionClient(host, port, timeout)
+        client.run()
+    except Exception as e:
+        failures.append(f"세션 연결 실패: {type(e).__name__}: {e}")
+        start_barrier.abort()
+        return
+    try:
+        start_barrier.wait()
+        for _ in range(iterations):
+            started = time.perf_counter()
+            successes, errors = client.run(_LOAD_TEST_INPUTS, triggers=["뉴스레터 생성"])
+            elapsed = time.perf_counter() - started
+            if successes:
+                latencies.append(elapsed)
+            else:
+                failures.append("; ".join(errors)[:200] or "성공 메시지 없음")
+    except Exception as e:
+        failures.append(f"{type(e).__name__}: {e}")
+    finally:
+        client.close()
+
+
+def run_load_level(host, port, concurrency, iterations=1, timeout=300, server_pid=None, stub_url=None):
+    """동시 세션 concurrency개로 생성 요청을 보내고 지연 시간 백분위수와 서버 자원 사용량을 측정합니다."""
+    latencies = []
+    failures = []
+    start_barrier = threading.Barrier(concurrency + 1)
+    requests_before = _stub_request_counts(stub_url) if stub_url else {}
+    threads = [
+        threading.Thread(target=_run_session, args=(host, port, iterations, timeout, start_barrier, latencies, failures), daemon=True)
+        for _ in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        start_barrier.wait()
+    except threading.BrokenBarrierError:
+        pass
+    sampler = ResourceSampler(server_pid).start() if server_pid else None
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    duration = time.perf_counter() - started
+
+    result = {
+        "concurrency": concurrency,
+        "generations": len(latencies),
+        "failures": len(failures),
+        "failure_samples": failures[:5],
+        "duration_seconds": round(duration, 3),
+        "throughput_per_minute": round(len(latencies) / duration * 60, 2) if duration else 0.0,
+    }
+    for name, q in (("p50", 50), ("p95", 95), ("p99", 99)):
+        result[f"latency_{name}"] = round(float(np.percentile(latencies, q)), 3) if latencies else None
+    result["latency_max"] = round(max(latencies), 3) if latencies else None
+    if sampler is not None and sampler.stop().samples:
+        rss = [sample[0] for sample in sampler.samples]
+        thread_counts = [sample[1] for sample in sampler.samples]
+        result.update({
+            "rss_peak_mb": round(max(rss) / 1024 / 1024, 1),
+            "rss_end_mb": round(rss[-1] / 1024 / 1024, 1),
+            "threads_peak": max(thread_counts),
+            "threads_end": thread_counts[-1],
+        })
+    if stub_url:
+        requests_after = _stub_request_counts(stub_url)
+        result["backend_requests"] = {backend: requests_after[backend] - requests_before.get(backend, 0) for backend in requests_after}
+    return result
+
+
+def _stub_request_counts(stub_url):
+    return requests.get(f"{stub_url}/_stats", timeout=5).json()["requests"]
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_streamlit_server(script_path, port, env, log_path, startup_timeout=60):
+    """앱을 헤드리스 Streamlit 서버로 실행하고 헬스 체크가 통과할 때까지 기다립니다."""
+    log = open(log_path, "wb")
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", script_path,
+            "--server.headless", "true", "--server.port", str(port),
+            "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false",
+        ],
+        env=env, stdout=log, stderr=subprocess.STDOUT
+    )
+    deadline = time.time() + startup_timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Streamlit 서버가 시작되지 않았습니다. 로그: {log_path}")
+        try:
+            if requests.get(f"http://127.0.0.1:{port}/_stcore/health", timeout=1).status_code == 200:
+                return process
+        except requests.RequestException:
+            pass
+        time.sleep(0.3)
+    process.terminate()
+    raise RuntimeError(f"Streamlit 서버 시작 대기 시간 초과. 로그: {log_path}")
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _print_capacity_report(report, baseline=None):
+    baseline_levels = {level["concurrency"]: level for level in (baseline or {}).get("levels", [])}
+    fmt = lambda value, spec=".2f": format(value, spec) if value is not None else "-"
+    print(f"\n용량 보고서 ({report['started_at']}, 커밋 {report['git_revision'] or '알 수 없음'})")
+    print(f"{'동시 세션':>8} {'완료':>5} {'실패':>5} {'p50(s)':>8} {'p95(s)':>8} {'p99(s)':>8} {'건/분':>8} {'RSS(MB)':>9} {'스레드':>6}  기준 대비 p95")
+    for level in report["levels"]:
+        delta = ""
+        previous = baseline_levels.get(level["concurrency"])
+        if previous and previous.get("latency_p95") and level["latency_p95"]:
+            delta = f"{(level['latency_p95'] / previous['latency_p95'] - 1) * 100:+.1f}%"
+        print(
+            f"{level['concurrency']:>8} {level['generations']:>5} {level['failures']:>5} {fmt(level['latency_p50']):>8} "
+            f"{fmt(level['latency_p95']):>8} {fmt(level['latency_p99']):>8} {level['throughput_per_minute']:>8.2f} "
+            f"{fmt(level.get('rss_peak_mb'), '.1f'):>9} {fmt(level.get('threads_peak'), 'd'):>6}  {delta}"
+        )
+    print(f"보고서 파일: {report['report_path']}")
+
+
+def cmd_load_test(args):
+    script_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "streamlit_app.py")
+    levels = [int(level) for level in args.concurrency.split(",") if level.strip()]
+    report_dir = os.path.join(app.DATA_DIR, "loadtests")
+    os.makedirs(report_dir, exist_ok=True)
+    started_at = datetime.now()
+
+    stub = None
+    stub_url = args.stub_url
+    if not stub_url:
+        stub = StubBackendServer(
+            "127.0.0.1", args.stub_port, args.newsapi_latency, args.naver_latency, args.openai_latency, args.jitter,
+            image_latency=args.image_latency
+        ).start()
+        stub_url = stub.url
+
+    server = None
+    server_pid = args.server_pid
+    if args.app_url:
+        parsed = urlparse(args.app_url)
+        host, port = parsed.hostname, parsed.port or 80
+    else:
+        # 대체 백엔드와 별도 데이터 디렉터리를 환경 변수로 지정하여 실제 캐시를 건드리지 않음
+        env = dict(
+            os.environ,
+            NEWSAPI_BASE_URL=stub_url,
+            NAVER_API_BASE_URL=stub_url,
+            OPENAI_BASE_URL=f"{stub_url}/v1",
+            NEWSLETTER_DATA_DIR=args.data_dir or tempfile.mkdtemp(prefix="newsletter-loadtest-"),
+        )
+        host, port = "127.0.0.1", args.port or _free_port()
+        log_path = os.path.join(report_dir, f"server-{started_at.strftime('%Y%m%d-%H%M%S')}.log")
+        server = start_streamlit_server(script_path, port, env, log_path)
+        server_pid = server.pid
+
+    report = {
+        "started_at": started_at.isoformat(timespec="seconds"),
+        "git_revision": _git_revision(),
+        "config": {
+            "concurrency": levels,
+            "iterations": args.iterations,
+            "app": f"http://{host}:{port}",
+            "stub_url": stub_url,
+            "stub": requests.get(f"{stub_url}/_stats", timeout=5).json(),
+        },
+        "levels": [],
+    }
+    try:
+        for concurrency in levels:
+            print(f"동시 세션 {concurrency}개 x {args.iterations}회 생성 중...")
+            result = run_load_level(host, port, concurrency, args.iterations, args.timeout, server_pid, stub_url)
+            report["levels"].append(result)
+            print(json.dumps(result, ensure_ascii=False))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+        if stub is not None:
+            stub.shutdown()
+            stub.server_close()
+
+    report["report_path"] = args.output or os.path.join(report_dir, f"loadtest-{started_at.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(report["report_path"], "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    _print_capacity_report(report, baseline)
+
+
+def cmd_rerender_archive(args):
+    result = app.rerender_archive(max_workers=args.workers, force=args.force)
+    print(
+        f"아카이브 {result['total']}개 호: 렌더링 {result['rendered']}개, 건너뜀 {result['skipped']}개, "
+        f"실패 {len(result['failed'])}개 ({result['duration_seconds']:.2f}초, 템플릿 {result['template_hash'][:12]})"
+    )
+    for key, error in result["failed"].items():
+        print(f"  {key}: {error}")
+    if result["failed"]:
+        sys.exit(1)
+
+
+def cmd_precompute_evergreen(args):
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if not api_key:
+        sys.exit("OPENAI_API_KEY 환경 변수가 필요합니다. (대체 백엔드는 OPENAI_BASE_URL로 지정)")
+    client = app.get_openai_client(api_key)
+    if args.count:
+        editions = [edition.strip() for edition in args.editions.split(",") if edition.strip()]
+        requests_by_id = app.build_evergreen_requests(args.start, args.count, editions, args.stories)
+        batch_id = app.submit_evergreen_batch(client, requests_by_id)
+        print(f"일괄 생성 작업 제출: {batch_id} (요청 {len(requests_by_id)}건)")
+    results, pending = app.collect_evergreen_batches(client, wait=args.wait, poll_interval=args.poll_interval, timeout=args.timeout)
+    for batch_id, record in results.items():
+        if record["status"] == "ingested":
+            print(f"{batch_id}: 추가 {record['added']}건 (검증 실패 {record['invalid']}건), 요청 실패 {record['failed']}건")
+        else:
+            print(f"{batch_id}: {record['status']}")
+    if pending:
+        print(f"결과 대기 중인 작업 {len(pending)}개: 나중에 'precompute-evergreen --count 0'으로 다시 확인하세요.")
+    rows, _ = app.get_evergreen_library().summary()
+    for row in rows:
+        print(f"  {row['section']:<14} {row['edition']:<3} 사용 가능 {row['available']:>3}  사용됨 {row['used']:>3}  검증 실패 {row['invalid']:>3}")
+
+
+def _add_smtp_arguments(parser):
+    parser.add_argument("--smtp-host", default=app.DEFAULT_SMTP_SETTINGS["host"])
+    parser.add_argument("--smtp-port", type=int, default=app.DEFAULT_SMTP_SETTINGS["port"])
+    parser.add_argument("--smtp-user", default="", help="비밀번호는 SMTP_PASSWORD 환경 변수로 전달합니다.")
+    parser.add_argument("--smtp-tls", action="store_true", help="STARTTLS 사용")
+    parser.add_argument("--workers", type=int, default=8, help="동시 발송 연결 수")
+    parser.add_argument("--domain-concurrency", type=int, default=2, help="도메인별 최대 동시 연결 수")
+    parser.add_argument("--domain-rate", type=float, default=20.0, help="도메인별 초당 최대 발송 수 (0이면 제한 없음)")
+
+
+def _add_stub_latency_arguments(parser):
+    parser.add_argument("--newsapi-latency", type=float, default=0.3, help="NewsAPI 응답 지연(초)")
+    parser.add_argument("--naver-latency", type=float, default=0.1, help="네이버 API 응답 지연(초)")
+    parser.add_argument("--openai-latency", type=float, default=2.0, help="OpenAI 응답 지연(초)")
+    parser.add_argument("--image-latency", type=float, default=0.1, help="기사 원문 페이지/이미지 응답 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.2, help="지연 편차 비율 (0.2이면 ±20%%)")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="AIDT Weekly 뉴스레터 명령줄 도구")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    smtp_debug = subparsers.add_parser("smtp-debug", help="로컬 디버그 SMTP 서버 실행")
+    smtp_debug.add_argument("--host", default="127.0.0.1")
+    smtp_debug.add_argument("--port", type=int, default=1025)
+    smtp_debug.add_argument("--maildir", help="받은 메시지를 .eml 파일로 저장할 디렉터리")
+    smtp_debug.add_argument("--latency", type=float, default=0.0, help="메시지당 처리 지연(초)")
+    smtp_debug.add_argument("--tempfail-domain", action="append", default=[], help="451로 거부할 도메인 (반복 가능)")
+    smtp_debug.add_argument("--reject-domain", action="append", default=[], help="550으로 거부할 도메인 (반복 가능)")
+    smtp_debug.set_defaults(func=cmd_smtp_debug)
+
+    generate = subparsers.add_parser("generate", help="뉴스레터를 생성하여 HTML/이메일용 HTML/원본 JSON 파일로 저장")
+    generate.add_argument("--issue", type=int, default=1, help="호수")
+    generate.add_argument("--editions", default="ko", help="생성할 에디션 (쉼표로 구분)")
+    generate.add_argument("--sections", help="생성할 섹션 (쉼표로 구분, 기본: 활성화된 섹션)")
+    generate.add_argument("--query-en", default="Telecommunication AND AI digital transformation AND artificial intelligence", help="NewsAPI 검색어")
+    generate.add_argument("--query-ko", default="AI 인공지능 디지털 트랜스포메이션", help="네이버 검색어")
+    generate.add_argument("--language", default="en", help="NewsAPI 기사 언어")
+    generate.add_argument("--main-news-mode", choices=["top", "map_reduce"], default="top")
+    generate.add_argument("--enrich", action="store_true", help="선택된 기사의 원문 본문으로 프롬프트 보강")
+    generate.add_argument("--no-thumbnails", action="store_true", help="기사 썸네일 이미지 생략")
+    generate.add_argument("--output-dir", default=".", help="파일을 저장할 디렉터리")
+    generate.add_argument("--profile", action="store_true", help="실행을 프로파일링하여 데이터 디렉터리/profiles/<실행 ID>/에 저장")
+    generate.add_argument("--sampling-interval", type=float, default=app.PROFILE_SAMPLING_INTERVAL * 1000, help="--profile 샘플링 간격(ms)")
+    generate.add_argument("--no-tracemalloc", action="store_true", help="--profile 시 메모리 할당 추적 생략 (측정 부담 감소)")
+    generate.set_defaults(func=cmd_generate)
+
+    send = subparsers.add_parser("send", help="생성된 뉴스레터를 구독자 목록에 발송")
+    send.add_argument("--html", required=True, help="발송할 뉴스레터 HTML 파일")
+    send.add_argument("--recipients", required=True, help="구독자 목록 CSV (이메일[,이름[,팀]])")
+    send.add_argument("--sender", required=True, help="보내는 사람 주소")
+    send.add_argument("--subject", default="중부Infra AT/DT Weekly")
+    send.add_argument("--batch-size", type=int, default=50, help="연결 하나로 연속 발송할 수신자 수")
+    send.add_argument("--compact", action="store_true", help="발송 전 공백, 반복 인라인 스타일, 미사용 CSS 제거")
+    send.add_argument("--inlined", action="store_true", help="CSS를 인라인한 파일 (--compact 시 style 속성을 클래스로 바꾸지 않음)")
+    send.add_argument("--budget-kb", type=float, default=app.EMAIL_BYTE_BUDGET / 1024, help="본문 크기 예산(KB), 넘으면 발송하지 않음 (0이면 검사 안 함)")
+    _add_smtp_arguments(send)
+    send.set_defaults(func=cmd_send)
+
+    retry = subparsers.add_parser("retry", help="재시도 대기열의 일시적 실패 건 재발송")
+    _add_smtp_arguments(retry)
+    retry.set_defaults(func=cmd_retry)
+
+    bench_merge = subparsers.add_parser("bench-merge", help="수신자별 개인화 렌더링 벤치마크")
+    bench_merge.add_argument("--count", type=int, default=10000, help="렌더링할 수신자 수")
+    bench_merge.add_argument("--teams", type=int, default=10, help="팀별 하이라이트 수")
+    bench_merge.add_argument("--baseline-sample", type=int, default=500, help="비교 방식 측정에 사용할 수신자 수")
+    bench_merge.set_defaults(func=cmd_bench_merge)
+
+    stub_backends = subparsers.add_parser("stub-backends", help="NewsAPI/네이버/OpenAI 대체 백엔드 실행")
+    stub_backends.add_argument("--host", default="127.0.0.1")
+    stub_backends.add_argument("--port", type=int, default=8765)
+    _add_stub_latency_arguments(stub_backends)
+    stub_backends.set_defaults(func=cmd_stub_backends)
+
+    load_test = subparsers.add_parser("load-test", help="동시 세션 수별 생성 지연 시간과 자원 사용량 측정")
+    load_test.add_argument("--concurrency", default="1,2,4,8", help="측정할 동시 세션 수 (쉼표로 구분)")
+    load_test.add_argument("--iterations", type=int, default=2, help="세션당 생성 횟수")
+    load_test.add_argument("--timeout", type=float, default=300, help="생성 한 번의 최대 대기 시간(초)")
+    load_test.add_argument("--app-url", help="이미 실행 중인 앱 주소 (없으면 대체 백엔드를 사용하는 서버를 실행)")
+    load_test.add_argument("--server-pid", type=int, help="--app-url 사용 시 RSS/스레드 수를 측정할 서버 프로세스 ID")
+    load_test.add_argument("--port", type=int, default=0, help="내부 Streamlit 서버 포트 (0이면 자동)")
+    load_test.add_argument("--stub-url", help="이미 실행 중인 대체 백엔드 주소 (없으면 내부에서 실행)")
+    load_test.add_argument("--stub-port", type=int, default=0, help="내부 대체 백엔드 포트 (0이면 자동)")
+    load_test.add_argument("--data-dir", help="부하 테스트 서버가 사용할 데이터 디렉터리 (기본: 임시 디렉터리)")
+    load_test.add_argument("--output", help="보고서 JSON 경로 (기본: 데이터 디렉터리/loadtests/)")
+    load_test.add_argument("--baseline", help="비교할 이전 보고서 JSON")
+    _add_stub_latency_arguments(load_test)
+    load_test.set_defaults(func=cmd_load_test)
+
+    rerender_archive = subparsers.add_parser("rerender-archive", help="보관된 모든 호를 현재 템플릿으로 다시 렌더링 (API 호출 없음)")
+    rerender_archive.add_argument("--workers", type=int, help="렌더링 프로세스 수 (기본: CPU 수)")
+    rerender_archive.add_argument("--force", action="store_true", help="내용과 템플릿이 그대로인 호도 다시 렌더링")
+    rerender_archive.set_defaults(func=cmd_rerender_archive)
+
+    precompute = subparsers.add_parser("precompute-evergreen", help="AT/DT 팁과 성공 사례를 다음 호들을 위해 일괄 사전 생성")
+    precompute.add_argument("--start", type=int, default=1, help="첫 대상 호수 (팁 주제는 호수에 따라 순환)")
+    precompute.add_argument("--count", type=int, default=8, help="대상 호 수 (0이면 제출 없이 대기 중인 작업 결과만 확인)")
+    precompute.add_argument("--editions", default="ko", help="생성할 에디션 (쉼표로 구분)")
+    precompute.add_argument("--stories", type=int, default=1, help="호당 성공 사례 변형 수")
+    precompute.add_argument("--wait", action="store_true", help="작업이 끝날 때까지 기다렸다가 결과를 저장")
+    precompute.add_argument("--poll-interval", type=float, default=10.0, help="작업 상태 확인 간격(초)")
+    precompute.add_argument("--timeout", type=float, help="--wait 최대 대기 시간(초)")
+    precompute.set_defaults(func=cmd_precompute_evergreen)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,507 @@
 import streamlit as st
+import streamlit.components.v1 as components
 from openai import OpenAI
 from datetime import datetime, timedelta
+from email.header import Header
+from email.utils import formataddr, formatdate, make_msgid, parseaddr
 import base64
+import codecs
+import gzip
+import io
+import hashlib
+import html
+import json
+import marshal
 import os
+import queue
 import re
+import smtplib
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import zipfile
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, TimeoutError as FutureTimeoutError, wait
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+import numpy as np
 import requests
+from PIL import Image, ImageOps
+
+# 캐시, 통계 등 실행 간 유지되는 데이터를 저장하는 디렉터리
+DATA_DIR = os.environ.get("NEWSLETTER_DATA_DIR", ".newsletter_data")
+
+def _write_atomic(path, data):
+    """같은 디렉터리의 고유한 임시 파일에 쓴 뒤 교체하여, 동시에 쓰는 스레드/프로세스가 서로의 내용을 덮지 않게 저장합니다."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=directory, prefix=f"{os.path.basename(path)}.", suffix=".tmp", delete=False) as f:
+        f.write(data)
+    try:
+        os.replace(f.name, path)
+    except OSError:
+        os.unlink(f.name)
+        raise
+
+class PersistentCache:
+    """
+    JSON 파일로 저장되는 키-값 캐시입니다.
+    최대 항목 수를 넘으면 오래된 항목부터 제거하며, save()를 호출할 때 디스크에 기록합니다.
+    """
+
+    def __init__(self, name, max_entries=5000):
+        self.path = os.path.join(DATA_DIR, f"{name}.json")
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._data = {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self._data = json.load(f)
+        except (OSError, ValueError):
+            self._data = {}
+
+    def get(self, key, default=None):
+        with self._lock:
+            return self._data.get(key, default)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def items(self):
+        with self._lock:
+            return list(self._data.items())
+
+    def delete(self, key):
+        with self._lock:
+            if self._data.pop(key, None) is not None:
+                self._dirty = True
+
+    def set(self, key, value):
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            while len(self._data) > self.max_entries:
+                del self._data[next(iter(self._data))]
+            self._dirty = True
+
+    def save(self):
+        """변경된 내용이 있으면 임시 파일에 쓴 뒤 교체하여 원자적으로 저장합니다."""
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = json.dumps(self._data, ensure_ascii=False)
+            self._dirty = False
+        _write_atomic(self.path, snapshot.encode("utf-8"))
+
+@st.cache_resource
+def get_persistent_cache(name, max_entries=5000):
+    """이름별로 프로세스 전체에서 공유하는 영구 캐시를 반환합니다."""
+    return PersistentCache(name, max_entries)
+
+@st.cache_resource
+def get_http_session():
+    """연결을 재사용하는 프로세스 공용 HTTP 세션을 반환합니다."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=32)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+@st.cache_resource(max_entries=32)
+def get_openai_client(api_key):
+    """API 키별 OpenAI 클라이언트를 프로세스 전체에서 재사용합니다."""
+    return OpenAI(api_key=api_key, timeout=OPENAI_TIMEOUT)
+
+# 외부 API 요청 제한 시간(초) - 장애 시 한 번의 생성이 무한정 기다리지 않도록 함
+API_TIMEOUT = (5, 15)  # (연결, 응답)
+OPENAI_TIMEOUT = 120.0
+
+# 제공자별 회로 차단기 설정: 최근 window_size번 호출 중 minimum_calls번 이상 호출되고 실패율이 failure_rate 이상이면 차단하고,
+# cooldown초 뒤 시험 호출 한 번으로 복구 여부를 확인
+CIRCUIT_BREAKER_SETTINGS = {
+    "newsapi": {"failure_rate": 0.5, "minimum_calls": 4, "window_size": 10, "cooldown": 300},
+    "naver": {"failure_rate": 0.5, "minimum_calls": 3, "window_size": 20, "cooldown": 120},
+    "openai": {"failure_rate": 0.5, "minimum_calls": 4, "window_size": 20, "cooldown": 60},
+}
+
+class CircuitOpenError(Exception):
+    """회로가 차단되어 외부 API를 호출하지 않았음을 나타냅니다."""
+
+    def __init__(self, name, retry_after):
+        super().__init__(f"{name} 회로 차단 중 (약 {retry_after:.0f}초 후 재시도)")
+        self.name = name
+        self.retry_after = retry_after
+
+class CircuitBreaker:
+    """
+    외부 API 제공자 하나에 대한 회로 차단기입니다.
+    closed(정상): 호출 결과를 기록하다가 실패율이 기준을 넘으면 open으로 바꿉니다.
+    open(차단): cooldown 동안 호출하지 않고 바로 CircuitOpenError를 발생시킵니다.
+    half_open(시험): cooldown이 지나면 시험 호출 하나만 허용하고, 성공하면 closed, 실패하면 다시 open이 됩니다.
+    """
+
+    def __init__(self, name, failure_rate=0.5, minimum_calls=4, window_size=20, cooldown=60):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.minimum_calls = minimum_calls
+        self.window_size = window_size
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.opened_at = None
+        self.open_count = 0
+        self.last_error = None
+        self._outcomes = []
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def _open(self):
+        self.state = "open"
+        self.opened_at = time.monotonic()
+        self.open_count += 1
+        self._trial_in_flight = False
+
+    def allow(self):
+        """호출해도 되면 True. 차단 시간이 지났으면 half_open으로 바꾸고 시험 호출 하나를 허용합니다."""
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = "half_open"
+            if self.state == "half_open":
+                if self._trial_in_flight:
+                    return False
+                self._trial_in_flight = True
+                return True
+            return self.state == "closed"
+
+    def retry_after(self):
+        with self._lock:
+            if self.state != "open":
+                return 0.0
+            return max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+
+    def record_success(self):
+        with self._lock:
+            if self.state == "half_open":
+                self.state = "closed"
+                self._outcomes = []
+                self._trial_in_flight = False
+            elif self.state == "closed":
+                self._record(True)
+
+    def record_failure(self, error):
+        with self._lock:
+            self.last_error = str(error)[:200]
+            if self.state == "half_open":
+                self._open()
+            elif self.state == "closed":
+                self._record(False)
+                failures = self._outcomes.count(False)
+                if len(self._outcomes) >= self.minimum_calls and failures / len(self._outcomes) >= self.failure_rate:
+                    self._open()
+
+    def _record(self, success):
+        self._outcomes.append(success)
+        if len(self._outcomes) > self.window_size:
+            del self._outcomes[:len(self._outcomes) - self.window_size]
+
+    def reset(self):
+        with self._lock:
+            self.state = "closed"
+            self._outcomes = []
+            self._trial_in_flight = False
+
+    def snapshot(self):
+        """화면 표시용 현재 상태"""
+        retry_after = self.retry_after()
+        with self._lock:
+            calls = len(self._outcomes)
+            failures = self._outcomes.count(False)
+            return {
+                "name": self.name,
+                "state": self.state,
+                "calls": calls,
+                "failure_rate": round(failures / calls, 2) if calls else 0.0,
+                "retry_after": round(retry_after),
+                "open_count": self.open_count,
+                "last_error": self.last_error,
+            }
+
+@st.cache_resource
+def get_circuit_breakers():
+    """프로세스 전체(모든 세션)에서 공유하는 제공자별 회로 차단기를 반환합니다."""
+    return {name: CircuitBreaker(name, **settings) for name, settings in CIRCUIT_BREAKER_SETTINGS.items()}
+
+def get_circuit_breaker(name):
+    return get_circuit_breakers()[name]
+
+@contextmanager
+def circuit_guard(name):
+    """
+    블록 안의 외부 호출 결과를 제공자 name의 차단기에 기록합니다. 회로가 차단되어 있으면 블록을 실행하지 않고 CircuitOpenError를 발생시킵니다.
+    차단기는 재실행 사이에 공유되지만 예외 클래스는 스크립트가 다시 실행될 때마다 새로 정의되므로, 예외는 차단기가 아닌 여기서 발생시킵니다.
+    """
+    breaker = get_circuit_breaker(name)
+    if not breaker.allow():
+        raise CircuitOpenError(name, breaker.retry_after())
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        breaker.record_failure(e)
+        raise
+    breaker.record_success()
+    get_stage_history().record(f"api:{name}", time.perf_counter() - started)
+
+def call_with_last_good(ctx, provider, key, fetch):
+    """
+    fetch()의 결과를 마지막 정상 결과로 기록하고 반환합니다. 파일에는 실행이 끝날 때 save_last_good_results로 한 번 저장합니다.
+    회로가 차단되어 있으면 호출 없이 저장된 마지막 정상 결과를 사용하고, 저장된 결과가 없으면 CircuitOpenError를 그대로 발생시켜 기본 콘텐츠로 대체되게 합니다.
+    """
+    cache = get_persistent_cache("last_good_results", max_entries=200)
+    cache_key = f"{provider}:{key}"
+    try:
+        value = fetch()
+    except CircuitOpenError as e:
+        cached = cache.get(cache_key)
+        if cached is None:
+            raise
+        ctx.add_error(f"{e} - {cached['saved_at']}에 가져온 결과를 대신 사용합니다.")
+        return cached["value"]
+    cache.set(cache_key, {"value": value, "saved_at": datetime.now().strftime("%Y-%m-%d %H:%M")})
+    return value
+
+def save_last_good_results():
+    """이번 실행에서 바뀐 마지막 정상 결과를 파일에 저장합니다 (바뀐 것이 없으면 쓰지 않음)."""
+    try:
+        get_persistent_cache("last_good_results", max_entries=200).save()
+    except OSError as e:
+        print(f"마지막 정상 결과 저장 오류: {str(e)}")
+
+# 섹션별 모델 티어 설정 - 정형화된 섹션은 빠른 모델, 종합이 필요한 섹션은 강한 모델을 사용
+MODEL_TIERS = {
+    "fast": {"model": "gpt-4o-mini", "temperature": 0.7},
+    "strong": {"model": "gpt-4-turbo-preview", "temperature": 0.7},
+}
+
+# 섹션 → 모델 티어 라우팅 정책 (헤지 요청은 기본적으로 꺼져 있음)
+DEFAULT_ROUTING_POLICY = {
+    "sections": {
+        "main_news": "strong",
+        "success_story": "strong",
+        "aidt_tips": "fast",
+        "ai_use_case": "fast",
+        "main_news_map": "fast",  # map-reduce 모드의 기사 묶음 요약
+        "translation": "fast",  # 영문 기사 제목/설명 일괄 번역
+    },
+    "default_tier": "strong",
+    "hedge": False,
+    "hedge_percentile": 95,  # 주 요청이 이 백분위수 지연을 넘으면 백업 요청 발송
+    "hedge_min_samples": 5,  # 백분위수를 신뢰하기 위한 최소 샘플 수
+    "hedge_default_delay": 20.0,  # 샘플이 부족할 때 사용하는 대기 시간(초)
+    "hedge_tier": None,  # None이면 주 요청과 같은 티어로 백업 요청
+}
+
+class LatencyTracker:
+    """키((섹션, 모델))별 최근 지연 시간 샘플을 보관하고 백분위수를 계산합니다."""
+
+    def __init__(self, max_samples=200):
+        self.max_samples = max_samples
+        self._samples = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def record(self, key, seconds):
+        with self._lock:
+            samples = self._samples.setdefault(key, [])
+            samples.append(seconds)
+            if len(samples) > self.max_samples:
+                del samples[:len(samples) - self.max_samples]
+
+    def increment(self, key, amount=1):
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def count(self, key):
+        with self._lock:
+            return len(self._samples.get(key, []))
+
+    def percentile(self, key, q):
+        """q(0~100) 백분위수 지연 시간을 반환합니다. 샘플이 없으면 None."""
+        with self._lock:
+            samples = sorted(self._samples.get(key, []))
+        if not samples:
+            return None
+        position = (len(samples) - 1) * q / 100
+        lower = int(position)
+        upper = min(lower + 1, len(samples) - 1)
+        return samples[lower] + (samples[upper] - samples[lower]) * (position - lower)
+
+    def summary(self):
+        """
+        (섹션, 모델)별 요청 지연 시간(샘플 수, p50, p95)과, 그 모델이 주 모델인 호출의 사용자 체감 지연 시간(p50, p95),
+        호출 수, 헤지 발송 횟수와 비율을 정리해 반환합니다.
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            keys = sorted({key[:2] for key in self._samples} | {key[:2] for key in counters})
+        rows = []
+        for key in keys:
+            section, model = key
+            count = self.count(key)
+            observed = self.count((section, model, "observed"))
+            calls = counters.get((section, model, "calls"), 0)
+            hedged = counters.get((section, model, "hedged"), 0)
+            rows.append({
+                "section": section,
+                "model": model,
+                "count": count,
+                "p50": round(self.percentile(key, 50), 2) if count else None,
+                "p95": round(self.percentile(key, 95), 2) if count else None,
+                "observed_p50": round(self.percentile((section, model, "observed"), 50), 2) if observed else None,
+                "observed_p95": round(self.percentile((section, model, "observed"), 95), 2) if observed else None,
+                "calls": calls,
+                "hedged": hedged,
+                "hedge_rate": round(hedged / calls, 2) if calls else None,
+            })
+        return rows
+
+class StageHistory:
+    """
+    단계(섹션별 LLM 호출, 제공자별 API 요청, 본문 추출, 전체 생성)별 최근 소요 시간과 응답 토큰 수를 파일로 보관합니다.
+    프로세스를 다시 시작해도 유지되어 실행 계획의 시간/비용 예측에 사용됩니다.
+    """
+
+    def __init__(self, max_samples=50):
+        self.max_samples = max_samples
+        self._cache = PersistentCache("stage_history", max_entries=500)
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds, completion_tokens=None):
+        with self._lock:
+            entry = self._cache.get(stage) or {"seconds": [], "completion_tokens": []}
+            entry = {field: list(samples) for field, samples in entry.items()}
+            entry["seconds"].append(round(seconds, 3))
+            if completion_tokens is not None:
+                entry["completion_tokens"].append(completion_tokens)
+            for samples in entry.values():
+                del samples[:-self.max_samples]
+            self._cache.set(stage, entry)
+
+    def samples(self, stage, field="seconds"):
+        return list((self._cache.get(stage) or {}).get(field, []))
+
+    def percentile(self, stage, q, field="seconds"):
+        """q(0~100) 백분위수를 반환합니다. 기록이 없으면 None."""
+        samples = self.samples(stage, field)
+        return float(np.percentile(samples, q)) if samples else None
+
+    def save(self):
+        try:
+            self._cache.save()
+        except OSError as e:
+            print(f"단계별 소요 시간 기록 저장 오류: {str(e)}")
+
+@st.cache_resource
+def get_stage_history():
+    """프로세스 전체에서 공유하는 단계별 소요 시간 기록을 반환합니다."""
+    return StageHistory()
+
+@st.cache_resource
+def get_latency_tracker():
+    """프로세스 전체에서 공유하는 지연 시간 추적기를 반환합니다."""
+    return LatencyTracker()
+
+@st.cache_resource
+def get_llm_executor():
+    """헤지 요청에 사용하는 프로세스 공용 스레드 풀을 반환합니다."""
+    return ThreadPoolExecutor(max_workers=16, thread_name_prefix="llm")
+
+def resolve_model_tier(section, policy=None):
+    """라우팅 정책에 따라 섹션에 사용할 모델 설정을 반환합니다."""
+    policy = policy or DEFAULT_ROUTING_POLICY
+    tier = policy.get("sections", {}).get(section, policy.get("default_tier", "strong"))
+    return MODEL_TIERS.get(tier, MODEL_TIERS["strong"])
+
+def get_hedge_delay(section, policy=None):
+    """백업 요청을 보내기 전까지 기다릴 시간(초)을 주 모델의 지연 기록으로부터 계산합니다."""
+    policy = policy or DEFAULT_ROUTING_POLICY
+    tracker = get_latency_tracker()
+    key = (section, resolve_model_tier(section, policy)["model"])
+    if tracker.count(key) >= policy.get("hedge_min_samples", 5):
+        return tracker.percentile(key, policy.get("hedge_percentile", 95))
+    return policy.get("hedge_default_delay", 20.0)
+
+def chat_completion(client, section, messages, policy=None):
+    """
+    라우팅 정책에 따라 모델을 선택해 채팅 완성을 요청하고 응답 본문을 반환합니다.
+    헤지가 켜져 있으면 주 요청이 지연 백분위수를 넘는 순간 백업 요청을 보내고, 먼저 끝난 결과를 사용합니다.
+    완료된 요청은 결과로 쓰였는지와 관계없이 각자의 지연 시간을 (섹션, 모델)별로 기록하고 (헤지 기준 백분위수가 빠른 응답 쪽으로 치우치지 않도록),
+    호출 시작부터 결과를 돌려줄 때까지의 사용자 체감 지연 시간은 (섹션, 주 모델, "observed")로 따로 기록합니다.
+    """
+    policy = policy or DEFAULT_ROUTING_POLICY
+    tracker = get_latency_tracker()
+    started = time.perf_counter()
+
+    def _call(model_config):
+        call_started = time.perf_counter()
+        with circuit_guard("openai"):
+            response = client.chat.completions.create(
+                model=model_config["model"],
+                messages=messages,
+                temperature=model_config["temperature"]
+            )
+        return model_config["model"], response, time.perf_counter() - call_started
+
+    def _record(future):
+        # 진 요청도 끝나는 대로 기록 (시작 전에 취소되었거나 실패한 요청은 제외)
+        if not future.cancelled() and future.exception() is None:
+            model, _, elapsed = future.result()
+            tracker.record((section, model), elapsed)
+
+    def _use(result):
+        _, response, _ = result
+        observed = time.perf_counter() - started
+        tracker.record((section, primary_config["model"], "observed"), observed)
+        usage = getattr(response, "usage", None)
+        get_stage_history().record(section, observed, getattr(usage, "completion_tokens", None))
+        return response.choices[0].message.content
+
+    primary_config = resolve_model_tier(section, policy)
+    tracker.increment((section, primary_config["model"], "calls"))
+    if not policy.get("hedge"):
+        result = _call(primary_config)
+        tracker.record((section, result[0]), result[2])
+        return _use(result)
+
+    executor = get_llm_executor()
+    primary = executor.submit(_call, primary_config)
+    primary.add_done_callback(_record)
+    try:
+        return _use(primary.result(timeout=get_hedge_delay(section, policy)))
+    except FutureTimeoutError:
+        pass
+
+    # 주 요청이 느린 경우 백업 요청을 발송하고 먼저 성공한 결과를 사용
+    tracker.increment((section, primary_config["model"], "hedged"))
+    backup_config = MODEL_TIERS.get(policy.get("hedge_tier"), primary_config)
+    backup = executor.submit(_call, backup_config)
+    backup.add_done_callback(_record)
+    pending = {primary, backup}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                # 진 요청은 아직 시작 전이면 취소하고, 진행 중이면 결과만 버림 (지연 시간은 끝날 때 기록됨)
+                for loser in pending:
+                    loser.cancel()
+                return _use(future.result())
+            error = future.exception()
+    raise error
 
 def convert_markdown_to_html(text):
     """마크다운 텍스트를 HTML로 변환합니다."""
@@ -100,11 +597,172 @@ def convert_markdown_to_html(text):
     
     return ''.join(paragraphs)
 
+# 뉴스레터 주제 프로필 - 검색어와 함께 기사 관련성 점수 계산에 사용
+NEWSLETTER_TOPIC_PROFILE = (
+    "AI 인공지능 생성형 디지털 트랜스포메이션 DX 업무 자동화 통신 네트워크 인프라 "
+    "artificial intelligence generative LLM GPT digital transformation automation telecom network infrastructure"
+)
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+|[가-힣]+")
+_ENGLISH_STOPWORDS = {
+    "and", "or", "not", "the", "an", "of", "in", "to", "for", "on", "with", "by", "at", "as",
+    "is", "are", "was", "be", "it", "its", "this", "that", "from", "how", "new"
+}
+
+def tokenize(text):
+    """
+    제목/설명 텍스트를 검색용 토큰으로 나눕니다.
+    영어는 소문자 단어, 한국어는 조사가 붙은 어절도 매칭되도록 음절 bigram으로 분리합니다.
+    """
+    # 네이버 검색 결과는 단어 중간에 <b> 강조 태그가 들어가므로 공백 없이 제거
+    text = re.sub(r"<[^>]+>", "", html.unescape(text or "")).lower()
+    tokens = []
+    for word in _TOKEN_PATTERN.findall(text):
+        if "가" <= word[0] <= "힣":
+            if len(word) == 1:
+                tokens.append(word)
+            else:
+                tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        elif len(word) > 1 and word not in _ENGLISH_STOPWORDS:
+            tokens.append(word)
+    return tokens
+
+class IdfStatistics:
+    """
+    실행 간 누적되는 문서 빈도(DF) 통계입니다.
+    최근 max_seen개 문서의 (키, 고유 토큰)을 보관하고 DF는 항상 이 문서들로부터 계산하므로, 오래된 문서가 빠지면 DF에서도 빠지고
+    같은 기사가 여러 번 수집되어도 한 번만 집계됩니다. 실행이 끝날 때 바뀐 경우에만 JSON 파일로 저장됩니다.
+    """
+
+    def __init__(self, name="ranking_idf", max_seen=20000):
+        self.path = os.path.join(DATA_DIR, f"{name}.json")
+        self.max_seen = max_seen
+        self._lock = threading.Lock()
+        self.df = {}
+        self.seen = {}
+        self._dirty = False
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                seen = json.load(f).get("seen")
+        except (OSError, ValueError):
+            seen = None
+        # 문서별 토큰이 없는 이전 형식(키 목록)은 DF를 다시 계산할 수 없으므로 새로 시작
+        if isinstance(seen, dict):
+            self._add(seen.items())
+
+    @property
+    def n_docs(self):
+        return len(self.seen)
+
+    def _add(self, documents):
+        """처음 보는 문서를 더하고 max_seen을 넘는 오래된 문서를 DF에서 빼며, 더한 문서 수를 반환합니다."""
+        added = 0
+        for key, tokens in documents:
+            if key in self.seen:
+                continue
+            added += 1
+            tokens = sorted(set(tokens))
+            self.seen[key] = tokens
+            for token in tokens:
+                self.df[token] = self.df.get(token, 0) + 1
+        while len(self.seen) > self.max_seen:
+            for token in self.seen.pop(next(iter(self.seen))):
+                self.df[token] -= 1
+                if not self.df[token]:
+                    del self.df[token]
+        return added
+
+    def update(self, documents):
+        """(문서 키, 토큰 목록) 쌍을 받아 처음 보는 문서만 통계에 반영합니다."""
+        with self._lock:
+            if self._add(documents):
+                self._dirty = True
+
+    def idf(self, terms):
+        """BM25 IDF 값을 terms 순서의 NumPy 배열로 반환합니다."""
+        with self._lock:
+            n_docs = max(self.n_docs, 1)
+            df = np.array([self.df.get(term, 0) for term in terms], dtype=np.float64)
+        return np.log1p((n_docs - df + 0.5) / (df + 0.5))
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = json.dumps({"seen": self.seen}, ensure_ascii=False)
+            self._dirty = False
+        try:
+            _write_atomic(self.path, snapshot.encode("utf-8"))
+        except OSError as e:
+            print(f"IDF 통계 저장 오류: {str(e)}")
+
+@st.cache_resource
+def get_idf_statistics():
+    """프로세스 전체에서 공유하는 IDF 통계를 반환합니다."""
+    return IdfStatistics()
+
+def rank_articles(articles, query, top_k=None, profile=NEWSLETTER_TOPIC_PROFILE, profile_weight=0.3, k1=1.5, b=0.75):
+    """
+    기사 목록을 검색어와 뉴스레터 주제 프로필에 대한 BM25 점수로 정렬하여 상위 top_k개를 반환합니다.
+    제목은 설명보다 두 배 가중치를 주며, 점수가 같으면 원래 순서(최신순)를 유지합니다.
+    IDF 통계는 메모리에서만 갱신하며, 파일 저장은 생성 실행이 끝날 때 한 번 합니다.
+    """
+    if not articles:
+        return []
+    
+    doc_tokens = [
+        tokenize(f"{article.get('title') or ''} {article.get('title') or ''} {article.get('description') or ''}")
+        for article in articles
+    ]
+    stats = get_idf_statistics()
+    stats.update(
+        (hashlib.sha1((get_article_url(article) or article.get('title') or '').encode()).hexdigest()[:16], tokens)
+        for article, tokens in zip(articles, doc_tokens)
+    )
+    
+    query_terms = set(tokenize(query))
+    profile_terms = set(tokenize(profile))
+    terms = sorted(query_terms | profile_terms)
+    if not terms:
+        return articles[:top_k]
+    term_index = {term: j for j, term in enumerate(terms)}
+    
+    # (문서, 용어) 위치를 모아 한 번에 단어 빈도 행렬을 구성
+    rows, cols = [], []
+    for d, tokens in enumerate(doc_tokens):
+        for token in tokens:
+            j = term_index.get(token)
+            if j is not None:
+                rows.append(d)
+                cols.append(j)
+    tf = np.zeros((len(articles), len(terms)), dtype=np.float64)
+    np.add.at(tf, (np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)), 1.0)
+    
+    lengths = np.array([len(tokens) for tokens in doc_tokens], dtype=np.float64)
+    avg_length = lengths.mean() or 1.0
+    norm = k1 * (1 - b + b * lengths / avg_length)
+    bm25 = stats.idf(terms) * tf * (k1 + 1) / (tf + norm[:, None])
+    
+    weights = np.array([(term in query_terms) + profile_weight * (term in profile_terms) for term in terms], dtype=np.float64)
+    scores = bm25 @ weights
+    order = np.argsort(-scores, kind="stable")
+    return [articles[i] for i in order[:top_k]]
+
+# 외부 API 주소 (부하 테스트 등에서 로컬 대체 서버로 바꿀 수 있음. OpenAI는 OPENAI_BASE_URL 환경 변수를 사용)
+NEWSAPI_BASE_URL = os.environ.get("NEWSAPI_BASE_URL", "https://newsapi.org").rstrip("/")
+NAVER_API_BASE_URL = os.environ.get("NAVER_API_BASE_URL", "https://openapi.naver.com").rstrip("/")
+
+# NewsAPI 페이지당 최대 기사 수와 map-reduce 방식에서 검색어마다 가져올 페이지 수, map 단계로 넘길 관련성 상위 후보 수
+NEWSAPI_PAGE_SIZE = 100
+MAP_REDUCE_NEWS_PAGES = 3
+MAP_REDUCE_CANDIDATES = {"general": 200, "openai": 100}
+
 # NewsAPI를 사용하여 실시간 뉴스를 가져오는 함수
-def fetch_real_time_news(api_key, query="AI digital transformation", days=7, language="en"):
+def fetch_real_time_news(api_key, query="AI digital transformation", days=7, language="en", page_size=None, pages=1):
     """
     NewsAPI를 사용하여 실시간 뉴스를 가져옵니다.
     무료 플랜은 최근 1개월(실제로는 더 짧을 수 있음) 데이터만 접근 가능합니다.
+    page_size를 주면 페이지당 기사 수(최대 100)를 지정하고 최대 pages 페이지까지 이어서 가져옵니다 (지정하지 않으면 NewsAPI 기본값 20건).
     """
     # 날짜 범위 계산 (API 제한으로 인해 기간을 줄임)
     end_date = datetime.now()
@@ -112,7 +770,7 @@ def fetch_real_time_news(api_key, query="AI digital transformation", days=7, lan
     start_date = end_date - timedelta(days=min(days, 7))  # 최대 7일로 제한
     
     # NewsAPI 요청
-    url = "https://newsapi.org/v2/everything"
+    url = f"{NEWSAPI_BASE_URL}/v2/everything"
     params = {
         'q': query,
         'from': start_date.strftime('%Y-%m-%d'),
@@ -121,22 +779,36 @@ def fetch_real_time_news(api_key, query="AI digital transformation", days=7, lan
         'language': language,
         'apiKey': api_key
     }
+    if page_size:
+        params['pageSize'] = page_size
     
-    response = requests.get(url, params=params)
-    
-    if response.status_code == 200:
+    articles = []
+    for page in range(1, (pages if page_size else 1) + 1):
+        if page_size:
+            params['page'] = page
+        # 회로가 차단되어 있으면 요청하지 않고 바로 실패
+        with circuit_guard("newsapi"):
+            response = get_http_session().get(url, params=params, timeout=API_TIMEOUT)
+            if response.status_code != 200:
+                # 요금제의 결과 수 한도를 넘는 페이지는 오류가 아니라 마지막 페이지로 처리
+                if page > 1 and response.status_code == 426:
+                    break
+                raise Exception(f"뉴스 가져오기 실패: {response.status_code} - {response.text}")
+        
         news_data = response.json()
-        return news_data['articles']
-    else:
-        raise Exception(f"뉴스 가져오기 실패: {response.status_code} - {response.text}")
+        articles.extend(news_data['articles'])
+        if not page_size or len(news_data['articles']) < page_size or len(articles) >= news_data.get('totalResults', 0):
+            break
+    return articles
 
 # 네이버 API를 사용하여 뉴스를 가져오는 함수
-def fetch_naver_news(client_id, client_secret, query, display=5, days=7):
+def fetch_naver_news(client_id, client_secret, query, display=5, days=7, rank=False):
     """
     네이버 검색 API를 사용하여 뉴스를 가져옵니다.
     최근 지정된 일수(기본 7일) 이내의 뉴스만 필터링합니다.
+    rank가 True이면 최신순 대신 검색어 관련성 순으로 display개를 고릅니다.
     """
-    url = "https://openapi.naver.com/v1/search/news.json"
+    url = f"{NAVER_API_BASE_URL}/v1/search/news.json"
     headers = {
         "X-Naver-Client-Id": client_id,
         "X-Naver-Client-Secret": client_secret
@@ -147,40 +819,43 @@ def fetch_naver_news(client_id, client_secret, query, display=5, days=7):
         "sort": "date"  # 최신순으로 정렬
     }
     
-    response = requests.get(url, headers=headers, params=params)
+    with circuit_guard("naver"):
+        response = get_http_session().get(url, headers=headers, params=params, timeout=API_TIMEOUT)
+        if response.status_code != 200:
+            raise Exception(f"네이버 뉴스 가져오기 실패: {response.status_code} - {response.text}")
     
-    if response.status_code == 200:
-        result = response.json()
-        
-        # 최근 days일 내의 뉴스만 필터링
-        filtered_items = []
-        current_date = datetime.now()
-        cutoff_date = current_date - timedelta(days=days)
-        
-        for item in result['items']:
-            # 네이버 뉴스 API는 pubDate를 제공하지만 형식이 RFC 822 형식
-            try:
-                pub_date_str = item.get('pubDate')
-                if pub_date_str:
-                    pub_date = datetime.strptime(pub_date_str, '%a, %d %b %Y %H:%M:%S %z')
-                    pub_date = pub_date.replace(tzinfo=None)
-                    
-                    if pub_date >= cutoff_date:
-                        filtered_items.append(item)
-            except Exception:
-                # 날짜 파싱에 실패하면 일단 포함시킴
-                filtered_items.append(item)
-        
-        # display 개수만큼만 반환
-        return filtered_items[:display]
-    else:
-        raise Exception(f"네이버 뉴스 가져오기 실패: {response.status_code} - {response.text}")
+    result = response.json()
+    
+    # 최근 days일 내의 뉴스만 필터링
+    filtered_items = []
+    current_date = datetime.now()
+    cutoff_date = current_date - timedelta(days=days)
+    
+    for item in result['items']:
+        # 네이버 뉴스 API는 pubDate를 제공하지만 형식이 RFC 822 형식
+        try:
+            pub_date_str = item.get('pubDate')
+            if pub_date_str:
+                pub_date = datetime.strptime(pub_date_str, '%a, %d %b %Y %H:%M:%S %z')
+                pub_date = pub_date.replace(tzinfo=None)
+                
+                if pub_date >= cutoff_date:
+                    filtered_items.append(item)
+        except Exception:
+            # 날짜 파싱에 실패하면 일단 포함시킴
+            filtered_items.append(item)
+    
+    # display 개수만큼만 반환
+    if rank:
+        return rank_articles(filtered_items, query, top_k=display)
+    return filtered_items[:display]
 
-def fetch_ai_use_cases(naver_client_id, naver_client_secret, query="AI 활용사례", display=3, days=30):
+def fetch_ai_use_cases(naver_client_id, naver_client_secret, query="AI 활용사례", display=3, days=30, rank=False):
     """
     네이버 검색 API를 사용하여 AI 활용사례를 가져옵니다.
+    rank가 True이면 검색어 관련성 순으로 display개를 고릅니다.
     """
-    url = "https://openapi.naver.com/v1/search/blog.json"  # 블로그 검색으로 변경
+    url = f"{NAVER_API_BASE_URL}/v1/search/blog.json"  # 블로그 검색으로 변경
     headers = {
         "X-Naver-Client-Id": naver_client_id,
         "X-Naver-Client-Secret": naver_client_secret
@@ -198,18 +873,21 @@ def fetch_ai_use_cases(naver_client_id, naver_client_secret, query="AI 활용사
     for search_query in search_queries:
         params = {
             "query": search_query,
-            "display": display,
+            "display": display * 3 if rank else display,  # 관련성 순위를 매길 후보를 넉넉히 가져옴
             "sort": "date"  # 최신순으로 정렬
         }
         
         try:
-            response = requests.get(url, headers=headers, params=params)
-            
-            if response.status_code == 200:
-                result = response.json()
-                all_items.extend(result['items'])
-            else:
-                print(f"API 오류: {response.status_code} - {response.text}")
+            with circuit_guard("naver"):
+                response = get_http_session().get(url, headers=headers, params=params, timeout=API_TIMEOUT)
+                if response.status_code != 200:
+                    raise Exception(f"API 오류: {response.status_code} - {response.text}")
+            all_items.extend(response.json()['items'])
+        except CircuitOpenError:
+            # 회로가 차단되면 나머지 검색은 건너뛰고, 하나도 못 가져왔으면 호출한 쪽에서 대체 콘텐츠를 사용
+            if not all_items:
+                raise
+            break
         except Exception as e:
             print(f"검색 중 오류 발생: {str(e)}")
     
@@ -224,429 +902,612 @@ def fetch_ai_use_cases(naver_client_id, naver_client_secret, query="AI 활용사
             unique_items.append(item)
     
     # 최대 display 개수만큼만 반환
+    if rank:
+        return rank_articles(unique_items, query, top_k=display)
     return unique_items[:display]
 
-def generate_ai_use_case_content(openai_api_key, use_case_data):
+# 기사 본문 추출 시 무시할 태그 (본문이 아닌 영역)
+_SKIPPED_BODY_TAGS = {"script", "style", "noscript", "nav", "header", "footer", "aside", "form", "figure", "button", "svg"}
+
+class _MainTextExtractor(HTMLParser):
     """
-    OpenAI를 사용하여 AI 활용사례 콘텐츠를 생성합니다.
-    '사례 확인해보기→' 링크를 포함합니다.
-    SOURCE_URL과 SOURCE_NAME 제거됨
+    HTML을 조각 단위로 받아 본문 문단(<p>) 텍스트만 모으는 스트리밍 파서입니다.
+    max_chars만큼 모이면 done이 True가 되어 더 이상 데이터를 받을 필요가 없습니다.
     """
-    if not openai_api_key or not use_case_data:
-        # OpenAI API가 없거나 검색 결과가 없는 경우 기본 콘텐츠 반환
-        return """
-        <h2>ChatGPT를 활용한 코드 리팩토링 사례</h2>
-        
-        <p><strong>요약:</strong> 소프트웨어 개발팀이 레거시 코드를 현대화하는 과정에서 ChatGPT를 활용하여 코드 리팩토링 시간을 단축했습니다. 복잡한 코드를 분석하고 개선하는 작업에 AI의 도움을 받아 생산성이 크게 향상되었습니다.</p>
-        
-        <p><strong>단계별 방법:</strong></p>
-        <ol>
-          <li>레거시 코드를 ChatGPT에 제시하고 코드 구조와 문제점 분석 요청</li>
-          <li>개선된 코드 구조와 디자인 패턴 제안받기</li>
-          <li>코드 품질 향상을 위한 리팩토링 수행 (중복 제거, 모듈화 등)</li>
-          <li>테스트 케이스 생성 및 디버깅 지원 요청</li>
-        </ol>
+
+    def __init__(self, max_chars=3000):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.paragraphs = []
+        self.collected = 0
+        self.done = False
+        self._skip_depth = 0
+        self._in_paragraph = False
+        self._buffer = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIPPED_BODY_TAGS:
+            self._skip_depth += 1
+        elif tag == "p":
+            self._flush()
+            self._in_paragraph = True
+
+    def handle_endtag(self, tag):
+        if tag in _SKIPPED_BODY_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag == "p":
+            self._flush()
+
+    def handle_data(self, data):
+        if self._in_paragraph and not self._skip_depth:
+            self._buffer.append(data)
+
+    def _flush(self):
+        if self._in_paragraph:
+            text = re.sub(r"\s+", " ", "".join(self._buffer)).strip()
+            # 메뉴, 저작권 문구 같은 짧은 조각은 본문으로 보지 않음
+            if len(text) >= 40:
+                self.paragraphs.append(text)
+                self.collected += len(text)
+                if self.collected >= self.max_chars:
+                    self.done = True
+        self._in_paragraph = False
+        self._buffer = []
+
+    def text(self):
+        self._flush()
+        return "\n".join(self.paragraphs)[:self.max_chars]
+
+def _detect_html_encoding(response, head):
+    """응답 헤더나 문서 앞부분의 <meta charset>에서 문자 인코딩을 찾습니다. 없으면 UTF-8을 사용합니다."""
+    encoding = None
+    if "charset" in response.headers.get("Content-Type", "").lower():
+        encoding = response.encoding
+    else:
+        match = re.search(rb'<meta[^>]+charset=["\']?([\w-]+)', head, flags=re.IGNORECASE)
+        if match:
+            encoding = match.group(1).decode("ascii")
+    try:
+        return codecs.lookup(encoding).name if encoding else "utf-8"
+    except LookupError:
+        return "utf-8"
+
+def extract_article_body(url, max_bytes=512 * 1024, max_chars=3000, timeout=5):
+    """
+    기사 페이지를 스트리밍으로 내려받으며 본문 텍스트를 추출합니다.
+    max_bytes를 넘거나 본문이 max_chars만큼 모이면 즉시 다운로드를 중단합니다.
+    """
+    headers = {"User-Agent": "Mozilla/5.0 (compatible; AIDTWeeklyBot/1.0)"}
+    with get_http_session().get(url, headers=headers, stream=True, timeout=timeout) as response:
+        if response.status_code != 200:
+            raise Exception(f"본문 가져오기 실패: {response.status_code}")
+        if "html" not in response.headers.get("Content-Type", "text/html"):
+            return ""
         
-        <p><strong>추천 프롬프트:</strong> "다음 코드를 분석하고 문제점을 찾아주세요. 그 후 모던 자바스크립트 관행과 디자인 패턴을 적용하여 리팩토링된 버전을 제공해주세요. 코드의 각 부분이 하는 일을 주석으로 설명하고, 리팩토링의 이유도 함께 설명해주세요."</p>
+        decoder = None
+        parser = _MainTextExtractor(max_chars=max_chars)
+        received = 0
+        for chunk in response.iter_content(chunk_size=16 * 1024):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder(_detect_html_encoding(response, chunk))(errors="replace")
+            received += len(chunk)
+            parser.feed(decoder.decode(chunk))
+            if parser.done or received >= max_bytes:
+                break
+        else:
+            # 끝까지 받았으면 디코더에 남은 바이트도 처리
+            if decoder is not None:
+                parser.feed(decoder.decode(b"", final=True))
+        return parser.text()
+
+def fetch_article_bodies(urls, max_workers=8, max_bytes=512 * 1024, max_chars=3000, timeout=5):
+    """
+    여러 기사의 본문을 제한된 크기의 스레드 풀에서 동시에 추출합니다.
+    추출 결과는 URL 기준으로 캐시되어 다음 실행부터는 네트워크 요청 없이 재사용됩니다.
+    실패한 URL은 결과에서 제외되고, 본문이 비어 있으면 일시적인 문제일 수 있으므로 캐시하지 않습니다.
+    """
+    cache = get_persistent_cache("article_bodies", max_entries=2000)
+    bodies = {}
+    missing = []
+    for url in dict.fromkeys(u for u in urls if u):
+        cached = cache.get(url)
+        if cached is not None:
+            bodies[url] = cached
+        else:
+            missing.append(url)
+    
+    if missing:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as executor:
+            futures = {executor.submit(extract_article_body, url, max_bytes, max_chars, timeout): url for url in missing}
+            for future, url in futures.items():
+                try:
+                    body = future.result()
+                except Exception as e:
+                    print(f"본문 추출 오류 ({url}): {str(e)}")
+                    continue
+                bodies[url] = body
+                if body:
+                    cache.set(url, body)
+        get_stage_history().record("article_bodies", time.perf_counter() - started)
+        cache.save()
+    
+    return bodies
+
+def get_article_url(article):
+    """NewsAPI/네이버 항목에서 원문 URL을 반환합니다."""
+    return article.get('url') or article.get('originallink') or article.get('link')
+
+# 기사 썸네일: 고정 폭으로 줄이고 JPEG로 다시 압축한 파일을 원본 URL과 내용 해시로 캐시
+THUMBNAIL_DIR = os.path.join(DATA_DIR, "thumbnails")
+THUMBNAIL_WIDTH = 200
+THUMBNAIL_QUALITY = 70
+THUMBNAIL_MAX_SOURCE_BYTES = 5 * 1024 * 1024
+THUMBNAIL_FAILURE_TTL = 24 * 3600  # 가져오지 못한 이미지 URL은 하루 동안 다시 시도하지 않음
+THUMBNAIL_WAIT_SECONDS = 1.0  # 섹션 생성이 끝난 뒤 썸네일 단계를 더 기다리는 최대 시간
+THUMBNAIL_SECTIONS = ("main_news", "naver_news", "naver_trends")
+_THUMBNAIL_REFERENCE = re.compile(r'thumbnail:([0-9a-f]{16}-\d+)')
+_THUMBNAIL_IMG_TAG = re.compile(r'<img\b[^>]*?src="thumbnail:([0-9a-f]{16}-\d+)"[^>]*>')
+_THUMBNAIL_CID = re.compile(r'cid:thumb-([0-9a-f]{16}-\d+)@aidt-weekly')
+_HEADING_END = re.compile(r'</h[1-6]>')
+
+class _PageImageParser(HTMLParser):
+    """문서 <head>에서 og:image(없으면 twitter:image) 메타 태그를 찾는 스트리밍 파서입니다. og:image를 찾거나 <body>가 시작되면 done이 됩니다."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.image = None
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "body":
+            self.done = True
+        elif tag == "meta":
+            attrs = dict(attrs)
+            name = (attrs.get("property") or attrs.get("name") or "").lower()
+            if attrs.get("content") and name in ("og:image", "og:image:url", "og:image:secure_url"):
+                self.image = attrs["content"]
+                self.done = True
+            elif attrs.get("content") and name == "twitter:image" and self.image is None:
+                self.image = attrs["content"]
+
+def find_page_image(url, max_bytes=256 * 1024, timeout=5):
+    """기사 페이지의 머리말만 스트리밍으로 읽어 대표 이미지(og:image) 절대 URL을 반환합니다. 없으면 빈 문자열."""
+    headers = {"User-Agent": "Mozilla/5.0 (compatible; AIDTWeeklyBot/1.0)"}
+    with get_http_session().get(url, headers=headers, stream=True, timeout=timeout) as response:
+        if response.status_code != 200:
+            raise Exception(f"페이지 가져오기 실패: {response.status_code}")
+        if "html" not in response.headers.get("Content-Type", "text/html"):
+            return ""
         
-        <p style="text-align: right; margin-top: 15px;"><a href="https://github.com/features/copilot" target="_blank" style="color: #ff5722; text-decoration: none; font-weight: bold;">사례 확인해보기 →</a></p>
-        <p style="font-size: 8pt; text-align: right; color: #666;">출처: GitHub Copilot</p>
-        """
+        decoder = None
+        parser = _PageImageParser()
+        received = 0
+        for chunk in response.iter_content(chunk_size=16 * 1024):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder(_detect_html_encoding(response, chunk))(errors="replace")
+            received += len(chunk)
+            parser.feed(decoder.decode(chunk))
+            if parser.done or received >= max_bytes:
+                break
+        return urljoin(response.url, parser.image.strip()) if parser.image else ""
+
+def fetch_page_images(urls, max_workers=8, timeout=5):
+    """여러 기사 페이지의 대표 이미지 URL을 동시에 찾아 {페이지 URL: 이미지 URL}로 반환합니다. 결과는 페이지 URL별로 캐시됩니다."""
+    cache = get_persistent_cache("page_images", max_entries=5000)
+    images = {}
+    missing = []
+    for url in dict.fromkeys(u for u in urls if u):
+        cached = cache.get(url)
+        if cached is not None:
+            images[url] = cached
+        else:
+            missing.append(url)
     
-    # 선택된 활용사례 링크와 출처를 저장할 변수
-    selected_source = ""
-    selected_link = ""
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as executor:
+            futures = {executor.submit(find_page_image, url, timeout=timeout): url for url in missing}
+            for future, url in futures.items():
+                try:
+                    image = future.result()
+                except Exception as e:
+                    print(f"대표 이미지 찾기 오류 ({url}): {str(e)}")
+                    continue
+                images[url] = image
+                cache.set(url, image)
+        cache.save()
+    return images
+
+def _thumbnail_path(key):
+    return os.path.join(THUMBNAIL_DIR, f"{key}.jpg")
+
+def _thumbnail_cid(key):
+    return f"thumb-{key}@aidt-weekly"
+
+def make_thumbnail(data, width=THUMBNAIL_WIDTH, quality=THUMBNAIL_QUALITY):
+    """
+    이미지 바이트를 폭 width로 줄인 JPEG 바이트와 (폭, 높이)를 반환합니다.
+    세로로 긴 이미지는 가운데를 정사각형으로 자르고, 투명 배경은 흰색으로 채웁니다.
+    """
+    with Image.open(io.BytesIO(data)) as source:
+        # JPEG은 디코딩 단계에서 미리 축소하여 큰 원본도 빠르게 처리
+        source.draft("RGB", (width * 2, width * 2))
+        image = ImageOps.exif_transpose(source)
+        if image.mode in ("RGBA", "LA", "P"):
+            image = image.convert("RGBA")
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel("A"))
+            image = background
+        else:
+            image = image.convert("RGB")
+    if image.height > image.width:
+        top = (image.height - image.width) // 2
+        image = image.crop((0, top, image.width, top + image.width))
+    if image.width > width:
+        image = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+    out = io.BytesIO()
+    image.save(out, "JPEG", quality=quality, optimize=True)
+    return out.getvalue(), image.size
+
+def fetch_thumbnail(image_url, width=THUMBNAIL_WIDTH, timeout=(3, 5)):
+    """이미지 하나를 내려받아 썸네일 파일을 만들고 캐시 항목({키, 폭, 높이, 바이트 수})을 반환합니다. 내용이 같은 이미지는 파일 하나를 공유합니다."""
+    headers = {"User-Agent": "Mozilla/5.0 (compatible; AIDTWeeklyBot/1.0)"}
+    with get_http_session().get(image_url, headers=headers, stream=True, timeout=timeout) as response:
+        if response.status_code != 200:
+            raise Exception(f"이미지 가져오기 실패: {response.status_code}")
+        content_type = response.headers.get("Content-Type", "image/")
+        if not content_type.startswith("image/"):
+            raise Exception(f"이미지가 아닌 응답: {content_type}")
+        chunks = []
+        received = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            received += len(chunk)
+            if received > THUMBNAIL_MAX_SOURCE_BYTES:
+                raise Exception(f"이미지가 {THUMBNAIL_MAX_SOURCE_BYTES // 1024 // 1024}MB보다 큽니다")
+            chunks.append(chunk)
+    data = b"".join(chunks)
     
-    # 검색 데이터를 기반으로 OpenAI 프롬프트 구성
-    use_case_info = "AI 활용사례 검색 결과:\n\n"
+    key = f"{hashlib.sha1(data).hexdigest()[:16]}-{width}"
+    path = _thumbnail_path(key)
+    if os.path.exists(path):
+        with Image.open(path) as existing:
+            size = existing.size
+    else:
+        thumbnail, size = make_thumbnail(data, width)
+        _write_atomic(path, thumbnail)
+    return {"key": key, "width": size[0], "height": size[1], "bytes": os.path.getsize(path)}
+
+def fetch_thumbnails(image_urls, width=THUMBNAIL_WIDTH, max_workers=6, timeout=(3, 5)):
+    """
+    이미지 URL 목록의 썸네일을 제한된 크기의 스레드 풀에서 동시에 만들어 {이미지 URL: 캐시 항목}으로 반환합니다.
+    결과는 이미지 URL별로 캐시되어 파일이 남아 있으면 다시 내려받지 않습니다.
+    실패한 URL은 결과에서 빠지고 THUMBNAIL_FAILURE_TTL 동안 다시 시도하지 않습니다.
+    """
+    cache = get_persistent_cache("thumbnails", max_entries=5000)
+    thumbnails = {}
+    missing = []
+    now = time.time()
+    for url in dict.fromkeys(u for u in image_urls if u and u.startswith(("http://", "https://"))):
+        cached = cache.get(f"{width}:{url}")
+        if cached and "key" in cached and os.path.exists(_thumbnail_path(cached["key"])):
+            thumbnails[url] = cached
+        elif not (cached and "error" in cached and now - cached["failed_at"] < THUMBNAIL_FAILURE_TTL):
+            missing.append(url)
     
-    for i, item in enumerate(use_case_data):
-        # HTML 태그 제거
-        title = item['title'].replace("<b>", "").replace("</b>", "")
-        description = item['description'].replace("<b>", "").replace("</b>", "")
-        
-        use_case_info += f"{i+1}. 제목: {title}\n"
-        use_case_info += f"   설명: {description}\n"
-        use_case_info += f"   링크: {item['link']}\n"
-        use_case_info += f"   블로그명: {item.get('bloggername', '알 수 없음')}\n\n"
+    if missing:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(missing)), thread_name_prefix="thumbnail") as executor:
+            futures = {executor.submit(fetch_thumbnail, url, width, timeout): url for url in missing}
+            for future, url in futures.items():
+                try:
+                    thumbnails[url] = future.result()
+                except Exception as e:
+                    print(f"썸네일 생성 오류 ({url}): {str(e)}")
+                    cache.set(f"{width}:{url}", {"error": str(e), "failed_at": now})
+                    continue
+                cache.set(f"{width}:{url}", thumbnails[url])
+        get_stage_history().record("thumbnails", time.perf_counter() - started)
+        cache.save()
+    return thumbnails
+
+def resolve_thumbnails(ctx, dependencies, width=THUMBNAIL_WIDTH):
+    """
+    섹션 데이터가 준비되면 기사 이미지로 썸네일을 만들어 {기사 링크: 썸네일 캐시 항목}을 반환합니다.
+    NewsAPI 기사는 urlToImage를, 네이버 기사는 원문 페이지의 og:image를 사용하며, 가져오지 못한 데이터는 건너뜁니다.
+    """
+    image_urls = {}
+    if "global_news" in dependencies:
+        try:
+            global_news = ctx.resolve("global_news")
+        except Exception:
+            global_news = {}
+        for article in global_news.get("top_news", []) + global_news.get("top_openai_news", []):
+            if article.get("urlToImage"):
+                image_urls[article["url"]] = article["urlToImage"]
     
-    client = OpenAI(api_key=openai_api_key)
+    pages = {}
+    for dependency in ("naver_news", "naver_trends"):
+        if dependency in dependencies:
+            try:
+                items = ctx.resolve(dependency)
+            except Exception:
+                continue
+            pages.update({item["link"]: item.get("originallink") or item["link"] for item in items})
+    if pages:
+        page_images = fetch_page_images(list(pages.values()))
+        image_urls.update({link: page_images[page] for link, page in pages.items() if page_images.get(page)})
     
-    try:
-        prompt = f"""
-        AIDT Weekly 뉴스레터의 'AI 활용사례' 섹션을 생성해주세요.
-        아래는 검색된 실제 AI 활용사례 정보입니다:
-        
-        {use_case_info}
-        
-        위 검색 결과 중에서 가장 유용하고 구체적인 활용사례를 선택하여 다음 형식으로 내용을 작성해주세요:
-        
-        ## [활용사례 제목] - 제목은 1줄로 명확하게
-        
-        **요약:** 배경과 중요성을 2-3문장으로 간결하게 설명해주세요.
-        
-        **단계별 방법:** AI 솔루션을 상세히 설명합니다. 어떤 기술을 사용했는지, 어떻게 구현했는지, 특별한 접근 방식은 무엇이었는지 등을 포함하여 3~4줄로 작성해주세요.
-        
-        **추천 프롬프트:** 이 활용사례를 더 효과적으로 활용하기 위한 구체적이고 명확한 프롬프트 예시를 작성해주세요.
-        
-        모든 내용은 반드시 제공된 검색 결과에서만 추출해야 합니다. 가상의 정보나 사실이 아닌 내용은 절대 포함하지 마세요.
-        내용은 마크다운 형식으로 작성해주세요.
-        """
-        
-        response = client.chat.completions.create(
-            model="gpt-4-turbo-preview",
-            messages=[
-                {"role": "system", "content": "AI 디지털 트랜스포메이션 활용사례 콘텐츠 생성 전문가. 정확하고 구체적인 정보만 포함합니다."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7
+    thumbnails = fetch_thumbnails(list(image_urls.values()), width)
+    return {link: thumbnails[url] for link, url in image_urls.items() if url in thumbnails}
+
+def _plan_thumbnails(planner, dependencies, width=THUMBNAIL_WIDTH):
+    """실행 계획에서 resolve_thumbnails가 가져올 이미지와 원문 페이지 중 캐시에 없는 것을 기록합니다."""
+    global_news = planner.resolve("global_news") or {}
+    articles = global_news.get("top_news", []) + global_news.get("top_openai_news", [])
+    image_urls = [article["urlToImage"] for article in articles if article.get("urlToImage")]
+    pages = [
+        item.get("originallink") or item["link"]
+        for dependency in ("naver_news", "naver_trends") if dependency in dependencies
+        for item in planner.resolve(dependency) or []
+    ]
+    thumbnail_cache = get_persistent_cache("thumbnails", max_entries=5000)
+    page_image_cache = get_persistent_cache("page_images", max_entries=5000)
+    missing = [url for url in image_urls if f"{width}:{url}" not in thumbnail_cache]
+    missing += [page for page in pages if page not in page_image_cache]
+    planner.calls.append({
+        "stage": "기사 썸네일 (섹션 생성과 동시에 진행)", "provider": "web",
+        "status": "호출" if missing else "캐시", "count": len(missing) or len(image_urls) + len(pages)
+    })
+
+def attach_thumbnails(content, thumbnails):
+    """
+    섹션 HTML에서 썸네일이 있는 기사 링크를 찾아, 그 기사의 제목(바로 앞의 h2/h3) 뒤에 썸네일 이미지를 넣습니다.
+    이미지 주소는 thumbnail:<키> 참조로 두고, 출력 형식에 맞는 주소로는 resolve_thumbnail_sources에서 바꿉니다.
+    """
+    for link, thumbnail in thumbnails.items():
+        match = re.search(r'href=["\']' + re.escape(link) + r'["\']', content)
+        if not match:
+            continue
+        headings = list(_HEADING_END.finditer(content, 0, match.start()))
+        if not headings:
+            continue
+        position = headings[-1].end()
+        if content.startswith('<img class="news-thumb"', position):
+            continue
+        image = (
+            f'<img class="news-thumb" src="thumbnail:{thumbnail["key"]}" '
+            f'width="{thumbnail["width"]}" height="{thumbnail["height"]}" alt="">'
         )
-        
-        content = response.choices[0].message.content
-        
-        # 링크가 없는 경우 첫 번째 항목의 링크 사용
-        if not selected_link and use_case_data:
-            selected_link = use_case_data[0]['link']
-            
-        # 출처가 없는 경우 첫 번째 항목의 블로그명 사용
-        if not selected_source and use_case_data:
-            selected_source = use_case_data[0].get('bloggername', '출처 정보 없음')
-        
-        # 출처 표시와 링크 추가
-        content_html = convert_markdown_to_html(content)
-        content_html += f"""
-        <p style="text-align: right; margin-top: 15px;"><a href="{selected_link}" target="_blank" style="color: #ff5722; text-decoration: none; font-weight: bold;">사례 확인해보기 →</a></p>
-        <p style="font-size: 8pt; text-align: right; color: #666;">출처: {selected_source}</p>
-        """
-        
-        return content_html
-    except Exception as e:
-        print(f"OpenAI API 오류: {str(e)}")
-        # 오류 발생 시 기본 콘텐츠 반환
-        return """
-        <h2>AI를 활용한 고객 서비스 개선 사례</h2>
-        
-        <p><strong>요약:</strong> 고객 문의량이 많은 기업에서 AI 챗봇을 도입하여 상담원의 업무 부담을 줄이고 24시간 고객 지원을 가능하게 한 사례입니다. 반복적인 질문에 자동 응답하여 상담원이 복잡한 문의에 집중할 수 있게 되었습니다.</p>
-        
-        <p><strong>단계별 방법:</strong></p>
-        <ol>
-          <li>자주 묻는 질문(FAQ)과 기존 상담 데이터 수집 및 분석</li>
-          <li>AI 모델 학습 및 챗봇 시스템 구축</li>
-          <li>사용자 피드백을 통한 지속적인 개선</li>
-          <li>복잡한 문의는 인간 상담원에게 자동 전달되는 시스템 구현</li>
-        </ol>
-        
-        <p><strong>추천 프롬프트:</strong> "고객 서비스용 AI 챗봇을 만들기 위해, 우리 회사의 자주 묻는 질문 목록을 분석하고 효과적인 응답 템플릿을 제안해주세요. 각 질문 유형별로 챗봇이 어떻게 응답해야 할지 예시를 포함해주세요."</p>
-        
-        <p style="text-align: right; margin-top: 15px;"><a href="https://www.ibm.com/watson/ai-customer-service" target="_blank" style="color: #ff5722; text-decoration: none; font-weight: bold;">사례 확인해보기 →</a></p>
-        <p style="font-size: 8pt; text-align: right; color: #666;">출처: IBM Watson</p>
-        """
+        content = content[:position] + image + content[position:]
+    return content
 
-# 통합된 뉴스레터 생성 함수
-def generate_combined_newsletter(openai_api_key, news_api_key, naver_client_id, naver_client_secret, 
-                             news_query_en, news_query_ko, language="en", custom_success_story=None, 
-                             issue_num=1, highlight_settings=None):
-    """OpenAI, NewsAPI, 네이버 API를 모두 사용하여 통합된 뉴스레터를 생성합니다.
-    사용 가능한 API만 활용합니다."""
+def resolve_thumbnail_sources(document, mode="inline", budget_bytes=None):
+    """
+    문서의 thumbnail:<키> 이미지 참조를 출력 형식에 맞게 바꾸고 (문서, {inlined, attached, dropped})를 반환합니다.
+    inline은 data URI로 넣되 문서가 budget_bytes를 넘지 않는 만큼만 넣고, cid는 메일 첨부(Content-ID) 참조로 바꾸며,
+    none이거나 파일이 없거나 예산을 넘는 이미지는 태그를 지웁니다.
+    """
+    result = {"inlined": [], "attached": [], "dropped": []}
+    keys = list(dict.fromkeys(_THUMBNAIL_REFERENCE.findall(document)))
+    if not keys:
+        return document, result
     
-    date = datetime.now().strftime('%Y년 %m월 %d일')
-    issue_number = issue_num
+    size = len(document.encode("utf-8"))
+    sources = {}
+    for key in keys:
+        path = _thumbnail_path(key)
+        if mode == "none" or not os.path.exists(path):
+            result["dropped"].append(key)
+        elif mode == "cid":
+            sources[key] = f"cid:{_thumbnail_cid(key)}"
+            result["attached"].append(key)
+        else:
+            with open(path, "rb") as f:
+                data_uri = "data:image/jpeg;base64," + base64.b64encode(f.read()).decode("ascii")
+            added = (len(data_uri) - len(f"thumbnail:{key}")) * document.count(f"thumbnail:{key}")
+            if budget_bytes and size + added > budget_bytes:
+                result["dropped"].append(key)
+                continue
+            size += added
+            sources[key] = data_uri
+            result["inlined"].append(key)
     
-    # 뉴스레터 콘텐츠를 저장할 딕셔너리
-    newsletter_content = {}
+    def replace(match):
+        key = match.group(1)
+        return match.group(0).replace(f"thumbnail:{key}", sources[key]) if key in sources else ""
+    return _THUMBNAIL_IMG_TAG.sub(replace, document), result
+
+def thumbnail_keys(sections):
+    """섹션 HTML들이 참조하는 썸네일 키 목록"""
+    return list(dict.fromkeys(key for content in sections.values() for key in _THUMBNAIL_REFERENCE.findall(content)))
+
+def format_news_info(articles, header, bodies=None, body_chars=800):
+    """LLM 프롬프트에 넣을 뉴스 기사 목록 텍스트를 만듭니다. 추출된 본문이 있으면 함께 포함합니다."""
+    lines = [header, ""]
+    for i, article in enumerate(articles):
+        pub_date = datetime.fromisoformat(article['publishedAt'].replace('Z', '+00:00')).strftime('%Y년 %m월 %d일')
+        lines.append(f"{i+1}. 제목: {article['title']}")
+        lines.append(f"   날짜: {pub_date}")
+        lines.append(f"   요약: {article['description']}")
+        body = (bodies or {}).get(article['url'])
+        if body:
+            lines.append(f"   본문 발췌: {body[:body_chars]}")
+        lines.append(f"   출처: {article['source']['name']}")
+        lines.append(f"   URL: {article['url']}")
+        lines.append("")
+    return "\n".join(lines) + "\n"
+
+def _chunk(items, size):
+    """리스트를 size 크기의 조각으로 나눕니다."""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def _parse_json_array(text):
+    """LLM 응답에서 JSON 배열 부분만 찾아 파싱합니다."""
+    match = re.search(r'\[.*\]', text or "", flags=re.DOTALL)
+    if not match:
+        raise ValueError("응답에서 JSON 배열을 찾을 수 없습니다.")
+    return json.loads(match.group(0))
+
+def _news_chunk_messages(chunk):
+    """기사 묶음 요약/평가(map 단계) 요청 메시지를 만듭니다."""
+    article_lines = []
+    for index, article in chunk:
+        article_lines.append(f"[{index}] 제목: {article['title']}\n    설명: {article.get('description') or ''}\n    출처: {article['source']['name']}")
     
-    # OpenAI API 관련 작업
-    if openai_api_key:
-        try:
-            # OpenAI 클라이언트 초기화
-            os.environ["OPENAI_API_KEY"] = openai_api_key
-            client = OpenAI(api_key=openai_api_key)
-            
-            # 현재 주차 계산 (이슈 번호를 주차로 사용)
-            current_week = issue_num
-            
-            # AI 팁 주제 데이터베이스 - 여러 주제를 순환하여 제공
-            ai_tip_topics = [
-                "효과적인 프롬프트 작성의 기본 원칙 (Chain of Thought, Chain of Draft)",
-                "특정 업무별 최적의 프롬프트 템플릿",
-                "AI를 활용한 데이터 분석 프롬프트 기법",
-                "창의적 작업을 위한 AI 프롬프트 전략",
-                "AI와 협업하여 문제 해결하기",
-                "다양한 AI 도구 활용법 비교",
-                "업무 자동화를 위한 AI 프롬프트 설계",
-                "AI를 활용한 의사결정 지원 기법"
-            ]
-            
-            # 현재 주차에 해당하는 주제 선택 (순환)
-            current_topic = ai_tip_topics[(current_week - 1) % len(ai_tip_topics)]
-            
-            # NewsAPI로 뉴스 가져오기 (있는 경우에만)
-            news_info = ""
-            openai_news_info = ""
-            
-            if news_api_key:
-                try:
-                    # 일반 뉴스 가져오기
-                    news_articles = fetch_real_time_news(news_api_key, query=news_query_en, days=7, language=language)
-                    top_news = news_articles[:5]
-                    
-                    news_info = "최근 7일 내 수집된 실제 뉴스 기사:\n\n"
-                    for i, article in enumerate(top_news):
-                        pub_date = datetime.fromisoformat(article['publishedAt'].replace('Z', '+00:00')).strftime('%Y년 %m월 %d일')
-                        news_info += f"{i+1}. 제목: {article['title']}\n"
-                        news_info += f"   날짜: {pub_date}\n"
-                        news_info += f"   요약: {article['description']}\n"
-                        news_info += f"   출처: {article['source']['name']}\n"
-                        news_info += f"   URL: {article['url']}\n\n"
-                    
-                    # OpenAI 관련 뉴스 가져오기
-                    openai_articles = fetch_real_time_news(news_api_key, query="OpenAI", days=7, language=language)
-                    top_openai_news = openai_articles[:3]
-                    
-                    openai_news_info = "최근 7일 내 수집된 OpenAI 관련 뉴스 기사:\n\n"
-                    for i, article in enumerate(top_openai_news):
-                        pub_date = datetime.fromisoformat(article['publishedAt'].replace('Z', '+00:00')).strftime('%Y년 %m월 %d일')
-                        openai_news_info += f"{i+1}. 제목: {article['title']}\n"
-                        openai_news_info += f"   날짜: {pub_date}\n"
-                        openai_news_info += f"   요약: {article['description']}\n"
-                        openai_news_info += f"   출처: {article['source']['name']}\n"
-                        openai_news_info += f"   URL: {article['url']}\n\n"
-                except Exception as e:
-                    st.error(f"News API 오류: {str(e)}")
-                    news_info = "NewsAPI에서 뉴스를 가져오는데 실패했습니다."
-                    openai_news_info = "NewsAPI에서 OpenAI 관련 뉴스를 가져오는데 실패했습니다."
-            
-            # OpenAI를 사용하여 콘텐츠 생성
-            prompts = {
-                'main_news': f"""
-                AIDT Weekly 뉴스레터의 '주요 소식' 섹션을 생성해주세요.
-                오늘 날짜는 {date}입니다. 아래는 두 종류의 뉴스 기사입니다:
-                
-                === OpenAI 관련 뉴스 ===
-                {openai_news_info}
-                
-                === 일반 뉴스 ===
-                {news_info}
-                
-                총 2개의 주요 소식을 다음 형식으로 작성해주세요:
-                
-                1. 먼저 OpenAI 관련 뉴스에서 가장 중요하고 관련성 높은 1개의 소식을 선택하여 작성하세요.
-                2. 그 다음 일반 뉴스에서 가장 중요하고 관련성 높은 1개의 소식을 선택하여 작성하세요.
-                
-                각 소식은 다음 형식으로 작성해주세요:
-                ## [주제]의 [핵심 강점/특징]은 [주목할만합니다/확인됐습니다/중요합니다].
-                
-                간략한 내용을 1-2문장으로 작성하세요. 내용은 특정 기술이나 서비스, 기업의 최신 소식을 다루고, 
-                핵심 내용만 포함해주세요. 그리고 왜 중요한지를 강조해주세요.
-                
-                구체적인 수치나 인용구가 있다면 추가해주세요.
-                
-                각 소식의 마지막에는 뉴스 기사의 발행일과 출처를 반드시 "[출처 제목](출처 URL)" 형식으로 포함하세요.
-                
-                모든 주제는 반드시 제공된 실제 뉴스 기사에서만 추출해야 합니다. 가상의 정보나 사실이 아닌 내용은 절대 포함하지 마세요.
-                각 소식 사이에 충분한 공백을 두어 가독성을 높여주세요.
-                """ if news_api_key else "뉴스 API 키가 제공되지 않아 글로벌 뉴스를 가져올 수 없습니다.",
+    prompt = f"""
+    아래 뉴스 기사 각각을 AI 디지털 트랜스포메이션(AT/DT) 뉴스레터 관점에서 평가해주세요.
+    
+    {chr(10).join(article_lines)}
+    
+    각 기사마다 핵심 내용을 한국어 1-2문장으로 요약하고, 뉴스레터 독자에게 얼마나 중요하고 관련성이 높은지 0-10 점수를 매기세요.
+    반드시 다음 JSON 배열 형식으로만 응답하세요:
+    [{{"id": 기사 번호, "score": 점수, "summary": "요약"}}]
+    """
+    return [
+        {"role": "system", "content": "뉴스 기사를 요약하고 중요도를 평가하는 편집자. JSON만 출력합니다."},
+        {"role": "user", "content": prompt}
+    ]
 
-                'aidt_tips': f"""
-                AIDT Weekly 뉴스레터의 '이번 주 AT/DT 팁' 섹션을 생성해주세요.
-                
-                이번 주 팁 주제는 "{current_topic}"입니다.
-                
-                이 주제에 대해 다음 형식으로 실용적인 팁을 작성해주세요:
-                
-                ## 이번 주 팁: [주제에 맞는 구체적인 팁 제목]
-                
-                팁에 대한 배경과 중요성을 2-3문장으로 간결하게 설명해주세요. AI 기본기와 관련된 내용을 포함하세요.
-                특히, 영어 용어는 한글로 번역하지 말고 그대로 사용해주세요 (예: "Chain of Thought", "Chain of Draft").
-                
-                **핵심 프롬프트 예시:**
-                - 첫 번째 프롬프트 템플릿 (Chain of Thought 활용):
-                  예시: [이 문제/작업에 대한 실제 예시를 제시하세요]
-                  프롬프트: [구체적인 Chain of Thought 프롬프트 템플릿을 작성하세요]
-                
-                - 두 번째 프롬프트 템플릿 (Chain of Draft 활용):
-                  예시: [이 문제/작업에 대한 실제 예시를 제시하세요]
-                  프롬프트: [구체적인 Chain of Draft 프롬프트 템플릿을 작성하세요]
-                
-                - 세 번째 프롬프트 템플릿 (Chain of Thought와 Chain of Draft 결합):
-                  예시: [이 문제/작업에 대한 실제 예시를 제시하세요]
-                  프롬프트: [두 기법을 결합한 프롬프트 템플릿을 작성하세요]
-                
-                이 팁을 활용했을 때의 업무 효율성 향상이나 결과물 품질 개선 등 구체적인 이점을 한 문장으로 작성해주세요.
-                
-                다음 주에는 다른 AI 기본기 팁을 알려드리겠습니다.
-                """,
-
-                'success_story': """
-                AIDT Weekly 뉴스레터의 '성공 사례' 섹션을 생성해주세요.
-                한국 기업 사례 1개와 외국 기업 사례 1개를 생성해야 합니다.
-                각 사례는 제목과 3개의 단락으로 구성되어야 합니다.
-                각 단락은 3~4줄로 구성하고, 구체적인 내용과 핵심 정보를 포함해야 합니다.
-                단락 사이에는 한 줄을 띄워서 가독성을 높여주세요.
-                
-                형식:
-                
-                ## [한국 기업명]의 AI 혁신 사례
-                
-                첫 번째 단락에서는 기업이 직면한 문제와 배경을 상세히 설명합니다. 구체적인 수치나 상황을 포함하여 3~4줄로 작성해주세요. 이 부분에서는 독자가 왜 이 기업이 AI 솔루션을 필요로 했는지 이해할 수 있도록 해주세요.
-                
-                두 번째 단락에서는 기업이 도입한 AI 솔루션을 상세히 설명합니다. 어떤 기술을 사용했는지, 어떻게 구현했는지, 특별한 접근 방식은 무엇이었는지 등을 포함하여 3~4줄로 작성해주세요.
-                
-                세 번째 단락에서는 AI 도입 후 얻은 구체적인 성과와 결과를 설명합니다. 가능한 한 정량적인 수치(비용 절감, 효율성 증가, 고객 만족도 향상 등)를 포함하여 3~4줄로 작성해주세요.
-                
-                ## [외국 기업명]의 AI 혁신 사례
-                
-                첫 번째 단락에서는 기업이 직면한 문제와 배경을 상세히 설명합니다. 구체적인 수치나 상황을 포함하여 3~4줄로 작성해주세요. 이 부분에서는 독자가 왜 이 기업이 AI 솔루션을 필요로 했는지 이해할 수 있도록 해주세요.
-                
-                두 번째 단락에서는 기업이 도입한 AI 솔루션을 상세히 설명합니다. 어떤 기술을 사용했는지, 어떻게 구현했는지, 특별한 접근 방식은 무엇이었는지 등을 포함하여 3~4줄로 작성해주세요.
-                
-                세 번째 단락에서는 AI 도입 후 얻은 구체적인 성과와 결과를 설명합니다. 가능한 한 정량적인 수치(비용 절감, 효율성 증가, 고객 만족도 향상 등)를 포함하여 3~4줄로 작성해주세요.
-                """
-            }
-            
-            # OpenAI를 사용하여 콘텐츠 생성
-            for section, prompt in prompts.items():
-                try:
-                    # 사용자가 입력한 성공 사례가 있으면 생성 건너뛰기
-                    if section == 'success_story' and custom_success_story:
-                        newsletter_content[section] = convert_markdown_to_html(custom_success_story)
-                        continue
-                    
-                    # 전역 뉴스가 없는 경우 생성하지 않음
-                    if section == 'main_news' and not news_api_key:
-                        newsletter_content[section] = f"<p>News API 키가 제공되지 않아 글로벌 뉴스를 가져올 수 없습니다.</p>"
-                        continue
-                        
-                    response = client.chat.completions.create(
-                        model="gpt-4-turbo-preview",
-                        messages=[
-                            {"role": "system", "content": "AI 디지털 트랜스포메이션 뉴스레터 콘텐츠 생성 전문가. 간결하고 핵심적인 내용만 포함한 뉴스레터를 작성합니다."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        temperature=0.7
-                    )
-                    newsletter_content[section] = convert_markdown_to_html(response.choices[0].message.content)
-                except Exception as e:
-                    newsletter_content[section] = f"<p>콘텐츠 생성 오류: {e}</p>"
-        except Exception as e:
-            st.error(f"OpenAI API 오류: {str(e)}")
-            # OpenAI API 실패했을 때 기본 내용 추가
-            newsletter_content['aidt_tips'] = get_default_tips_content()
-            newsletter_content['success_story'] = get_default_success_story()
-    else:
-        # OpenAI API 키가 없는 경우 기본 콘텐츠 사용
-        newsletter_content['aidt_tips'] = get_default_tips_content()
-        newsletter_content['success_story'] = get_default_success_story()
+def summarize_news_chunk(client, chunk, routing_policy=None):
+    """
+    기사 묶음 하나를 요약하고 뉴스레터 관련성 점수(0-10)를 매깁니다 (map 단계).
+    ({기사 번호: (점수, 요약)}, 성공 여부)를 반환합니다. 요청이나 응답 파싱에 실패하면 실패로 표시하고 원래 설명을 점수 0으로 사용하며,
+    응답에 빠진 기사도 같은 방식으로 채웁니다.
+    """
+    results = {index: (0, article.get('description') or '') for index, article in chunk}
+    try:
+        content = chat_completion(client, 'main_news_map', _news_chunk_messages(chunk), routing_policy)
+        matched = 0
+        for entry in _parse_json_array(content):
+            index = int(entry.get("id", -1))
+            if index in results:
+                results[index] = (float(entry.get("score", 0)), entry.get("summary") or results[index][1])
+                matched += 1
+        if not matched:
+            raise ValueError("응답에 묶음의 기사 번호가 없습니다.")
+    except Exception as e:
+        print(f"기사 묶음 요약 실패 (기사 {chunk[0][0]}~{chunk[-1][0]}번): {str(e)}")
+        return results, False
+    if matched < len(chunk):
+        print(f"기사 묶음 요약 응답에서 {len(chunk) - matched}건이 빠졌습니다 (기사 {chunk[0][0]}~{chunk[-1][0]}번).")
+    return results, True
+
+def summarize_news_map_reduce(client, news_articles, openai_articles, routing_policy=None, chunk_size=10,
+                              max_workers=8, top_general=5, top_openai=3):
+    """
+    수집된 전체 기사를 묶음으로 나누어 병렬로 요약/평가(map)한 뒤, 점수가 높은 기사만 골라 '주요 소식' 프롬프트 입력으로 반환합니다.
+    전체 소요 시간은 묶음 하나를 처리하는 시간에 가깝게 유지됩니다.
+    고른 기사는 description을 한국어 요약으로 바꾼 목록(top_news, top_openai_news)이며, 후보 수와 실패한 묶음 수도 함께 반환합니다.
+    """
+    # 그룹별로 URL 중복을 제거하고 전역 번호를 부여
+    tagged = []
+    for group, articles in (("openai", openai_articles), ("general", news_articles)):
+        seen_urls = set()
+        for article in articles:
+            if article.get('url') in seen_urls or not article.get('title'):
+                continue
+            seen_urls.add(article.get('url'))
+            tagged.append((group, article))
+    indexed = list(enumerate(tagged))
     
-    # 네이버 API 관련 작업
-    if naver_client_id and naver_client_secret:
-        try:
-            # 네이버 뉴스 가져오기 - 일반 AI 뉴스
-            ai_news_items = fetch_naver_news(naver_client_id, naver_client_secret, news_query_ko, display=2, days=7)
-            
-            # 네이버 뉴스 섹션 콘텐츠 생성
-            naver_news_content = "<h2>국내 AI 주요 소식</h2>"
-            
-            if not ai_news_items:
-                naver_news_content += "<p>최근 7일 이내의 관련 뉴스가 없습니다.</p>"
-            else:
-                for i, article in enumerate(ai_news_items):
-                    # HTML 태그 제거
-                    title = article['title'].replace("<b>", "").replace("</b>", "")
-                    description = article['description'].replace("<b>", "").replace("</b>", "")
-                    
-                    # 날짜 표시 추가
-                    pub_date_str = article.get('pubDate', '')
-                    pub_date_display = ""
-                    try:
-                        if pub_date_str:
-                            pub_date = datetime.strptime(pub_date_str, '%a, %d %b %Y %H:%M:%S %z')
-                            pub_date_display = pub_date.strftime('%Y년 %m월 %d일')
-                    except Exception:
-                        pub_date_display = "날짜 정보 없음"
-                    
-                    naver_news_content += f"<h3>{title}</h3>"
-                    naver_news_content += f"<p><small>게시일: {pub_date_display}</small></p>"
-                    naver_news_content += f"<p>{description}</p>"
-                    naver_news_content += f"<p><a href='{article['link']}' target='_blank'>원문 보기</a> | 출처: {article.get('originallink', article['link'])}</p>"
-                    
-                    if i < len(ai_news_items) - 1:  # 마지막 뉴스가 아닌 경우 구분선 추가
-                        naver_news_content += "<hr>"
-            
-            newsletter_content['naver_news'] = naver_news_content
-            
-            # 네이버 AI 트렌드 뉴스 가져오기
-            trend_news_items = fetch_naver_news(naver_client_id, naver_client_secret, "AI 트렌드", display=2, days=7)
-            
-            # AI 트렌드 섹션 콘텐츠 생성
-            trend_news_content = "<h2>국내 AI 트렌드 소식</h2>"
-            
-            if not trend_news_items:
-                trend_news_content += "<p>최근 7일 이내의 AI 트렌드 관련 뉴스가 없습니다.</p>"
-            else:
-                for i, article in enumerate(trend_news_items):
-                    # HTML 태그 제거
-                    title = article['title'].replace("<b>", "").replace("</b>", "")
-                    description = article['description'].replace("<b>", "").replace("</b>", "")
-                    
-                    # 날짜 표시 추가
-                    pub_date_str = article.get('pubDate', '')
-                    pub_date_display = ""
-                    try:
-                        if pub_date_str:
-                            pub_date = datetime.strptime(pub_date_str, '%a, %d %b %Y %H:%M:%S %z')
-                            pub_date_display = pub_date.strftime('%Y년 %m월 %d일')
-                    except Exception:
-                        pub_date_display = "날짜 정보 없음"
-                    
-                    trend_news_content += f"<h3>{title}</h3>"
-                    trend_news_content += f"<p><small>게시일: {pub_date_display}</small></p>"
-                    trend_news_content += f"<p>{description}</p>"
-                    trend_news_content += f"<p><a href='{article['link']}' target='_blank'>원문 보기</a> | 출처: {article.get('originallink', article['link'])}</p>"
-                    
-                    if i < len(trend_news_items) - 1:  # 마지막 뉴스가 아닌 경우 구분선 추가
-                        trend_news_content += "<hr>"
-            
-            newsletter_content['naver_trends'] = trend_news_content
-            
-            # AI 활용사례 가져오기
-            try:
-                # AI 활용사례 검색
-                ai_use_cases = fetch_ai_use_cases(naver_client_id, naver_client_secret, "AI 활용사례", display=3, days=30)
-                
-                # AI 활용사례 콘텐츠 생성
-                ai_use_case_content = generate_ai_use_case_content(openai_api_key, ai_use_cases)
-                
-                newsletter_content['ai_use_case'] = ai_use_case_content
-            except Exception as e:
-                st.error(f"AI 활용사례 가져오기 오류: {str(e)}")
-                newsletter_content['ai_use_case'] = get_default_ai_use_case()
-            
-        except Exception as e:
-            st.error(f"네이버 API 오류: {str(e)}")
-            newsletter_content['naver_news'] = f"<p>네이버 뉴스를 가져오는 중 오류가 발생했습니다: {str(e)}</p>"
-            newsletter_content['naver_trends'] = f"<p>네이버 AI 트렌드 뉴스를 가져오는 중 오류가 발생했습니다: {str(e)}</p>"
-    else:
-        # 네이버 API가 없는 경우 AI 활용사례 기본 콘텐츠 추가
-        newsletter_content['ai_use_case'] = get_default_ai_use_case()
+    chunks = _chunk([(index, article) for index, (_, article) in indexed], chunk_size)
+    scores = {}
+    failed_chunks = 0
+    if chunks:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+            for chunk_result, ok in executor.map(lambda chunk: summarize_news_chunk(client, chunk, routing_policy), chunks):
+                scores.update(chunk_result)
+                failed_chunks += not ok
+    if failed_chunks:
+        print(f"기사 요약 map 단계: {len(chunks)}개 묶음 중 {failed_chunks}개 실패 (해당 기사는 원래 설명과 점수 0으로 사용)")
     
-    # 하이라이트 설정 기본값
-    if highlight_settings is None:
-        highlight_settings = {
-            "title": "중부Infra AT/DT 뉴스레터 개시",
-            "subtitle": "AI, 어떻게 시작할지 막막하다면?",
-            "link_text": "AT/DT 추진방향 →",
-            "link_url": "#"
-        }
+    selected = {"openai": [], "general": []}
+    for index, (group, article) in sorted(indexed, key=lambda item: scores[item[0]][0], reverse=True):
+        limit = top_openai if group == "openai" else top_general
+        if len(selected[group]) < limit:
+            selected[group].append(dict(article, description=scores[index][1]))
     
-    # HTML 템플릿 생성
-    html_content = generate_combined_html_template(newsletter_content, issue_number, date, highlight_settings)
-    return html_content
+    return {
+        "top_news": selected["general"],
+        "top_openai_news": selected["openai"],
+        "summary_language": "ko",
+        "candidates": (len(openai_articles), len(news_articles)),
+        "chunks": len(chunks),
+        "failed_chunks": failed_chunks,
+    }
 
-# 기본 콘텐츠를 위한 헬퍼 함수들
-def get_default_tips_content():
-    """기본 AT/DT 팁 콘텐츠 반환"""
-    return """
+# 번역 대상 언어별 이름 (프롬프트용)
+TRANSLATION_LANGUAGE_NAMES = {"ko": "한국어", "en": "영어"}
+
+def _translation_cache_key(article, target_language):
+    """기사 URL과 제목/설명 내용 해시로 번역 캐시 키를 만듭니다. 기사 내용이 바뀌면 다시 번역합니다."""
+    content = f"{article.get('title') or ''}\n{article.get('description') or ''}"
+    return f"{target_language}:{get_article_url(article)}:{hashlib.sha1(content.encode('utf-8')).hexdigest()[:12]}"
+
+def _translation_messages(batch, target_language):
+    """기사 묶음의 제목/설명 번역 요청 메시지를 만듭니다."""
+    items = [
+        {"id": i, "title": article.get('title') or '', "description": article.get('description') or ''}
+        for i, (_, article) in enumerate(batch)
+    ]
+    prompt = f"""
+    다음 뉴스 기사들의 title과 description을 자연스러운 {TRANSLATION_LANGUAGE_NAMES.get(target_language, target_language)}로 번역해주세요.
+    고유명사, 기업명, 제품명과 "Chain of Thought" 같은 기술 용어는 원문 그대로 두어도 됩니다.
+    입력과 같은 id를 유지하여 다음 JSON 배열 형식으로만 응답하세요:
+    [{{"id": 번호, "title": "번역된 제목", "description": "번역된 설명"}}]
+    
+    {json.dumps(items, ensure_ascii=False)}
+    """
+    return [
+        {"role": "system", "content": "뉴스 기사 번역가. 의미를 보존하여 간결하게 번역하고 JSON만 출력합니다."},
+        {"role": "user", "content": prompt}
+    ]
+
+def _translate_batch(client, batch, target_language, routing_policy=None):
+    """기사 묶음의 제목/설명을 한 번의 호출로 번역하여 {캐시 키: 번역} 형태로 반환합니다."""
+    content = chat_completion(client, 'translation', _translation_messages(batch, target_language), routing_policy)
+    translations = {}
+    for entry in _parse_json_array(content):
+        index = int(entry.get("id", -1))
+        if 0 <= index < len(batch) and entry.get("title"):
+            translations[batch[index][0]] = {"title": entry["title"], "description": entry.get("description") or ""}
+    return translations
+
+def translate_articles(client, articles, target_language="ko", routing_policy=None, batch_size=20, max_workers=4):
+    """
+    기사 제목과 설명을 번역한 사본 목록을 반환합니다.
+    번역은 기사 URL + 내용 해시로 영구 캐시되어, 여러 호에 반복 등장하는 기사는 다시 번역하지 않습니다.
+    캐시에 없는 기사만 batch_size개씩 묶어 최소한의 호출로 번역하며, 번역에 실패한 기사는 원문을 유지합니다.
+    """
+    cache = get_persistent_cache("translations", max_entries=20000)
+    keys = [_translation_cache_key(article, target_language) for article in articles]
+    missing = list({key: article for key, article in zip(keys, articles) if key not in cache}.items())
+    
+    if missing and client is not None:
+        batches = _chunk(missing, batch_size)
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+            futures = [executor.submit(_translate_batch, client, batch, target_language, routing_policy) for batch in batches]
+            for future in futures:
+                try:
+                    for key, translation in future.result().items():
+                        cache.set(key, translation)
+                except Exception as e:
+                    print(f"기사 번역 오류: {str(e)}")
+        cache.save()
+    
+    translated = []
+    for key, article in zip(keys, articles):
+        translation = cache.get(key)
+        if translation:
+            article = dict(article, title=translation["title"], description=translation["description"], original_title=article.get('title'))
+        translated.append(article)
+    return translated
+
+# 에디션(발행 언어)별 설정: 수집 결과는 공유하고, 생성 지시문과 템플릿 문구/날짜 형식만 달라짐
+# 에디션별 기본 콘텐츠: API가 없거나 섹션 생성에 실패했을 때 사용
+# (ai_use_case_no_data: 검색 결과가 없을 때, ai_use_case_error: AI 활용사례 생성 오류 시)
+_DEFAULT_CONTENT_KO = {
+    "aidt_tips": """
     <div class="tip-title">이번 주 팁: 효과적인 프롬프트 작성의 기본 원칙</div>
     
     <p>AI를 더 효과적으로 활용하기 위해서는 명확하고 구체적인 프롬프트를 작성하는 것이 중요합니다. Chain of Thought와 Chain of Draft 기법을 활용하면 더 정확한 결과를 얻을 수 있습니다.</p>
@@ -674,11 +1535,8 @@ def get_default_tips_content():
     </div>
     
     <div class="tip-footer">다음 주에는 특정 업무별 최적의 프롬프트 템플릿에 대해 알려드리겠습니다.</div>
-    """
-
-def get_default_success_story():
-    """기본 성공 사례 콘텐츠 반환"""
-    return """
+    """,
+    "success_story": """
     <h2>삼성전자의 AI 혁신 사례</h2>
     
     <p>삼성전자는 생산 라인의 불량품 검출률을 높이기 위해 AI 비전 시스템 도입을 결정했습니다. 기존의 수동 검사 방식으로는 약 92%의 정확도를 보였으며, 검사 시간이 길어 생산성 저하의 원인이 되었습니다. 특히 미세한 결함을 감지하는 데 어려움이 있었습니다.</p>
@@ -694,11 +1552,8 @@ def get_default_success_story():
     <p>Google은 DeepMind의 강화학습 AI 시스템을 활용하여 수천 개의 센서 데이터를 분석하고 냉각 시스템을 자동으로 최적화하는 솔루션을 개발했습니다. 이 AI는 외부 온도, 서버 부하, 전력 사용량 등 다양한 변수를 고려하여 실시간으로 냉각 시스템을 조정합니다.</p>
     
     <p>AI 시스템 도입 결과, Google 데이터 센터의 냉각 에너지 소비가 약 40% 감소했으며, 전체 PUE(전력 사용 효율성)가 15% 개선되었습니다. 이는 연간 수백만 달러의 비용 절감과 탄소 배출량 감소로 이어졌으며, 다른 데이터 센터에도 적용 가능한 모델을 제시했습니다.</p>
-    """
-
-def get_default_ai_use_case():
-    """기본 AI 활용사례 콘텐츠 반환"""
-    return """
+    """,
+    "ai_use_case": """
     <h2>AI를 활용한 문서 요약 및 번역 사례</h2>
     
     <p><strong>요약:</strong> 다국적 기업에서 여러 언어로 된 보고서와 문서를 효율적으로 처리하기 위해 AI 요약 및 번역 시스템을 도입했습니다. 이를 통해 문서 처리 시간을 80% 단축하고 국가 간 정보 공유를 원활하게 개선했습니다.</p>
@@ -715,296 +1570,3375 @@ def get_default_ai_use_case():
     
     <p style="text-align: right; margin-top: 15px;"><a href="https://www.deepl.com" target="_blank" style="color: #ff5722; text-decoration: none; font-weight: bold;">사례 확인해보기 →</a></p>
     <p style="font-size: 8pt; text-align: right; color: #666;">출처: DeepL 사례연구</p>
-    """        
+    """,
+    "ai_use_case_no_data": """
+        <h2>ChatGPT를 활용한 코드 리팩토링 사례</h2>
+        
+        <p><strong>요약:</strong> 소프트웨어 개발팀이 레거시 코드를 현대화하는 과정에서 ChatGPT를 활용하여 코드 리팩토링 시간을 단축했습니다. 복잡한 코드를 분석하고 개선하는 작업에 AI의 도움을 받아 생산성이 크게 향상되었습니다.</p>
+        
+        <p><strong>단계별 방법:</strong></p>
+        <ol>
+          <li>레거시 코드를 ChatGPT에 제시하고 코드 구조와 문제점 분석 요청</li>
+          <li>개선된 코드 구조와 디자인 패턴 제안받기</li>
+          <li>코드 품질 향상을 위한 리팩토링 수행 (중복 제거, 모듈화 등)</li>
+          <li>테스트 케이스 생성 및 디버깅 지원 요청</li>
+        </ol>
+        
+        <p><strong>추천 프롬프트:</strong> "다음 코드를 분석하고 문제점을 찾아주세요. 그 후 모던 자바스크립트 관행과 디자인 패턴을 적용하여 리팩토링된 버전을 제공해주세요. 코드의 각 부분이 하는 일을 주석으로 설명하고, 리팩토링의 이유도 함께 설명해주세요."</p>
+        
+        <p style="text-align: right; margin-top: 15px;"><a href="https://github.com/features/copilot" target="_blank" style="color: #ff5722; text-decoration: none; font-weight: bold;">사례 확인해보기 →</a></p>
+        <p style="font-size: 8pt; text-align: right; color: #666;">출처: GitHub Copilot</p>
+        """,
+    "ai_use_case_error": """
+        <h2>AI를 활용한 고객 서비스 개선 사례</h2>
+        
+        <p><strong>요약:</strong> 고객 문의량이 많은 기업에서 AI 챗봇을 도입하여 상담원의 업무 부담을 줄이고 24시간 고객 지원을 가능하게 한 사례입니다. 반복적인 질문에 자동 응답하여 상담원이 복잡한 문의에 집중할 수 있게 되었습니다.</p>
+        
+        <p><strong>단계별 방법:</strong></p>
+        <ol>
+          <li>자주 묻는 질문(FAQ)과 기존 상담 데이터 수집 및 분석</li>
+          <li>AI 모델 학습 및 챗봇 시스템 구축</li>
+          <li>사용자 피드백을 통한 지속적인 개선</li>
+          <li>복잡한 문의는 인간 상담원에게 자동 전달되는 시스템 구현</li>
+        </ol>
+        
+        <p><strong>추천 프롬프트:</strong> "고객 서비스용 AI 챗봇을 만들기 위해, 우리 회사의 자주 묻는 질문 목록을 분석하고 효과적인 응답 템플릿을 제안해주세요. 각 질문 유형별로 챗봇이 어떻게 응답해야 할지 예시를 포함해주세요."</p>
+        
+        <p style="text-align: right; margin-top: 15px;"><a href="https://www.ibm.com/watson/ai-customer-service" target="_blank" style="color: #ff5722; text-decoration: none; font-weight: bold;">사례 확인해보기 →</a></p>
+        <p style="font-size: 8pt; text-align: right; color: #666;">출처: IBM Watson</p>
+        """,
+}
+
+_DEFAULT_CONTENT_EN = {
+    "aidt_tips": """
+    <div class="tip-title">Tip of the week: The basics of writing effective prompts</div>
+    
+    <p>Clear, specific prompts are the key to getting more out of AI. Techniques such as Chain of Thought and Chain of Draft help you get more accurate results.</p>
+    
+    <div class="prompt-examples-title">Key prompt examples:</div>
+    
+    <div class="prompt-template">
+    <div class="template-title">- Prompt template 1 (using Chain of Thought):</div>
+    <div class="template-content">
+    <div class="example-label">Example:</div>
+    <div class="example-content">Summarize this report.</div>
+    <div class="prompt-label">Prompt:</div>
+    <div class="prompt-content">Identify the main topics and key findings of this report, then draw its main conclusions. Think step by step as you summarize.</div>
+    </div>
+    </div>
+    
+    <div class="prompt-template">
+    <div class="template-title">- Prompt template 2 (using Chain of Draft):</div>
+    <div class="template-content">
+    <div class="example-label">Example:</div>
+    <div class="example-content">Write an email.</div>
+    <div class="prompt-label">Prompt:</div>
+    <div class="prompt-content">Write an email to a customer. Start with a draft, then refine it into a more polite and professional tone.</div>
+    </div>
+    </div>
+    
+    <div class="tip-footer">Next week: the best prompt templates for specific tasks.</div>
+    """,
+    "success_story": """
+    <h2>AI Innovation at Samsung Electronics</h2>
+    
+    <p>Samsung Electronics decided to introduce an AI vision system to catch more defects on its production lines. Manual inspection was about 92% accurate and slow enough to hold back productivity, and very small defects were especially hard to detect.</p>
+    
+    <p>Samsung built a deep-learning computer vision system and trained it on hundreds of thousands of images of good and defective products. The system scans products in real time, identifies defects automatically and classifies them by type and severity.</p>
+    
+    <p>After the rollout, defect detection accuracy rose from 92% to 98.5% and inspection time fell by 60%. This saved roughly KRW 15 billion a year, and better product quality cut customer returns by 15%.</p>
+    
+    <h2>AI Innovation at Google</h2>
+    
+    <p>Google adopted a DeepMind AI system to make its data centers more energy efficient. Data centers account for a large share of global electricity use, and cooling is one of their biggest loads. The existing cooling systems relied on manual settings and basic algorithms, which made them hard to optimize.</p>
+    
+    <p>Using DeepMind's reinforcement learning, Google built a system that analyzes data from thousands of sensors and tunes the cooling automatically. The AI adjusts cooling in real time, taking into account outside temperature, server load, power usage and other variables.</p>
+    
+    <p>The system cut the energy used for cooling by about 40% and improved overall PUE (power usage effectiveness) by 15%. That meant millions of dollars in annual savings and lower carbon emissions, and the approach can be applied to other data centers as well.</p>
+    """,
+    "ai_use_case": """
+    <h2>Using AI to Summarize and Translate Documents</h2>
+    
+    <p><strong>Summary:</strong> A multinational company introduced an AI summarization and translation system to handle reports and documents written in many languages. Document processing time dropped by 80%, and information now flows more smoothly between countries.</p>
+    
+    <p><strong>Step by step:</strong></p>
+    <ol>
+      <li>Build a GPT-based summarization system to extract the key points of long documents</li>
+      <li>Integrate a multilingual translation model supporting more than 10 languages</li>
+      <li>Build a glossary of technical terms to improve industry-specific translation accuracy</li>
+      <li>Deliver the summary and translation alongside the original, keeping the document format</li>
+    </ol>
+    
+    <p><strong>Suggested prompt:</strong> "Summarize the following technical report in three key points and add a short explanation for each. Then translate the summary into [target language]. Translate industry terms accurately and put the original English term in parentheses next to each translated term."</p>
+    
+    <p style="text-align: right; margin-top: 15px;"><a href="https://www.deepl.com" target="_blank" style="color: #ff5722; text-decoration: none; font-weight: bold;">See the case →</a></p>
+    <p style="font-size: 8pt; text-align: right; color: #666;">Source: DeepL case study</p>
+    """,
+    "ai_use_case_no_data": """
+        <h2>Refactoring Code with ChatGPT</h2>
+        
+        <p><strong>Summary:</strong> A software team used ChatGPT while modernizing legacy code and cut the time spent on refactoring. With AI helping to analyze and improve complex code, the team's productivity rose significantly.</p>
+        
+        <p><strong>Step by step:</strong></p>
+        <ol>
+          <li>Give ChatGPT the legacy code and ask it to analyze the structure and problems</li>
+          <li>Get suggestions for a better code structure and design patterns</li>
+          <li>Refactor to improve code quality (remove duplication, modularize, and so on)</li>
+          <li>Ask for help generating test cases and debugging</li>
+        </ol>
+        
+        <p><strong>Suggested prompt:</strong> "Analyze the following code and find its problems. Then provide a refactored version that applies modern JavaScript practices and design patterns. Explain what each part of the code does in comments, along with the reasons for the refactoring."</p>
+        
+        <p style="text-align: right; margin-top: 15px;"><a href="https://github.com/features/copilot" target="_blank" style="color: #ff5722; text-decoration: none; font-weight: bold;">See the case →</a></p>
+        <p style="font-size: 8pt; text-align: right; color: #666;">Source: GitHub Copilot</p>
+        """,
+    "ai_use_case_error": """
+        <h2>Improving Customer Service with AI</h2>
+        
+        <p><strong>Summary:</strong> A company with a high volume of customer inquiries introduced an AI chatbot, reducing the load on its agents and providing 24-hour support. Repetitive questions are answered automatically, so agents can focus on complex inquiries.</p>
+        
+        <p><strong>Step by step:</strong></p>
+        <ol>
+          <li>Collect and analyze frequently asked questions and past support conversations</li>
+          <li>Train an AI model and build the chatbot</li>
+          <li>Keep improving it based on user feedback</li>
+          <li>Automatically hand complex inquiries over to human agents</li>
+        </ol>
+        
+        <p><strong>Suggested prompt:</strong> "To build a customer service chatbot, analyze our list of frequently asked questions and suggest effective response templates. Include examples of how the chatbot should answer each type of question."</p>
+        
+        <p style="text-align: right; margin-top: 15px;"><a href="https://www.ibm.com/watson/ai-customer-service" target="_blank" style="color: #ff5722; text-decoration: none; font-weight: bold;">See the case →</a></p>
+        <p style="font-size: 8pt; text-align: right; color: #666;">Source: IBM Watson</p>
+        """,
+}
+
+EDITION_LANGUAGES = {
+    "ko": {
+        "name": "한국어",
+        "instruction": "",
+        "date_format": "%Y년 %m월 %d일",
+        "defaults": _DEFAULT_CONTENT_KO,
+        "labels": {
+            "document_title": "AIDT Weekly - 제{issue_number}호",
+            "issue_info": "제{issue_number}호 | {date}",
+            "intro": "중부Infra AT/DT 뉴스레터는 모두가 AI발전 속도에 뒤쳐지지 않고 업무에 적용할 수 있도록 가장 흥미로운 AI 활용법을 전합니다.",
+            "main_news": "글로벌 AI 뉴스",
+            "naver_news": "국내 AI 뉴스",
+            "naver_trends": "국내 AI 트렌드",
+            "aidt_tips": "이번 주 AT/DT 팁",
+            "ai_use_case": "AI 활용사례",
+            "success_story": "성공 사례",
+            "footer_rights": "© {year} 중부Infra All rights reserved. | 뉴스레터 구독에 감사드립니다.",
+            "footer_contact": "문의사항이나 제안이 있으시면 언제든지 연락해 주세요^^.",
+            "naver_news_heading": "국내 AI 주요 소식",
+            "naver_news_empty": "최근 7일 이내의 관련 뉴스가 없습니다.",
+            "naver_trends_heading": "국내 AI 트렌드 소식",
+            "naver_trends_empty": "최근 7일 이내의 AI 트렌드 관련 뉴스가 없습니다.",
+            "published": "게시일",
+            "no_date": "날짜 정보 없음",
+            "read_original": "원문 보기",
+            "source": "출처",
+            "see_case": "사례 확인해보기 →",
+            "unknown_source": "출처 정보 없음",
+            "news_api_missing": "News API 키가 제공되지 않아 글로벌 뉴스를 가져올 수 없습니다.",
+            "naver_news_error": "네이버 뉴스를 가져오는 중 오류가 발생했습니다",
+            "naver_trends_error": "네이버 AI 트렌드 뉴스를 가져오는 중 오류가 발생했습니다",
+            "content_error": "콘텐츠 생성 오류",
+            "openai_news_failed": "NewsAPI에서 OpenAI 관련 뉴스를 가져오는데 실패했습니다.",
+            "news_failed": "NewsAPI에서 뉴스를 가져오는데 실패했습니다.",
+            "openai_news_header": "최근 7일 내 수집된 OpenAI 관련 뉴스 기사:",
+            "news_header": "최근 7일 내 수집된 실제 뉴스 기사:",
+            "openai_news_ranked_header": "최근 7일 내 수집된 OpenAI 관련 뉴스 {count}건 중 중요도 상위 기사 요약:",
+            "news_ranked_header": "최근 7일 내 수집된 뉴스 {count}건 중 중요도 상위 기사 요약:",
+        },
+    },
+    "en": {
+        "name": "영어",
+        "instruction": "\n위 형식을 그대로 따르되, 모든 내용은 영어(English)로 작성해주세요. 기업명, 제품명, 출처 제목은 원문 그대로 두어도 됩니다.\n",
+        "date_format": "%B %d, %Y",
+        "defaults": _DEFAULT_CONTENT_EN,
+        "labels": {
+            "document_title": "AIDT Weekly - Issue {issue_number}",
+            "issue_info": "Issue {issue_number} | {date}",
+            "intro": "The Jungbu Infra AT/DT newsletter shares the most useful ways to apply AI at work, so everyone can keep pace with how fast AI is moving.",
+            "main_news": "Global AI News",
+            "naver_news": "AI News from Korea",
+            "naver_trends": "AI Trends in Korea",
+            "aidt_tips": "AT/DT Tip of the Week",
+            "ai_use_case": "AI Use Case",
+            "success_story": "Success Stories",
+            "footer_rights": "© {year} Jungbu Infra. All rights reserved. | Thank you for subscribing.",
+            "footer_contact": "Questions or suggestions? Feel free to contact us anytime.",
+            "naver_news_heading": "Top AI Stories in Korea",
+            "naver_news_empty": "No related news in the last 7 days.",
+            "naver_trends_heading": "AI Trends in Korea",
+            "naver_trends_empty": "No AI trend news in the last 7 days.",
+            "published": "Published",
+            "no_date": "Date unavailable",
+            "read_original": "Read original",
+            "source": "Source",
+            "see_case": "See the case →",
+            "unknown_source": "Unknown source",
+            "news_api_missing": "Global news could not be fetched because no News API key was provided.",
+            "naver_news_error": "An error occurred while fetching Naver news",
+            "naver_trends_error": "An error occurred while fetching Naver AI trend news",
+            "content_error": "Content generation error",
+            "openai_news_failed": "Failed to fetch OpenAI-related news from NewsAPI.",
+            "news_failed": "Failed to fetch news from NewsAPI.",
+            "openai_news_header": "OpenAI-related news articles collected in the last 7 days:",
+            "news_header": "News articles collected in the last 7 days:",
+            "openai_news_ranked_header": "Summaries of the most important of {count} OpenAI-related news articles collected in the last 7 days:",
+            "news_ranked_header": "Summaries of the most important of {count} news articles collected in the last 7 days:",
+        },
+    },
+}
+
+def get_edition(edition):
+    """에디션 설정을 반환합니다. 알 수 없는 에디션은 한국어 설정을 사용합니다."""
+    return EDITION_LANGUAGES.get(edition, EDITION_LANGUAGES["ko"])
+
+def _ai_use_case_messages(use_case_data, bodies=None, edition="ko"):
+    """검색된 AI 활용사례로 'AI 활용사례' 섹션 생성 요청 메시지를 만듭니다."""
+    # 검색 데이터를 기반으로 OpenAI 프롬프트 구성
+    use_case_info = "AI 활용사례 검색 결과:\n\n"
+    
+    for i, item in enumerate(use_case_data):
+        # HTML 태그 제거
+        title = item['title'].replace("<b>", "").replace("</b>", "")
+        description = item['description'].replace("<b>", "").replace("</b>", "")
+        
+        use_case_info += f"{i+1}. 제목: {title}\n"
+        use_case_info += f"   설명: {description}\n"
+        body = (bodies or {}).get(get_article_url(item))
+        if body:
+            use_case_info += f"   본문 발췌: {body[:800]}\n"
+        use_case_info += f"   링크: {item['link']}\n"
+        use_case_info += f"   블로그명: {item.get('bloggername', '알 수 없음')}\n\n"
+    
+    prompt = f"""
+        AIDT Weekly 뉴스레터의 'AI 활용사례' 섹션을 생성해주세요.
+        아래는 검색된 실제 AI 활용사례 정보입니다:
+        
+        {use_case_info}
+        
+        위 검색 결과 중에서 가장 유용하고 구체적인 활용사례를 선택하여 다음 형식으로 내용을 작성해주세요:
+        
+        ## [활용사례 제목] - 제목은 1줄로 명확하게
+        
+        **요약:** 배경과 중요성을 2-3문장으로 간결하게 설명해주세요.
+        
+        **단계별 방법:** AI 솔루션을 상세히 설명합니다. 어떤 기술을 사용했는지, 어떻게 구현했는지, 특별한 접근 방식은 무엇이었는지 등을 포함하여 3~4줄로 작성해주세요.
+        
+        **추천 프롬프트:** 이 활용사례를 더 효과적으로 활용하기 위한 구체적이고 명확한 프롬프트 예시를 작성해주세요.
+        
+        모든 내용은 반드시 제공된 검색 결과에서만 추출해야 합니다. 가상의 정보나 사실이 아닌 내용은 절대 포함하지 마세요.
+        내용은 마크다운 형식으로 작성해주세요.
+        """ + get_edition(edition)["instruction"]
+    return [
+        {"role": "system", "content": "AI 디지털 트랜스포메이션 활용사례 콘텐츠 생성 전문가. 정확하고 구체적인 정보만 포함합니다."},
+        {"role": "user", "content": prompt}
+    ]
+
+def generate_ai_use_case_content(openai_api_key, use_case_data, routing_policy=None, bodies=None, edition="ko"):
+    """
+    OpenAI를 사용하여 AI 활용사례 콘텐츠를 생성합니다.
+    '사례 확인해보기→' 링크를 포함합니다.
+    SOURCE_URL과 SOURCE_NAME 제거됨
+    API 키나 검색 결과가 없거나 생성에 실패하면 에디션 언어의 기본 콘텐츠를 반환합니다.
+    """
+    if not openai_api_key or not use_case_data:
+        # OpenAI API가 없거나 검색 결과가 없는 경우 기본 콘텐츠 반환
+        return get_edition(edition)["defaults"]["ai_use_case_no_data"]
+    
+    # 선택된 활용사례 링크와 출처를 저장할 변수
+    selected_source = ""
+    selected_link = ""
+    
+    client = get_openai_client(openai_api_key)
+    
+    try:
+        content = chat_completion(client, 'ai_use_case', _ai_use_case_messages(use_case_data, bodies, edition), routing_policy)
+        
+        # 링크가 없는 경우 첫 번째 항목의 링크 사용
+        if not selected_link and use_case_data:
+            selected_link = use_case_data[0]['link']
+            
+        # 출처가 없는 경우 첫 번째 항목의 블로그명 사용
+        labels = get_edition(edition)["labels"]
+        if not selected_source and use_case_data:
+            selected_source = use_case_data[0].get('bloggername', labels['unknown_source'])
+        
+        # 출처 표시와 링크 추가
+        content_html = convert_markdown_to_html(content)
+        content_html += f"""
+        <p style="text-align: right; margin-top: 15px;"><a href="{selected_link}" target="_blank" style="color: #ff5722; text-decoration: none; font-weight: bold;">{labels['see_case']}</a></p>
+        <p style="font-size: 8pt; text-align: right; color: #666;">{labels['source']}: {selected_source}</p>
+        """
+        
+        return content_html
+    except Exception as e:
+        print(f"OpenAI API 오류: {str(e)}")
+        # 오류 발생 시 기본 콘텐츠 반환
+        return get_edition(edition)["defaults"]["ai_use_case_error"]
+
+# 통합된 뉴스레터 생성 함수
+def generate_combined_newsletter(openai_api_key, news_api_key, naver_client_id, naver_client_secret,
+                                 news_query_en, news_query_ko, language="en", custom_success_story=None,
+                                 issue_num=1, highlight_settings=None, routing_policy=None, enrich_articles=False,
+                                 main_news_mode="top", use_ranking=True, merge_slots=False, use_translation_cache=True,
+                                 edition="ko", sections=None, use_evergreen_library=True, use_thumbnails=True,
+                                 dry_run=False):
+    """OpenAI, NewsAPI, 네이버 API를 모두 사용하여 통합된 뉴스레터 HTML을 생성합니다.
+    dry_run이 True이면 생성하지 않고 실행 계획(plan_newsletter_run)을 반환합니다."""
+    options = dict(
+        openai_api_key=openai_api_key, news_api_key=news_api_key,
+        naver_client_id=naver_client_id, naver_client_secret=naver_client_secret,
+        news_query_en=news_query_en, news_query_ko=news_query_ko, language=language,
+        custom_success_story=custom_success_story, issue_num=issue_num, highlight_settings=highlight_settings,
+        routing_policy=routing_policy, enrich_articles=enrich_articles, main_news_mode=main_news_mode,
+        use_ranking=use_ranking, merge_slots=merge_slots, use_translation_cache=use_translation_cache,
+        sections=sections, use_evergreen_library=use_evergreen_library, use_thumbnails=use_thumbnails
+    )
+    if dry_run:
+        return plan_newsletter_run(editions=(edition,), **options)
+    return generate_newsletter_issue(edition=edition, **options)["html"]
+
+# AI 팁 주제 데이터베이스 - 호수에 따라 순환하여 제공
+AI_TIP_TOPICS = [
+    "효과적인 프롬프트 작성의 기본 원칙 (Chain of Thought, Chain of Draft)",
+    "특정 업무별 최적의 프롬프트 템플릿",
+    "AI를 활용한 데이터 분석 프롬프트 기법",
+    "창의적 작업을 위한 AI 프롬프트 전략",
+    "AI와 협업하여 문제 해결하기",
+    "다양한 AI 도구 활용법 비교",
+    "업무 자동화를 위한 AI 프롬프트 설계",
+    "AI를 활용한 의사결정 지원 기법"
+]
+
+class SectionContext:
+    """
+    한 호를 생성하는 동안 섹션들이 공유하는 입력값과 데이터 의존성입니다.
+    의존성은 처음 요청될 때 한 번만 계산되어 모든 섹션과 에디션이 재사용하며, 요청되지 않은 의존성은 계산하지 않습니다.
+    작업 스레드에서 사용되므로 오류는 화면에 직접 표시하지 않고 errors에 모읍니다.
+    """
+
+    def __init__(self, **params):
+        self.params = params
+        self.fetched_at = datetime.now()
+        self.errors = []
+        self._values = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        openai_api_key = self.params.get("openai_api_key")
+        return get_openai_client(openai_api_key) if openai_api_key else None
+
+    @property
+    def available(self):
+        """입력된 API 키로 사용할 수 있는 외부 서비스 목록"""
+        available = set()
+        if self.params.get("openai_api_key"):
+            available.add("openai")
+        if self.params.get("news_api_key"):
+            available.add("news")
+        if self.params.get("naver_client_id") and self.params.get("naver_client_secret"):
+            available.add("naver")
+        return available
+
+    @property
+    def resolved(self):
+        return list(self._values)
+
+    def date(self, edition="ko"):
+        return self.fetched_at.strftime(get_edition(edition)["date_format"])
+
+    def add_error(self, message):
+        with self._lock:
+            self.errors.append(message)
+
+    def resolve(self, name):
+        """의존성 값을 반환합니다. 여러 섹션이 동시에 요청해도 한 번만 계산하며, 실패하면 같은 예외를 다시 발생시킵니다."""
+        with self._lock:
+            lock = self._locks.setdefault(name, threading.Lock())
+        with lock:
+            if name not in self._values:
+                dependency = SECTION_DEPENDENCIES[name]
+                try:
+                    self._values[name] = (dependency["resolve"](self), None)
+                except Exception as e:
+                    self._values[name] = (None, e)
+                    self.add_error(f"{dependency['error']}: {str(e)}")
+        value, error = self._values[name]
+        if error is not None:
+            raise error
+        return value
+
+# 섹션 데이터 의존성: 에디션 언어와 무관하여 한 번 가져오면 모든 에디션이 공유
+def _resolve_global_news(ctx):
+    """NewsAPI 기사를 가져와 주요 소식 후보를 고릅니다 (map-reduce 방식이면 여러 페이지의 기사를 모두 요약/평가하여 고름)."""
+    params = ctx.params
+    # map-reduce 방식은 검색어마다 여러 페이지(최대 NEWSAPI_PAGE_SIZE x MAP_REDUCE_NEWS_PAGES건)를 가져옴
+    paging = {"page_size": NEWSAPI_PAGE_SIZE, "pages": MAP_REDUCE_NEWS_PAGES} if params["main_news_mode"] == "map_reduce" else {}
+    
+    # 일반 뉴스 가져오기
+    news_articles = call_with_last_good(
+        ctx, "newsapi", f"{params['news_query_en']}|{params['language']}",
+        lambda: fetch_real_time_news(params["news_api_key"], query=params["news_query_en"], days=7, language=params["language"], **paging)
+    )
+    
+    # OpenAI 관련 뉴스 가져오기
+    openai_articles = call_with_last_good(
+        ctx, "newsapi", f"OpenAI|{params['language']}",
+        lambda: fetch_real_time_news(params["news_api_key"], query="OpenAI", days=7, language=params["language"], **paging)
+    )
+    
+    if params["main_news_mode"] == "map_reduce":
+        # 관련성 상위 후보만 map 단계로 넘겨 호출 수를 줄임
+        if params["use_ranking"]:
+            news_articles = rank_articles(news_articles, params["news_query_en"], top_k=MAP_REDUCE_CANDIDATES["general"])
+            openai_articles = rank_articles(openai_articles, "OpenAI", top_k=MAP_REDUCE_CANDIDATES["openai"])
+        
+        # 전체 기사를 병렬로 요약/평가한 뒤 상위 기사만 사용 (요약 결과는 모든 에디션이 공유)
+        global_news = summarize_news_map_reduce(ctx.client, news_articles, openai_articles, params["routing_policy"])
+        if global_news["failed_chunks"]:
+            ctx.add_error(f"기사 요약 일부 실패: {global_news['chunks']}개 묶음 중 {global_news['failed_chunks']}개 (해당 기사는 원래 설명으로 평가)")
+    else:
+        if params["use_ranking"]:
+            top_news = rank_articles(news_articles, params["news_query_en"], top_k=5)
+            top_openai_news = rank_articles(openai_articles, "OpenAI", top_k=3)
+        else:
+            top_news = news_articles[:5]
+            top_openai_news = openai_articles[:3]
+        global_news = {"top_news": top_news, "top_openai_news": top_openai_news, "summary_language": params["language"]}
+    
+    # 선택된 기사의 본문을 동시에 추출하여 프롬프트 보강
+    global_news["bodies"] = {}
+    if params["enrich_articles"]:
+        global_news["bodies"] = fetch_article_bodies([article['url'] for article in global_news["top_news"] + global_news["top_openai_news"]])
+    return global_news
+
+def _resolve_naver_news(ctx):
+    params = ctx.params
+    return call_with_last_good(
+        ctx, "naver", f"news|{params['news_query_ko']}",
+        lambda: fetch_naver_news(params["naver_client_id"], params["naver_client_secret"], params["news_query_ko"], display=2, days=7, rank=params["use_ranking"])
+    )
+
+def _resolve_naver_trends(ctx):
+    params = ctx.params
+    return call_with_last_good(
+        ctx, "naver", "news|AI 트렌드",
+        lambda: fetch_naver_news(params["naver_client_id"], params["naver_client_secret"], "AI 트렌드", display=2, days=7, rank=params["use_ranking"])
+    )
+
+def _resolve_ai_use_cases(ctx):
+    params = ctx.params
+    items = call_with_last_good(
+        ctx, "naver", "blog|AI 활용사례",
+        lambda: fetch_ai_use_cases(params["naver_client_id"], params["naver_client_secret"], "AI 활용사례", display=3, days=30, rank=params["use_ranking"])
+    )
+    
+    # AI 활용사례 원문 본문 추출 (선택)
+    bodies = {}
+    if params["enrich_articles"] and params["openai_api_key"]:
+        bodies = fetch_article_bodies([get_article_url(item) for item in items])
+    return {"items": items, "bodies": bodies}
+
+# 의존성 plan 훅: 실행 계획(plan_newsletter_run)에서 호출 없이 resolve와 같은 단계를 기록하고 ((가상) 데이터, 소요 시간)을 반환
+def _plan_resolve_global_news(planner):
+    params = planner.ctx.params
+    map_reduce = params["main_news_mode"] == "map_reduce"
+    pages = MAP_REDUCE_NEWS_PAGES if map_reduce else 1
+    fetched = [
+        planner.fetch(f"NewsAPI 검색 ({query})", "newsapi", f"{query}|{params['language']}", count=pages)
+        for query in (params["news_query_en"], "OpenAI")
+    ]
+    sample_count = NEWSAPI_PAGE_SIZE * MAP_REDUCE_NEWS_PAGES if map_reduce else 20
+    news_articles = fetched[0][1] or _sample_articles(sample_count, params["news_query_en"])
+    openai_articles = fetched[1][1] or _sample_articles(sample_count, "OpenAI")
+    seconds = _sum_seconds(planner.span("api:newsapi", pages) for called, _ in fetched if called)
+    value = {"top_news": news_articles[:5], "top_openai_news": openai_articles[:3], "summary_language": params["language"], "bodies": {}}
+    
+    if map_reduce:
+        if params["use_ranking"]:
+            news_articles = news_articles[:MAP_REDUCE_CANDIDATES["general"]]
+            openai_articles = openai_articles[:MAP_REDUCE_CANDIDATES["openai"]]
+        tagged = [article for article in openai_articles + news_articles if article.get("title")]
+        chunks = _chunk(list(enumerate(tagged)), 10)
+        # map 단계는 8개 작업씩 동시에 실행
+        if planner.llm(f"기사 요약/평가 map ({len(tagged)}건)", "main_news_map", [_news_chunk_messages(chunk) for chunk in chunks]):
+            seconds = _sum_seconds([seconds, planner.span("main_news_map", -(-len(chunks) // 8))])
+        value.update(summary_language="ko", candidates=(len(openai_articles), len(news_articles)))
+    
+    if params["enrich_articles"]:
+        seconds = _sum_seconds([seconds, planner.article_bodies([article["url"] for article in value["top_news"] + value["top_openai_news"]], "주요 소식 기사")])
+    return value, seconds
+
+def _plan_naver_search(planner, query):
+    called, cached = planner.fetch(f"네이버 뉴스 검색 ({query})", "naver", f"news|{query}")
+    return (cached or [])[:2], planner.span("api:naver") if called else [0.0, 0.0]
+
+def _plan_resolve_naver_news(planner):
+    return _plan_naver_search(planner, planner.ctx.params["news_query_ko"])
+
+def _plan_resolve_naver_trends(planner):
+    return _plan_naver_search(planner, "AI 트렌드")
+
+def _plan_resolve_ai_use_cases(planner):
+    params = planner.ctx.params
+    called, cached = planner.fetch("네이버 블로그 검색 (AI 활용사례)", "naver", "blog|AI 활용사례", count=3)
+    items = cached or [
+        dict(article, link=article["url"], bloggername="예시 블로그") for article in _sample_articles(3, "AI 활용사례")
+    ]
+    seconds = planner.span("api:naver", 3) if called else [0.0, 0.0]
+    if params["enrich_articles"] and params["openai_api_key"]:
+        seconds = _sum_seconds([seconds, planner.article_bodies([get_article_url(item) for item in items], "AI 활용사례")])
+    return {"items": items, "bodies": {}}, seconds
+
+# 의존성 이름 -> 필요한 API, 계산 함수, 실행 계획 훅, 실패 시 표시할 오류 제목
+SECTION_DEPENDENCIES = {
+    "global_news": {"requires": ("news",), "resolve": _resolve_global_news, "plan": _plan_resolve_global_news, "error": "News API 오류"},
+    "naver_news": {"requires": ("naver",), "resolve": _resolve_naver_news, "plan": _plan_resolve_naver_news, "error": "네이버 API 오류"},
+    "naver_trends": {"requires": ("naver",), "resolve": _resolve_naver_trends, "plan": _plan_resolve_naver_trends, "error": "네이버 AI 트렌드 API 오류"},
+    "ai_use_cases": {"requires": ("naver",), "resolve": _resolve_ai_use_cases, "plan": _plan_resolve_ai_use_cases, "error": "AI 활용사례 가져오기 오류"},
+}
+
+def _news_info_headers(global_news, edition="ko"):
+    """주요 소식 프롬프트의 (OpenAI 뉴스, 일반 뉴스) 머리글을 에디션 문구로 만듭니다."""
+    labels = get_edition(edition)["labels"]
+    if "candidates" in global_news:
+        openai_count, news_count = global_news["candidates"]
+        return (
+            labels["openai_news_ranked_header"].format(count=openai_count),
+            labels["news_ranked_header"].format(count=news_count),
+        )
+    return labels["openai_news_header"], labels["news_header"]
+
+def build_news_info(ctx, edition="ko"):
+    """수집된 NewsAPI 기사(map-reduce 방식이면 한국어 요약)를 에디션 언어에 맞춰 주요 소식 프롬프트용 (OpenAI 뉴스, 일반 뉴스) 텍스트로 만듭니다."""
+    labels = get_edition(edition)["labels"]
+    try:
+        global_news = ctx.resolve("global_news")
+    except Exception:
+        return labels["openai_news_failed"], labels["news_failed"]
+    
+    top_news = global_news["top_news"]
+    top_openai_news = global_news["top_openai_news"]
+    # 에디션과 언어가 다른 기사(요약)는 캐시된 번역을 사용하여 섹션 프롬프트에서 번역하지 않도록 함
+    if ctx.params["use_translation_cache"] and global_news["summary_language"] != edition and top_news + top_openai_news:
+        translated = translate_articles(ctx.client, top_news + top_openai_news, edition, ctx.params["routing_policy"])
+        top_news, top_openai_news = translated[:len(top_news)], translated[len(top_news):]
+    
+    headers = _news_info_headers(global_news, edition)
+    return (
+        format_news_info(top_openai_news, headers[0], global_news["bodies"]),
+        format_news_info(top_news, headers[1], global_news["bodies"]),
+    )
+
+def render_naver_news_section(articles, heading, empty_message, edition="ko"):
+    """네이버 뉴스 검색 결과를 에디션 문구와 날짜 형식에 맞춰 섹션 HTML로 만듭니다."""
+    settings = get_edition(edition)
+    labels = settings["labels"]
+    content = f"<h2>{heading}</h2>"
+    
+    if not articles:
+        return content + f"<p>{empty_message}</p>"
+    
+    for i, article in enumerate(articles):
+        # HTML 태그 제거
+        title = article['title'].replace("<b>", "").replace("</b>", "")
+        description = article['description'].replace("<b>", "").replace("</b>", "")
+        
+        # 날짜 표시 추가
+        pub_date_str = article.get('pubDate', '')
+        pub_date_display = ""
+        try:
+            if pub_date_str:
+                pub_date = datetime.strptime(pub_date_str, '%a, %d %b %Y %H:%M:%S %z')
+                pub_date_display = pub_date.strftime(settings["date_format"])
+        except Exception:
+            pub_date_display = labels["no_date"]
+        
+        content += f"<h3>{title}</h3>"
+        content += f"<p><small>{labels['published']}: {pub_date_display}</small></p>"
+        content += f"<p>{description}</p>"
+        content += f"<p><a href='{article['link']}' target='_blank'>{labels['read_original']}</a> | {labels['source']}: {article.get('originallink', article['link'])}</p>"
+        
+        if i < len(articles) - 1:  # 마지막 뉴스가 아닌 경우 구분선 추가
+            content += "<hr>"
+    return content
+
+def _main_news_prompt(date, openai_news_info, news_info):
+    return f"""
+        AIDT Weekly 뉴스레터의 '주요 소식' 섹션을 생성해주세요.
+        오늘 날짜는 {date}입니다. 아래는 두 종류의 뉴스 기사입니다:
+        
+        === OpenAI 관련 뉴스 ===
+        {openai_news_info}
+        
+        === 일반 뉴스 ===
+        {news_info}
+        
+        총 2개의 주요 소식을 다음 형식으로 작성해주세요:
+        
+        1. 먼저 OpenAI 관련 뉴스에서 가장 중요하고 관련성 높은 1개의 소식을 선택하여 작성하세요.
+        2. 그 다음 일반 뉴스에서 가장 중요하고 관련성 높은 1개의 소식을 선택하여 작성하세요.
+        
+        각 소식은 다음 형식으로 작성해주세요:
+        ## [주제]의 [핵심 강점/특징]은 [주목할만합니다/확인됐습니다/중요합니다].
+        
+        간략한 내용을 1-2문장으로 작성하세요. 내용은 특정 기술이나 서비스, 기업의 최신 소식을 다루고, 
+        핵심 내용만 포함해주세요. 그리고 왜 중요한지를 강조해주세요.
+        
+        구체적인 수치나 인용구가 있다면 추가해주세요.
+        
+        각 소식의 마지막에는 뉴스 기사의 발행일과 출처를 반드시 "[출처 제목](출처 URL)" 형식으로 포함하세요.
+        
+        모든 주제는 반드시 제공된 실제 뉴스 기사에서만 추출해야 합니다. 가상의 정보나 사실이 아닌 내용은 절대 포함하지 마세요.
+        각 소식 사이에 충분한 공백을 두어 가독성을 높여주세요.
+        """
+
+def _aidt_tips_prompt(current_topic):
+    return f"""
+        AIDT Weekly 뉴스레터의 '이번 주 AT/DT 팁' 섹션을 생성해주세요.
+        
+        이번 주 팁 주제는 "{current_topic}"입니다.
+        
+        이 주제에 대해 다음 형식으로 실용적인 팁을 작성해주세요:
+        
+        ## 이번 주 팁: [주제에 맞는 구체적인 팁 제목]
+        
+        팁에 대한 배경과 중요성을 2-3문장으로 간결하게 설명해주세요. AI 기본기와 관련된 내용을 포함하세요.
+        특히, 영어 용어는 한글로 번역하지 말고 그대로 사용해주세요 (예: "Chain of Thought", "Chain of Draft").
+        
+        **핵심 프롬프트 예시:**
+        - 첫 번째 프롬프트 템플릿 (Chain of Thought 활용):
+          예시: [이 문제/작업에 대한 실제 예시를 제시하세요]
+          프롬프트: [구체적인 Chain of Thought 프롬프트 템플릿을 작성하세요]
+        
+        - 두 번째 프롬프트 템플릿 (Chain of Draft 활용):
+          예시: [이 문제/작업에 대한 실제 예시를 제시하세요]
+          프롬프트: [구체적인 Chain of Draft 프롬프트 템플릿을 작성하세요]
+        
+        - 세 번째 프롬프트 템플릿 (Chain of Thought와 Chain of Draft 결합):
+          예시: [이 문제/작업에 대한 실제 예시를 제시하세요]
+          프롬프트: [두 기법을 결합한 프롬프트 템플릿을 작성하세요]
+        
+        이 팁을 활용했을 때의 업무 효율성 향상이나 결과물 품질 개선 등 구체적인 이점을 한 문장으로 작성해주세요.
+        
+        다음 주에는 다른 AI 기본기 팁을 알려드리겠습니다.
+        """
+
+def _success_story_prompt():
+    return """
+        AIDT Weekly 뉴스레터의 '성공 사례' 섹션을 생성해주세요.
+        한국 기업 사례 1개와 외국 기업 사례 1개를 생성해야 합니다.
+        각 사례는 제목과 3개의 단락으로 구성되어야 합니다.
+        각 단락은 3~4줄로 구성하고, 구체적인 내용과 핵심 정보를 포함해야 합니다.
+        단락 사이에는 한 줄을 띄워서 가독성을 높여주세요.
+        
+        형식:
+        
+        ## [한국 기업명]의 AI 혁신 사례
+        
+        첫 번째 단락에서는 기업이 직면한 문제와 배경을 상세히 설명합니다. 구체적인 수치나 상황을 포함하여 3~4줄로 작성해주세요. 이 부분에서는 독자가 왜 이 기업이 AI 솔루션을 필요로 했는지 이해할 수 있도록 해주세요.
+        
+        두 번째 단락에서는 기업이 도입한 AI 솔루션을 상세히 설명합니다. 어떤 기술을 사용했는지, 어떻게 구현했는지, 특별한 접근 방식은 무엇이었는지 등을 포함하여 3~4줄로 작성해주세요.
+        
+        세 번째 단락에서는 AI 도입 후 얻은 구체적인 성과와 결과를 설명합니다. 가능한 한 정량적인 수치(비용 절감, 효율성 증가, 고객 만족도 향상 등)를 포함하여 3~4줄로 작성해주세요.
+        
+        ## [외국 기업명]의 AI 혁신 사례
+        
+        첫 번째 단락에서는 기업이 직면한 문제와 배경을 상세히 설명합니다. 구체적인 수치나 상황을 포함하여 3~4줄로 작성해주세요. 이 부분에서는 독자가 왜 이 기업이 AI 솔루션을 필요로 했는지 이해할 수 있도록 해주세요.
+        
+        두 번째 단락에서는 기업이 도입한 AI 솔루션을 상세히 설명합니다. 어떤 기술을 사용했는지, 어떻게 구현했는지, 특별한 접근 방식은 무엇이었는지 등을 포함하여 3~4줄로 작성해주세요.
+        
+        세 번째 단락에서는 AI 도입 후 얻은 구체적인 성과와 결과를 설명합니다. 가능한 한 정량적인 수치(비용 절감, 효율성 증가, 고객 만족도 향상 등)를 포함하여 3~4줄로 작성해주세요.
+        """
+
+def _section_messages(prompt, edition="ko"):
+    """섹션 생성 요청 메시지를 만듭니다. 한국어가 아닌 에디션은 해당 언어로 작성하도록 지시를 덧붙입니다."""
+    return [
+        {"role": "system", "content": "AI 디지털 트랜스포메이션 뉴스레터 콘텐츠 생성 전문가. 간결하고 핵심적인 내용만 포함한 뉴스레터를 작성합니다."},
+        {"role": "user", "content": prompt + get_edition(edition)["instruction"]}
+    ]
+
+def _generate_prompt_section(ctx, section, prompt, edition="ko"):
+    """프롬프트로 섹션 내용을 생성합니다."""
+    content = chat_completion(ctx.client, section, _section_messages(prompt, edition), ctx.params["routing_policy"])
+    return convert_markdown_to_html(content)
+
+def _claim_evergreen(ctx, section, edition, topic=None):
+    """사전 생성된 내용이 있으면 사용 표시 후 HTML로 반환합니다. 없으면 None (실시간 생성)."""
+    if not ctx.params.get("use_evergreen_library"):
+        return None
+    entry = get_evergreen_library().claim(section, edition, ctx.params["issue_num"], topic)
+    return convert_markdown_to_html(entry["content"]) if entry else None
+
+def _generate_main_news(ctx, edition="ko"):
+    # 전역 뉴스가 없는 경우 생성하지 않음
+    if not ctx.params["news_api_key"]:
+        return f"<p>{get_edition(edition)['labels']['news_api_missing']}</p>"
+    openai_news_info, news_info = build_news_info(ctx, edition)
+    return _generate_prompt_section(ctx, "main_news", _main_news_prompt(ctx.date(edition), openai_news_info, news_info), edition)
+
+def _plan_generate_main_news(planner, edition="ko"):
+    ctx = planner.ctx
+    if not ctx.params["news_api_key"]:
+        return planner.section("main_news", edition, status="기본 콘텐츠")
+    # build_news_info와 같은 순서: 에디션과 언어가 다른 기사(요약)는 캐시된 번역을 사용
+    global_news = planner.resolve("global_news")
+    top_news, top_openai_news = global_news["top_news"], global_news["top_openai_news"]
+    seconds = [0.0, 0.0]
+    if ctx.params["use_translation_cache"] and global_news["summary_language"] != edition and top_news + top_openai_news:
+        seconds = planner.translation(top_news + top_openai_news, edition, "주요 소식 기사")
+    headers = _news_info_headers(global_news, edition)
+    openai_news_info = format_news_info(top_openai_news, headers[0])
+    news_info = format_news_info(top_news, headers[1])
+    messages = _section_messages(_main_news_prompt(ctx.date(edition), openai_news_info, news_info), edition)
+    return _sum_seconds([seconds, planner.section("main_news", edition, messages)])
+
+def _generate_aidt_tips(ctx, edition="ko"):
+    # 호수(주차)에 해당하는 주제 선택 (순환)
+    current_topic = AI_TIP_TOPICS[(ctx.params["issue_num"] - 1) % len(AI_TIP_TOPICS)]
+    precomputed = _claim_evergreen(ctx, "aidt_tips", edition, current_topic)
+    if precomputed is not None:
+        return precomputed
+    return _generate_prompt_section(ctx, "aidt_tips", _aidt_tips_prompt(current_topic), edition)
+
+def _plan_generate_aidt_tips(planner, edition="ko"):
+    params = planner.ctx.params
+    current_topic = AI_TIP_TOPICS[(params["issue_num"] - 1) % len(AI_TIP_TOPICS)]
+    if params["use_evergreen_library"] and get_evergreen_library().peek("aidt_tips", edition, params["issue_num"], current_topic):
+        return planner.section("aidt_tips", edition, status="사전 생성분 사용")
+    return planner.section("aidt_tips", edition, _section_messages(_aidt_tips_prompt(current_topic), edition))
+
+def _generate_success_story(ctx, edition="ko"):
+    # 사용자가 입력한 성공 사례가 있으면 생성 건너뛰기
+    if ctx.params["custom_success_story"]:
+        return convert_markdown_to_html(ctx.params["custom_success_story"])
+    precomputed = _claim_evergreen(ctx, "success_story", edition)
+    if precomputed is not None:
+        return precomputed
+    if ctx.client is None:
+        return get_default_success_story(edition)
+    return _generate_prompt_section(ctx, "success_story", _success_story_prompt(), edition)
+
+def _plan_generate_success_story(planner, edition="ko"):
+    params = planner.ctx.params
+    if params["custom_success_story"]:
+        return planner.section("success_story", edition, status="직접 입력")
+    if params["use_evergreen_library"] and get_evergreen_library().peek("success_story", edition, params["issue_num"]):
+        return planner.section("success_story", edition, status="사전 생성분 사용")
+    if planner.ctx.client is None:
+        return planner.section("success_story", edition, status="기본 콘텐츠")
+    return planner.section("success_story", edition, _section_messages(_success_story_prompt(), edition))
+
+def _generate_naver_section(ctx, edition, dependency):
+    """네이버 검색 결과로 섹션을 만듭니다. 한국어가 아닌 에디션은 제목과 설명만 번역(캐시)하고 링크와 날짜는 그대로 사용합니다."""
+    labels = get_edition(edition)["labels"]
+    try:
+        articles = ctx.resolve(dependency)
+    except Exception as e:
+        return f"<p>{labels[f'{dependency}_error']}: {str(e)}</p>"
+    
+    if edition != "ko" and ctx.client is not None and articles:
+        stripped = [
+            dict(item, title=item['title'].replace("<b>", "").replace("</b>", ""), description=item['description'].replace("<b>", "").replace("</b>", ""))
+            for item in articles
+        ]
+        articles = translate_articles(ctx.client, stripped, edition, ctx.params["routing_policy"])
+    return render_naver_news_section(articles, labels[f"{dependency}_heading"], labels[f"{dependency}_empty"], edition)
+
+def _plan_naver_section(planner, edition, dependency):
+    """네이버 섹션은 LLM 생성 없이 한국어가 아닌 에디션에서만 번역 호출이 생깁니다 (검색 결과가 없으면 가상 기사로 추정)."""
+    if edition == "ko" or planner.ctx.client is None:
+        return [0.0, 0.0]
+    articles = [
+        dict(item, title=item['title'].replace("<b>", "").replace("</b>", ""), description=item['description'].replace("<b>", "").replace("</b>", ""))
+        for item in planner.resolve(dependency) or []
+    ]
+    label = EDITION_LANGUAGES["ko"]["labels"][dependency]
+    return planner.translation(articles or _sample_articles(2, planner.ctx.params["news_query_ko"]), edition, label)
+
+def _generate_naver_news(ctx, edition="ko"):
+    return _generate_naver_section(ctx, edition, "naver_news")
+
+def _plan_generate_naver_news(planner, edition="ko"):
+    return _plan_naver_section(planner, edition, "naver_news")
+
+def _generate_naver_trends(ctx, edition="ko"):
+    return _generate_naver_section(ctx, edition, "naver_trends")
+
+def _plan_generate_naver_trends(planner, edition="ko"):
+    return _plan_naver_section(planner, edition, "naver_trends")
+
+def _generate_ai_use_case(ctx, edition="ko"):
+    use_cases = ctx.resolve("ai_use_cases")
+    return generate_ai_use_case_content(
+        ctx.params["openai_api_key"], use_cases["items"], ctx.params["routing_policy"], use_cases["bodies"], edition
+    )
+
+def _plan_generate_ai_use_case(planner, edition="ko"):
+    use_cases = planner.resolve("ai_use_cases")
+    if not planner.ctx.params["openai_api_key"] or not use_cases or not use_cases["items"]:
+        return planner.section("ai_use_case", edition, status="기본 콘텐츠")
+    return planner.section("ai_use_case", edition, _ai_use_case_messages(use_cases["items"], use_cases["bodies"], edition))
+
+def plan_sections(ctx, sections=None):
+    """
+    생성할 섹션과 필요한 의존성을 정합니다.
+    (섹션 이름, 생성 여부) 목록과 의존성 목록을 반환하며, 필요한 API가 없는 섹션은 대체 콘텐츠를 사용하거나 생략합니다.
+    """
+    if sections is None:
+        sections = [name for name, spec in NEWSLETTER_SECTIONS.items() if spec["enabled"]]
+    available = ctx.available
+    plan = []
+    dependencies = []
+    for name in NEWSLETTER_SECTIONS:
+        if name not in sections:
+            continue
+        spec = NEWSLETTER_SECTIONS[name]
+        runnable = set(spec["requires"]) <= available
+        if not runnable and spec["fallback"] is None:
+            continue
+        plan.append((name, runnable))
+        if runnable:
+            dependencies.extend(
+                dep for dep in spec["deps"]
+                if dep not in dependencies and set(SECTION_DEPENDENCIES[dep]["requires"]) <= available
+            )
+    return plan, dependencies
+
+def _generate_section(ctx, name, edition):
+    spec = NEWSLETTER_SECTIONS[name]
+    try:
+        return spec["generate"](ctx, edition)
+    except Exception as e:
+        if spec["fallback"] is not None:
+            return spec["fallback"](edition)
+        return f"<p>{get_edition(edition)['labels']['content_error']}: {e}</p>"
+
+def generate_newsletter_editions(openai_api_key, news_api_key, naver_client_id, naver_client_secret,
+                                 news_query_en, news_query_ko, language="en", custom_success_story=None,
+                                 issue_num=1, highlight_settings=None, routing_policy=None, enrich_articles=False,
+                                 main_news_mode="top", use_ranking=True, merge_slots=False, use_translation_cache=True,
+                                 editions=("ko",), sections=None, max_workers=16, use_evergreen_library=True,
+                                 use_thumbnails=True):
+    """
+    활성화된 섹션만 (에디션, 섹션) 단위로 병렬 생성하여 {에디션: 뉴스레터} 형태로 반환합니다.
+    섹션 데이터(기사 검색 등)는 필요한 것만 한 번 가져와 모든 섹션과 에디션이 공유하므로,
+    에디션을 추가해도 늘어나는 비용은 해당 에디션의 LLM 호출뿐이고 비활성 섹션은 비용이 들지 않습니다.
+    use_thumbnails이면 기사 썸네일을 섹션 생성과 동시에 만들어 뉴스 섹션에 넣습니다.
+    """
+    started = time.perf_counter()
+    editions = list(dict.fromkeys(editions)) or ["ko"]
+    ctx = SectionContext(
+        openai_api_key=openai_api_key, news_api_key=news_api_key,
+        naver_client_id=naver_client_id, naver_client_secret=naver_client_secret,
+        news_query_en=news_query_en, news_query_ko=news_query_ko, language=language,
+        custom_success_story=custom_success_story, issue_num=issue_num, routing_policy=routing_policy,
+        enrich_articles=enrich_articles, main_news_mode=main_news_mode, use_ranking=use_ranking,
+        use_translation_cache=use_translation_cache, use_evergreen_library=use_evergreen_library
+    )
+    plan, dependencies = plan_sections(ctx, sections)
+    
+    # 하이라이트 설정 기본값
+    if highlight_settings is None:
+        highlight_settings = {
+            "title": "중부Infra AT/DT 뉴스레터 개시",
+            "subtitle": "AI, 어떻게 시작할지 막막하다면?",
+            "link_text": "AT/DT 추진방향 →",
+            "link_url": "#"
+        }
+    
+    contents = {edition: {} for edition in editions}
+    tasks = [(edition, name) for edition in editions for name, runnable in plan if runnable]
+    for edition in editions:
+        for name, runnable in plan:
+            if not runnable:
+                contents[edition][name] = NEWSLETTER_SECTIONS[name]["fallback"](edition)
+    
+    thumbnail_future = None
+    if tasks:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(tasks) + len(dependencies))) as executor:
+            # 필요한 의존성을 미리 동시에 가져오기 시작 (섹션이 먼저 요청하면 그 자리에서 한 번만 계산됨)
+            for dependency in dependencies:
+                executor.submit(ctx.resolve, dependency)
+            # 썸네일 단계는 기사 검색이 끝나는 대로 LLM 호출과 동시에 진행 (별도 풀이라 섹션 생성 완료를 막지 않음)
+            if use_thumbnails and any(name in THUMBNAIL_SECTIONS for _, name in tasks):
+                thumbnail_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="thumbnail-stage")
+                thumbnail_future = thumbnail_executor.submit(resolve_thumbnails, ctx, dependencies)
+                thumbnail_executor.shutdown(wait=False)
+            futures = {task: executor.submit(_generate_section, ctx, task[1], task[0]) for task in tasks}
+        for (edition, name), future in futures.items():
+            contents[edition][name] = future.result()
+    
+    if thumbnail_future is not None:
+        # 섹션이 모두 끝난 뒤에는 잠깐만 기다리고, 늦으면 이번 호는 이미지 없이 발행 (만든 썸네일은 캐시되어 다음 실행에 사용)
+        try:
+            thumbnails = thumbnail_future.result(timeout=THUMBNAIL_WAIT_SECONDS)
+        except FutureTimeoutError:
+            print("썸네일 준비가 늦어 이번 생성에서는 이미지를 넣지 않습니다.")
+            thumbnails = {}
+        except Exception as e:
+            print(f"썸네일 단계 오류: {str(e)}")
+            thumbnails = {}
+        for edition in editions:
+            for name in THUMBNAIL_SECTIONS:
+                if name in contents[edition] and thumbnails:
+                    contents[edition][name] = attach_thumbnails(contents[edition][name], thumbnails)
+    
+    for error in ctx.errors:
+        st.error(error)
+    
+    issues = {}
+    for edition in editions:
+        # 템플릿 순서대로 정렬
+        newsletter_content = {name: contents[edition][name] for name, _ in plan}
+        date = ctx.date(edition)
+        html_content = generate_combined_html_template(newsletter_content, issue_num, date, highlight_settings, merge_slots, edition)
+        issues[edition] = {
+            "issue_number": issue_num,
+            "edition": edition,
+            "date": date,
+            "highlight_settings": highlight_settings,
+            "sections": newsletter_content,
+            "html": html_content,
+        }
+    
+    history = get_stage_history()
+    history.record("run:total", time.perf_counter() - started)
+    history.save()
+    get_idf_statistics().save()
+    save_last_good_results()
+    return issues
+
+def generate_newsletter_issue(openai_api_key, news_api_key, naver_client_id, naver_client_secret, 
+                             news_query_en, news_query_ko, language="en", custom_success_story=None, 
+                             issue_num=1, highlight_settings=None, routing_policy=None, enrich_articles=False,
+                             main_news_mode="top", use_ranking=True, merge_slots=False, use_translation_cache=True,
+                             edition="ko", sections=None, use_evergreen_library=True, use_thumbnails=True):
+    """OpenAI, NewsAPI, 네이버 API를 모두 사용하여 통합된 뉴스레터를 생성합니다.
+    사용 가능한 API만 활용하며, 렌더링된 HTML과 함께 섹션별 원본 콘텐츠를 반환합니다."""
+    return generate_newsletter_editions(
+        openai_api_key, news_api_key, naver_client_id, naver_client_secret, news_query_en, news_query_ko,
+        language, custom_success_story, issue_num, highlight_settings, routing_policy, enrich_articles,
+        main_news_mode, use_ranking, merge_slots, use_translation_cache, editions=(edition,), sections=sections,
+        use_evergreen_library=use_evergreen_library, use_thumbnails=use_thumbnails
+    )[edition]
+
+# 실행 계획의 비용 계산용 모델별 100만 토큰당 가격(USD, 입력/출력)
+MODEL_PRICES_PER_1M = {
+    "gpt-4o-mini": {"input": 0.15, "output": 0.60},
+    "gpt-4-turbo-preview": {"input": 10.0, "output": 30.0},
+}
+
+# 단계별 소요 시간(초)과 응답 토큰 수 기본값 - 기록(get_stage_history)이 없을 때 사용
+DEFAULT_STAGE_SECONDS = {
+    "api:newsapi": 1.0, "api:naver": 0.5, "article_bodies": 3.0, "translation": 8.0, "main_news_map": 10.0,
+    "main_news": 25.0, "aidt_tips": 15.0, "success_story": 30.0, "ai_use_case": 12.0,
+}
+DEFAULT_COMPLETION_TOKENS = {
+    "translation": 1200, "main_news_map": 900, "main_news": 700, "aidt_tips": 700, "success_story": 1100, "ai_use_case": 600,
+}
+
+def estimate_tokens(messages):
+    """토크나이저 없이 메시지의 프롬프트 토큰 수를 어림합니다 (영문 등 ASCII 약 4자당 1토큰, 한글 등은 1자당 약 1토큰)."""
+    text = "".join(message["content"] for message in messages)
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return int(ascii_chars / 4 + (len(text) - ascii_chars)) + 4 * len(messages)
+
+def _sum_seconds(spans):
+    """(p50, p95) 소요 시간 목록을 더합니다."""
+    total = [0.0, 0.0]
+    for span in spans:
+        total = [total[0] + span[0], total[1] + span[1]]
+    return total
+
+class _RunPlanner:
+    """
+    실행 계획에서 섹션과 의존성의 plan 훅이 호출 목록을 기록하고 단계별 예상 시간을 계산하는 데 쓰는 도우미입니다.
+    훅은 소요 시간을 (p50, p95) 목록으로 반환하며, 의존성 훅이 반환한 데이터는 resolve로 꺼내 씁니다.
+    """
+
+    def __init__(self, ctx):
+        self.ctx = ctx
+        self.calls = []
+        self.values = {}
+        self.history = get_stage_history()
+        self.last_good = get_persistent_cache("last_good_results", max_entries=200)
+        self.breakers = {name: breaker.snapshot() for name, breaker in get_circuit_breakers().items()}
+        self.defaults_used = set()
+
+    def resolve(self, name):
+        """의존성 plan 훅이 만든 (마지막 정상 결과 또는 가상) 데이터. 계획되지 않은 의존성은 None."""
+        return self.values.get(name)
+
+    def seconds(self, stage, q):
+        """기록된 q 백분위수 소요 시간. 기록이 없으면 기본값(비관 추정은 1.5배)을 사용합니다."""
+        value = self.history.percentile(stage, q)
+        if value is None:
+            self.defaults_used.add(stage)
+            return DEFAULT_STAGE_SECONDS.get(stage, 10.0) * (1.5 if q > 50 else 1.0)
+        return value
+
+    def span(self, stage, times=1):
+        """단계를 times번 차례로 실행할 때의 (p50, p95) 소요 시간"""
+        return [times * self.seconds(stage, q) for q in (50, 95)]
+
+    def is_open(self, provider):
+        return self.breakers[provider]["state"] == "open" and self.breakers[provider]["retry_after"] > 0
+
+    def fetch(self, stage, provider, cache_key, count=1):
+        """외부 API 검색 호출을 기록하고 (호출 여부, 마지막 정상 결과 또는 None)을 반환합니다."""
+        cached = self.last_good.get(f"{provider}:{cache_key}")
+        cached = cached["value"] if cached else None
+        if self.is_open(provider):
+            status = "차단 → 마지막 정상 결과" if cached is not None else "차단 → 기본 콘텐츠"
+            self.calls.append({"stage": stage, "provider": provider, "status": status, "count": count})
+            return False, cached
+        self.calls.append({"stage": stage, "provider": provider, "status": "호출", "count": count})
+        return True, cached
+
+    def llm(self, stage, section, messages_list, edition=None, status=None):
+        """LLM 호출(들)을 기록하고 실제로 호출되는지 반환합니다. status를 주면 호출 없이 그 상태로 기록합니다."""
+        row = {"stage": stage, "provider": "openai", "section": section, "edition": edition, "count": len(messages_list)}
+        if status is None and self.is_open("openai"):
+            status = "차단 → 기본 콘텐츠"
+        if status is not None or not messages_list:
+            self.calls.append(dict(row, status=status or "캐시", count=max(1, len(messages_list))))
+            return False
+        model = resolve_model_tier(section, self.ctx.params["routing_policy"])["model"]
+        prompt_tokens = sum(estimate_tokens(messages) for messages in messages_list)
+        completion_p50 = self.history.percentile(section, 50, "completion_tokens")
+        completion_tokens = int((completion_p50 or DEFAULT_COMPLETION_TOKENS.get(section, 700)) * len(messages_list))
+        price = MODEL_PRICES_PER_1M.get(model, {"input": 0.0, "output": 0.0})
+        self.calls.append(dict(
+            row, status="호출", model=model, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+            cost_usd=round((prompt_tokens * price["input"] + completion_tokens * price["output"]) / 1_000_000, 4)
+        ))
+        return True
+
+    def section(self, name, edition, messages=None, status=None):
+        """섹션 생성 호출 한 번(messages가 None이면 호출 없음)을 기록하고 소요 시간을 반환합니다."""
+        stage = f"{EDITION_LANGUAGES['ko']['labels'][name]} ({edition})"
+        called = self.llm(stage, name, [messages] if messages is not None else [], edition, status=status)
+        return self.span(name) if called else [0.0, 0.0]
+
+    def translation(self, articles, edition, label):
+        """번역 캐시에 없는 기사 수만큼 번역 호출을 기록하고 소요 시간을 반환합니다."""
+        cache = get_persistent_cache("translations", max_entries=20000)
+        missing = [(key, article) for key, article in ((_translation_cache_key(a, edition), a) for a in articles) if key not in cache]
+        if not missing:
+            self.llm(f"{label} 번역", "translation", [], edition, status="캐시")
+            return [0.0, 0.0]
+        if self.llm(f"{label} 번역 ({len(missing)}건)", "translation", [_translation_messages(batch, edition) for batch in _chunk(missing, 20)], edition):
+            return self.span("translation")
+        return [0.0, 0.0]
+
+    def article_bodies(self, urls, label):
+        """본문 캐시에 없는 URL 수만큼 본문 추출을 기록하고 소요 시간을 반환합니다."""
+        cache = get_persistent_cache("article_bodies", max_entries=2000)
+        missing = [url for url in dict.fromkeys(urls) if url and url not in cache]
+        self.calls.append({"stage": f"{label} 본문 추출", "provider": "web", "status": "호출" if missing else "캐시", "count": len(missing) or len(urls)})
+        return self.span("article_bodies") if missing else [0.0, 0.0]
+
+def _sample_articles(count, query):
+    """마지막 정상 결과가 없을 때 프롬프트 크기 추정에 쓰는 평균적인 길이의 가상 기사"""
+    return [
+        {
+            "title": f"{query} news headline about AI digital transformation in telecom {i}",
+            "description": "Operators and enterprises report results from AI pilots, including network automation, customer service and cost savings. " * 2,
+            "url": f"https://example.com/{i}", "publishedAt": "2025-01-01T00:00:00Z", "source": {"name": "Example News"},
+        }
+        for i in range(count)
+    ]
+
+def plan_newsletter_run(openai_api_key, news_api_key, naver_client_id, naver_client_secret,
+                        news_query_en, news_query_ko, language="en", custom_success_story=None,
+                        issue_num=1, highlight_settings=None, routing_policy=None, enrich_articles=False,
+                        main_news_mode="top", use_ranking=True, merge_slots=False, use_translation_cache=True,
+                        editions=("ko",), sections=None, max_workers=16, use_evergreen_library=True, use_thumbnails=True):
+    """
+    generate_newsletter_editions를 실행하지 않고 실행 계획을 만듭니다 (dry run).
+    실제 생성과 같은 plan_sections 결과로 의존성과 섹션의 plan 훅을 실행하여, 수행할 외부 호출과 캐시/사전 생성분/회로 차단으로
+    건너뛸 호출을 나열하고, 프롬프트를 실제와 같은 방식으로 조립해 토큰 수와 비용을 어림하며, 단계별 소요 시간 기록으로
+    예상 소요 시간(p50, p95)을 계산합니다. 기사 목록은 마지막 정상 결과를 사용하고, 없으면 평균적인 길이의 가상 기사로 추정합니다.
+    """
+    editions = list(dict.fromkeys(editions)) or ["ko"]
+    ctx = SectionContext(
+        openai_api_key=openai_api_key, news_api_key=news_api_key,
+        naver_client_id=naver_client_id, naver_client_secret=naver_client_secret,
+        news_query_en=news_query_en, news_query_ko=news_query_ko, language=language,
+        custom_success_story=custom_success_story, issue_num=issue_num, routing_policy=routing_policy,
+        enrich_articles=enrich_articles, main_news_mode=main_news_mode, use_ranking=use_ranking,
+        use_translation_cache=use_translation_cache, use_evergreen_library=use_evergreen_library
+    )
+    plan, dependencies = plan_sections(ctx, sections)
+    planner = _RunPlanner(ctx)
+    
+    # 의존성(기사 검색 등): 모든 에디션이 공유하며 동시에 시작됨
+    dependency_seconds = {}
+    for dependency in dependencies:
+        planner.values[dependency], dependency_seconds[dependency] = SECTION_DEPENDENCIES[dependency]["plan"](planner)
+    
+    # 썸네일: 섹션 생성과 동시에 진행되므로 예상 소요 시간에는 더하지 않음
+    if use_thumbnails and any(runnable and name in THUMBNAIL_SECTIONS for name, runnable in plan):
+        _plan_thumbnails(planner, dependencies)
+    
+    # 섹션: (에디션, 섹션) 작업이 모두 동시에 실행되므로 가장 오래 걸리는 작업이 전체 소요 시간을 결정
+    task_seconds = [[0.0, 0.0]]
+    for edition in editions:
+        for name, runnable in plan:
+            spec = NEWSLETTER_SECTIONS[name]
+            if not runnable:
+                planner.section(name, edition, status="기본 콘텐츠")
+                continue
+            spans = [dependency_seconds.get(dependency, [0.0, 0.0]) for dependency in spec["deps"]]
+            task_seconds.append(_sum_seconds(spans + [spec["plan"](planner, edition)]))
+    
+    llm_calls = [call for call in planner.calls if call["provider"] == "openai" and call["status"] == "호출"]
+    history = planner.history
+    return {
+        "calls": planner.calls,
+        "api_calls": sum(call["count"] for call in planner.calls if call["status"] == "호출"),
+        "llm_calls": sum(call["count"] for call in llm_calls),
+        "prompt_tokens": sum(call["prompt_tokens"] for call in llm_calls),
+        "completion_tokens": sum(call["completion_tokens"] for call in llm_calls),
+        "cost_usd": round(sum(call["cost_usd"] for call in llm_calls), 4),
+        "wall_seconds_p50": round(max(seconds[0] for seconds in task_seconds), 1),
+        "wall_seconds_p95": round(max(seconds[1] for seconds in task_seconds), 1),
+        "recent_run_seconds_p50": history.percentile("run:total", 50),
+        "recent_runs": len(history.samples("run:total")),
+        "default_stages": sorted(planner.defaults_used),
+    }
+
+# 주간 뉴스와 무관한 섹션(AT/DT 팁, 성공 사례)은 미리 일괄 생성해 두고 발행 시 꺼내 씀
+EVERGREEN_SECTIONS = ("aidt_tips", "success_story")
+EVERGREEN_PLACEHOLDER = re.compile(r"\[(?:한국 기업명|외국 기업명|주제에 맞는[^\]]*|이 문제/작업에 대한[^\]]*|구체적인[^\]]*)\]")
+
+def validate_evergreen_content(section, edition, content):
+    """사전 생성된 섹션 내용을 검사하여 문제 목록을 반환합니다. 빈 목록이면 발행에 사용할 수 있습니다."""
+    problems = []
+    text = (content or "").strip()
+    if len(text) < 200:
+        problems.append("내용이 너무 짧음")
+    headings = re.findall(r"^##\s+\S", text, flags=re.MULTILINE)
+    if section == "aidt_tips":
+        if not headings:
+            problems.append("팁 제목(##) 없음")
+        if edition == "ko":
+            if "## 이번 주 팁:" not in text:
+                problems.append("'## 이번 주 팁:' 제목 형식 아님")
+            if "핵심 프롬프트 예시" not in text:
+                problems.append("핵심 프롬프트 예시 없음")
+            if text.count("프롬프트:") < 3:
+                problems.append("프롬프트 템플릿 3개 미만")
+    elif section == "success_story" and len(headings) < 2:
+        problems.append("사례 제목(##) 2개 미만")
+    if EVERGREEN_PLACEHOLDER.search(text):
+        problems.append("채워지지 않은 템플릿 문구 포함")
+    return problems
+
+class EvergreenLibrary:
+    """
+    사전 생성된 AT/DT 팁과 성공 사례 모음입니다. 항목마다 검증 상태와 사용 여부를 기록하고,
+    아직 결과를 받지 않은 일괄 생성 작업(batch)도 함께 보관합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded_mtime = None
+        self._refresh()
+
+    def _refresh(self):
+        """명령줄 작업 등 다른 프로세스가 파일을 갱신했으면 다시 읽습니다."""
+        path = os.path.join(DATA_DIR, "evergreen_library.json")
+        mtime = os.path.getmtime(path) if os.path.exists(path) else None
+        if self._loaded_mtime is None or mtime != self._loaded_mtime:
+            self.entries = PersistentCache("evergreen_library", max_entries=2000)
+            self.batches = PersistentCache("evergreen_batches", max_entries=200)
+            self._loaded_mtime = mtime
+
+    def add(self, entry):
+        self.entries.set(entry["id"], entry)
+
+    def save(self):
+        self.entries.save()
+        self.batches.save()
+        if os.path.exists(self.entries.path):
+            self._loaded_mtime = os.path.getmtime(self.entries.path)
+
+    def _select(self, section, edition, issue_number, topic=None):
+        """(항목, 이미 이 호에 배정되었는지)를 반환합니다. 고를 항목이 없으면 (None, False)."""
+        used_by = f"{issue_number}-{edition}"
+        candidates = []
+        for _, entry in self.entries.items():
+            if entry["section"] != section or entry["edition"] != edition:
+                continue
+            if topic is not None and entry.get("topic") != topic:
+                continue
+            if entry.get("used_by") == used_by:
+                return entry, True
+            if entry["status"] == "valid" and not entry.get("used_by"):
+                candidates.append(entry)
+        if not candidates:
+            return None, False
+        return min(candidates, key=lambda e: (e["target_issue"] != issue_number, e["target_issue"], e["created_at"])), False
+
+    def peek(self, section, edition, issue_number, topic=None):
+        """claim이 돌려줄 항목을 사용 표시 없이 반환합니다 (실행 계획용)."""
+        with self._lock:
+            self._refresh()
+            return self._select(section, edition, issue_number, topic)[0]
+
+    def claim(self, section, edition, issue_number, topic=None):
+        """
+        발행할 호에 쓸 항목을 골라 사용 표시를 하고 반환합니다. 없으면 None.
+        같은 호/에디션을 다시 생성하면 이미 배정된 항목을 그대로 돌려주고, 아니면 검증을 통과한 미사용 항목 중
+        해당 호를 대상으로 만든 것, 그다음 대상 호가 가장 이른 것을 고릅니다.
+        """
+        with self._lock:
+            self._refresh()
+            entry, assigned = self._select(section, edition, issue_number, topic)
+            if entry is None or assigned:
+                return entry
+            entry = dict(entry, used_by=f"{issue_number}-{edition}", used_at=datetime.now().isoformat(timespec="seconds"))
+            self.entries.set(entry["id"], entry)
+            self.save()
+        return entry
+
+    def summary(self):
+        """(섹션, 에디션)별 검증 통과 미사용/사용/검증 실패 항목 수와 대기 중인 작업 수를 반환합니다."""
+        with self._lock:
+            self._refresh()
+        rows = {}
+        for _, entry in self.entries.items():
+            row = rows.setdefault((entry["section"], entry["edition"]), {"section": entry["section"], "edition": entry["edition"], "available": 0, "used": 0, "invalid": 0})
+            if entry.get("used_by"):
+                row["used"] += 1
+            elif entry["status"] == "valid":
+                row["available"] += 1
+            else:
+                row["invalid"] += 1
+        pending = sum(1 for _, batch in self.batches.items() if batch["status"] not in ("ingested", "failed", "expired", "cancelled"))
+        return [rows[key] for key in sorted(rows)], pending
+
+@st.cache_resource
+def get_evergreen_library():
+    """프로세스 전체에서 공유하는 사전 생성 콘텐츠 모음을 반환합니다."""
+    return EvergreenLibrary()
+
+def build_evergreen_requests(start_issue, count, editions=("ko",), stories_per_issue=1, policy=None):
+    """start_issue부터 count개 호에 쓸 팁(호수별 순환 주제)과 성공 사례 생성 요청을 Batch API 입력 형식으로 만듭니다."""
+    requests_by_id = {}
+    for issue_number in range(start_issue, start_issue + count):
+        topic = AI_TIP_TOPICS[(issue_number - 1) % len(AI_TIP_TOPICS)]
+        for edition in editions:
+            jobs = [("aidt_tips", _aidt_tips_prompt(topic), topic, 0)]
+            jobs += [("success_story", _success_story_prompt(), None, n) for n in range(stories_per_issue)]
+            for section, prompt, job_topic, variant in jobs:
+                model_config = resolve_model_tier(section, policy)
+                custom_id = f"{section}|{edition}|{issue_number}|{variant}"
+                requests_by_id[custom_id] = {
+                    "meta": {"section": section, "edition": edition, "target_issue": issue_number, "topic": job_topic},
+                    "line": {
+                        "custom_id": custom_id,
+                        "method": "POST",
+                        "url": "/v1/chat/completions",
+                        "body": {
+                            "model": model_config["model"],
+                            "temperature": model_config["temperature"],
+                            "messages": _section_messages(prompt, edition),
+                        },
+                    },
+                }
+    return requests_by_id
+
+def submit_evergreen_batch(client, requests_by_id):
+    """요청들을 JSONL 파일 하나로 올려 일괄 생성 작업을 제출하고 작업 ID를 반환합니다. 결과는 collect_evergreen_batches로 받습니다."""
+    lines = "\n".join(json.dumps(request["line"], ensure_ascii=False) for request in requests_by_id.values())
+    input_file = client.files.create(file=("evergreen.jsonl", lines.encode("utf-8")), purpose="batch")
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+        metadata={"job": "evergreen"}
+    )
+    library = get_evergreen_library()
+    library.batches.set(batch.id, {
+        "status": batch.status,
+        "submitted_at": datetime.now().isoformat(timespec="seconds"),
+        "requests": {custom_id: request["meta"] for custom_id, request in requests_by_id.items()},
+    })
+    library.save()
+    return batch.id
+
+def _ingest_evergreen_output(library, batch_id, record, output_text):
+    """작업 결과 JSONL을 검증하여 모음에 추가하고 (추가된 항목 수, 검증 실패 수, 요청 실패 수)를 반환합니다."""
+    added = invalid = failed = 0
+    for line in output_text.splitlines():
+        if not line.strip():
+            continue
+        result = json.loads(line)
+        meta = record["requests"].get(result.get("custom_id"))
+        response = result.get("response") or {}
+        if meta is None or result.get("error") or response.get("status_code") != 200:
+            failed += 1
+            continue
+        body = response["body"]
+        content = body["choices"][0]["message"]["content"]
+        problems = validate_evergreen_content(meta["section"], meta["edition"], content)
+        library.add(dict(
+            meta,
+            id=f"{batch_id}:{result['custom_id']}",
+            content=content,
+            status="invalid" if problems else "valid",
+            problems=problems,
+            batch_id=batch_id,
+            model=body.get("model"),
+            created_at=datetime.now().isoformat(timespec="seconds"),
+            used_by=None,
+        ))
+        added += 1
+        invalid += bool(problems)
+    return added, invalid, failed
+
+def collect_evergreen_batches(client, wait=False, poll_interval=10.0, timeout=None):
+    """
+    대기 중인 일괄 생성 작업의 상태를 확인하고, 완료된 작업의 결과를 검증하여 모음에 추가합니다.
+    wait=True이면 모든 작업이 끝나거나 timeout(초)이 지날 때까지 poll_interval 간격으로 다시 확인합니다.
+    """
+    library = get_evergreen_library()
+    deadline = time.monotonic() + timeout if timeout else None
+    results = {}
+    while True:
+        pending = [(batch_id, record) for batch_id, record in library.batches.items() if batch_id not in results]
+        pending = [(batch_id, record) for batch_id, record in pending if record["status"] not in ("ingested", "failed", "expired", "cancelled")]
+        for batch_id, record in pending:
+            batch = client.batches.retrieve(batch_id)
+            record = dict(record, status=batch.status)
+            if batch.status == "completed":
+                added, invalid, failed = 0, 0, len(record["requests"])
+                if batch.output_file_id:
+                    added, invalid, failed = _ingest_evergreen_output(
+                        library, batch_id, record, client.files.content(batch.output_file_id).text
+                    )
+                record.update(status="ingested", added=added, invalid=invalid, failed=failed)
+                results[batch_id] = record
+            elif batch.status in ("failed", "expired", "cancelled"):
+                results[batch_id] = record
+            library.batches.set(batch_id, record)
+        library.save()
+        still_pending = [batch_id for batch_id, _ in pending if batch_id not in results]
+        if not wait or not still_pending or (deadline and time.monotonic() >= deadline):
+            return results, still_pending
+        time.sleep(poll_interval)
+
+# 기본 콘텐츠를 위한 헬퍼 함수들
+def get_default_tips_content(edition="ko"):
+    """기본 AT/DT 팁 콘텐츠 반환"""
+    return get_edition(edition)["defaults"]["aidt_tips"]
+
+def get_default_success_story(edition="ko"):
+    """기본 성공 사례 콘텐츠 반환"""
+    return get_edition(edition)["defaults"]["success_story"]
+
+def get_default_ai_use_case(edition="ko"):
+    """기본 AI 활용사례 콘텐츠 반환"""
+    return get_edition(edition)["defaults"]["ai_use_case"]
+
+# 뉴스레터 섹션 목록 (템플릿에 표시되는 순서).
+# requires: 생성에 필요한 API ("openai", "news", "naver"). 없으면 fallback을 사용하고, fallback도 없으면 섹션을 생략
+# deps: 공유 데이터 의존성 (SECTION_DEPENDENCIES). 활성화된 섹션의 의존성만 한 번씩 가져옴
+# generate(ctx, edition): 섹션 HTML 생성. 실패하면 fallback(edition)으로 에디션 언어의 기본 콘텐츠 사용
+# plan(planner, edition): 실행 계획용. 호출 없이 generate와 같은 분기로 호출을 기록하고 (p50, p95) 소요 시간을 반환
+#   (tests/test_run_plan.py가 섹션마다 스텁 백엔드의 실제 실행과 호출 수를 비교하므로 generate를 바꾸면 함께 수정)
+# slot: 템플릿에서 섹션을 감싸는 요소의 클래스. 제목은 에디션 문구(labels)의 섹션 이름 항목 사용
+# enabled: 기본 활성화 여부
+NEWSLETTER_SECTIONS = {
+    "main_news": {
+        "requires": ("openai",),
+        "deps": ("global_news",),
+        "generate": _generate_main_news,
+        "plan": _plan_generate_main_news,
+        "fallback": None,
+        "slot": {"section_class": "section", "container_class": "section-container main-news"},
+        "enabled": True,
+    },
+    "naver_news": {
+        "requires": ("naver",),
+        "deps": ("naver_news",),
+        "generate": _generate_naver_news,
+        "plan": _plan_generate_naver_news,
+        "fallback": None,
+        "slot": {"section_class": "section", "container_class": "section-container main-news naver-section"},
+        "enabled": True,
+    },
+    "naver_trends": {
+        "requires": ("naver",),
+        "deps": ("naver_trends",),
+        "generate": _generate_naver_trends,
+        "plan": _plan_generate_naver_trends,
+        "fallback": None,
+        "slot": {"section_class": "section", "container_class": "section-container main-news naver-section"},
+        "enabled": False,
+    },
+    "aidt_tips": {
+        "requires": ("openai",),
+        "deps": (),
+        "generate": _generate_aidt_tips,
+        "plan": _plan_generate_aidt_tips,
+        "fallback": get_default_tips_content,
+        "slot": {"section_class": "section", "container_class": "section-container aidt-tips"},
+        "enabled": True,
+    },
+    "ai_use_case": {
+        "requires": ("naver",),
+        "deps": ("ai_use_cases",),
+        "generate": _generate_ai_use_case,
+        "plan": _plan_generate_ai_use_case,
+        "fallback": get_default_ai_use_case,
+        "slot": {"section_class": "section", "container_class": "section-container"},
+        "enabled": True,
+    },
+    "success_story": {
+        "requires": (),
+        "deps": (),
+        "generate": _generate_success_story,
+        "plan": _plan_generate_success_story,
+        "fallback": get_default_success_story,
+        "slot": {"section_class": "section success-case", "container_class": "section-container"},
+        "enabled": True,
+    },
+}
+
+# 뉴스레터 HTML의 정적 스타일시트 (f-string 밖에 두어 매번 다시 조립하지 않음)
+NEWSLETTER_CSS = """\
+            body {
+                font-family: 'Segoe UI', Arial, sans-serif;
+                line-height: 1.5;
+                color: #333;
+                margin: 0;
+                padding: 0;
+                background-color: #f9f9f9;
+            }
+            .container {
+                max-width: 600px;
+                margin: 0 auto;
+                background-color: #ffffff;
+            }
+            .content {
+                padding: 20px;
+            }
+            .header {
+                background-color: #333333;
+                color: white;
+                padding: 15px 20px;
+                text-align: left;
+            }
+            .title {
+                margin: 0;
+                font-size: 20px;
+                font-weight: bold;
+            }
+            .issue-date {
+                margin-top: 5px;
+                font-size: 10pt;
+            }
+            .section {
+                margin-bottom: 25px;
+                border-bottom: 1px solid #eee;
+                padding-bottom: 20px;
+            }
+            .section:last-child {
+                border-bottom: none;
+            }
+            .section-title {
+                color: #ffffff;
+                font-size: 16px;
+                font-weight: bold;
+                margin-bottom: 10px;
+                background-color: #3e3e3e;
+                padding: 8px 10px;
+                border-radius: 4px;
+            }
+            .section-icon {
+                margin-right: 8px;
+            }
+            h2, h3 {
+                font-size: 14px;
+                margin-bottom: 5px;
+                color: #333333;
+            }
+            .main-news h2 {
+                color: #ff5722;
+                font-size: 14px;
+                margin-top: 15px;
+                margin-bottom: 5px;
+                border-bottom: none;
+                padding-bottom: 0;
+            }
+            .main-news a {
+                color: #ff5722;
+                text-decoration: none;
+            }
+            .main-news a:hover {
+                text-decoration: underline;
+            }
+            .main-news p, .success-case p, p, li {
+                font-size: 10pt;
+                margin: 0 0 8px;
+            }
+            ul {
+                padding-left: 20px;
+                margin-top: 5px;
+                margin-bottom: 8px;
+            }
+            li {
+                margin-bottom: 3px;
+            }
+            .footer {
+                background-color: #f1f1f1;
+                padding: 10px;
+                text-align: center;
+                font-size: 9pt;
+                color: #666;
+            }
+            .section-container {
+                padding: 0 15px;
+            }
+            .highlight-box {
+                background-color: #fff9f5;
+                border: 1px solid #ffe0cc;
+                border-radius: 5px;
+                padding: 15px;
+                margin: 10px 0;
+            }
+            .highlight-title {
+                color: #ff5722;
+                font-size: 16px;
+                font-weight: bold;
+                margin-bottom: 10px;
+                text-align: center;
+            }
+            .highlight-subtitle {
+                color: #666;
+                font-size: 12px;
+                text-align: center;
+                margin-bottom: 15px;
+            }
+            
+            /* 수신자별 개인화 영역 */
+            .greeting {
+                font-weight: bold;
+            }
+            .team-highlight {
+                background-color: #f5f9ff;
+                border: 1px solid #cce0ff;
+                border-radius: 5px;
+                padding: 12px 15px;
+                margin: 10px 0;
+            }
+            .team-highlight-title {
+                color: #1a5fb4;
+                font-size: 14px;
+                font-weight: bold;
+                margin-bottom: 5px;
+            }
+            
+            /* AT/DT 팁 섹션 스타일 */
+            .aidt-tips {
+                font-size: 10pt;
+            }
+
+            .tip-title {
+                background-color: #f2f2f2;
+                padding: 8px 10px;
+                margin-bottom: 10px;
+                border-radius: 4px;
+                font-weight: bold;
+            }
+
+            .prompt-examples-title {
+                background-color: #f2f2f2;
+                padding: 8px 10px;
+                margin: 15px 0 10px 0;
+                border-radius: 4px;
+                font-weight: bold;
+            }
+
+            /* 프롬프트 템플릿 스타일 */
+            .prompt-template {
+                margin-bottom: 20px; /* 템플릿 간 간격 */
+            }
+
+            .template-title {
+                color: #ff5722; /* 제목 색상 - 오렌지 계열 */
+                font-weight: bold;
+                margin-bottom: 0; /* 제목과 내용 사이 간격 없음 */
+                padding: 0;
+            }
+
+            .template-content {
+                margin-left: 15px;
+                margin-bottom: 10px; /* 내용 아래 여백 추가 */
+            }
+
+            /* 예시와 프롬프트 스타일 */
+            .example-label, .prompt-label {
+                font-weight: bold;
+                margin-top: 5px;
+                color: #333; /* 이미지와 일치하는 색상 */
+            }
+
+            .example-content, .prompt-content {
+                margin-left: 15px;
+                line-height: 1.3; /* 내용 줄간격 약간 줄임 */
+                margin-bottom: 8px; /* 내용 하단 여백 증가 */
+                color: #333; /* 이미지와 일치하는 색상 */
+            }
+
+            .tip-footer {
+                margin-top: 15px;
+                font-style: italic;
+                color: #666; /* 이미지와 일치하는 색상 */
+            }
+            
+            /* 네이버 API 섹션 스타일 - 검은색으로 변경 */
+            .naver-section {
+                background-color: #f8f8ff; /* 연한 파란색 배경 */
+                border-radius: 4px;
+                padding: 10px;
+                margin-bottom: 15px;
+            }
+            
+            .naver-section h2, .naver-section h3 {
+                color: #333333; /* 검은색으로 변경 */
+            }
+            
+            /* 기사 썸네일 */
+            .news-thumb {
+                display: block;
+                max-width: 100%;
+                height: auto;
+                border-radius: 4px;
+                margin: 6px 0 8px 0;
+            }
+            
+            /* AI 활용사례 섹션 스타일 */
+            .section ol {
+                margin-left: 20px;
+                padding-left: 0;
+            }
+            .section ol li {
+                margin-bottom: 5px;
+            }"""
+
+# 통합된 뉴스레터를 위한 HTML 템플릿 생성 함수
+def generate_combined_html_template(newsletter_content, issue_number, date, highlight_settings, merge_slots=False, edition="ko",
+                                    thumbnails="inline"):
+    """세 가지 API를 모두 사용한 뉴스레터 HTML 템플릿을 생성합니다.
+    섹션은 NEWSLETTER_SECTIONS의 순서와 slot 설정대로, newsletter_content에 있는 것만 표시합니다.
+    merge_slots가 True이면 수신자별 개인화 위치에 <!--MERGE:이름--> 표시를 남기며, edition에 따라 템플릿 문구가 바뀝니다.
+    기사 썸네일은 thumbnails 방식(inline, cid, none)으로 넣습니다."""
+    labels = get_edition(edition)["labels"]
+    
+    # 섹션 목록 순서대로, 내용이 있는 섹션만 표시
+    sections_html = "".join(
+        f"""
+                <div class="{spec['slot']['section_class']}">
+                    <div class="section-title">{labels[name]}</div>
+                    <div class="{spec['slot']['container_class']}">
+                        {newsletter_content[name]}
+                    </div>
+                </div>
+                """
+        for name, spec in NEWSLETTER_SECTIONS.items() if name in newsletter_content
+    )
+    html_content = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>{labels["document_title"].format(issue_number=issue_number)}</title>
+        <style>
+{NEWSLETTER_CSS}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                <div class="title">중부Infra AT/DT Weekly</div>
+                <div class="issue-info">{labels["issue_info"].format(issue_number=issue_number, date=date)}</div>
+            </div>
+            
+            <div class="content">
+                <div class="newsletter-intro">
+                    {'<!--MERGE:greeting-->' if merge_slots else ''}
+                    <p>{labels["intro"]}</p>
+                </div>
+                
+                <div class="highlight-box">
+                    <div class="highlight-title">{highlight_settings['title']}</div>
+                    <div class="highlight-subtitle">{highlight_settings['subtitle']}</div>
+                    <p style="text-align: right; margin-top: 5px; font-size: 9pt;"><a href="{highlight_settings['link_url']}" style="color: #ff5722;">{highlight_settings['link_text']}</a></p>
+                </div>
+                {'<!--MERGE:team_highlight-->' if merge_slots else ''}
+                
+                {sections_html}
+            </div>
+            
+            <div class="footer">
+                <p>{labels["footer_rights"].format(year=datetime.now().year)}</p>
+                <p>{labels["footer_contact"]}</p>
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+    return resolve_thumbnail_sources(html_content, thumbnails)[0]
+
+# 인라인 스타일을 적용하지 않는 태그 (문서 머리말 등)
+_NON_INLINED_TAGS = {"html", "head", "meta", "title", "style", "script", "link"}
+_VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+_PLACEHOLDER_COMMENT = re.compile(r"(?:MERGE|INLINE):(\w+)")
+
+def parse_css_rules(css):
+    """
+    스타일시트를 (선택자 구성, 명시도, 순서, 선언 목록) 규칙 목록으로 파싱합니다.
+    태그/클래스와 하위 선택자(공백)만 인라인 대상으로 보며, :hover 같은 의사 클래스 등은 <style>에 남겨 둡니다.
+    """
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    rules = []
+    for order, (selector_group, body) in enumerate(re.findall(r"([^{}]+)\{([^{}]*)\}", css)):
+        declarations = []
+        for declaration in body.split(";"):
+            prop, _, value = declaration.partition(":")
+            if prop.strip() and value.strip():
+                declarations.append((prop.strip().lower(), value.strip()))
+        if not declarations:
+            continue
+        
+        for selector in selector_group.split(","):
+            parts = []
+            for compound in selector.split():
+                match = re.fullmatch(r"([a-zA-Z][a-zA-Z0-9]*)?((?:\.[\w-]+)*)", compound)
+                if not match or not compound:
+                    parts = None
+                    break
+                parts.append(((match.group(1) or "").lower() or None, frozenset(filter(None, match.group(2).split(".")))))
+            if parts:
+                specificity = (sum(len(classes) for _, classes in parts), sum(1 for tag, _ in parts if tag))
+                rules.append((tuple(parts), specificity, order, tuple(declarations)))
+    return rules
+
+def _compound_matches(compound, tag, classes):
+    compound_tag, compound_classes = compound
+    return (compound_tag is None or compound_tag == tag) and compound_classes <= classes
+
+class CssInliner:
+    """
+    스타일시트를 한 번 파싱해 두고, HTML을 한 번 순회하면서 각 요소에 해당하는 선언을 style 속성으로 넣습니다.
+    (태그, 클래스, 관련 조상) 조합별 계산 결과와 섹션 조각의 변환 결과를 캐시하여 반복 호출 비용을 줄입니다.
+    """
+
+    def __init__(self, css, fragment_cache_size=256):
+        self.rules = parse_css_rules(css)
+        self._by_class = {}
+        self._by_tag = {}
+        self._context_tags = set()
+        self._context_classes = set()
+        for rule in self.rules:
+            parts = rule[0]
+            tag, classes = parts[-1]
+            if classes:
+                self._by_class.setdefault(min(classes), []).append(rule)
+            else:
+                self._by_tag.setdefault(tag, []).append(rule)
+            for ancestor_tag, ancestor_classes in parts[:-1]:
+                if ancestor_tag:
+                    self._context_tags.add(ancestor_tag)
+                self._context_classes.update(ancestor_classes)
+        self._style_memo = {}
+        self._fragment_cache = OrderedDict()
+        self._fragment_cache_size = fragment_cache_size
+        self._lock = threading.Lock()
+
+    def _relevant_context(self, ancestors):
+        """하위 선택자에 쓰이는 조상만 남겨 계산 결과를 공유할 수 있게 합니다."""
+        return tuple(
+            (tag if tag in self._context_tags else None, classes & self._context_classes)
+            for tag, classes in ancestors
+            if tag in self._context_tags or classes & self._context_classes
+        )
+
+    def computed_style(self, tag, classes, ancestors):
+        """요소에 적용되는 선언들을 명시도와 선언 순서대로 합쳐 (속성, 값) 튜플로 반환합니다."""
+        context = self._relevant_context(ancestors)
+        key = (tag, classes, context)
+        cached = self._style_memo.get(key)
+        if cached is not None:
+            return cached
+        
+        candidates = list(self._by_tag.get(tag, ())) + list(self._by_tag.get(None, ()))
+        for cls in classes:
+            candidates.extend(self._by_class.get(cls, ()))
+        matched = []
+        for rule in candidates:
+            parts = rule[0]
+            if not _compound_matches(parts[-1], tag, classes):
+                continue
+            i = len(context) - 1
+            for compound in reversed(parts[:-1]):
+                while i >= 0 and not _compound_matches(compound, *context[i]):
+                    i -= 1
+                if i < 0:
+                    break
+                i -= 1
+            else:
+                matched.append(rule)
+        
+        merged = {}
+        for _, _, _, declarations in sorted(set(matched), key=lambda rule: (rule[1], rule[2])):
+            for prop, value in declarations:
+                merged.pop(prop, None)
+                merged[prop] = value
+        result = tuple(merged.items())
+        with self._lock:
+            self._style_memo[key] = result
+        return result
+
+    def inline(self, html_content, context=()):
+        """
+        HTML에 인라인 스타일을 적용하여 (변환된 HTML, {자리표시 이름: 조상 목록})을 반환합니다.
+        context는 조각이 들어갈 위치의 조상 목록((태그, 클래스 집합) 튜플)입니다.
+        """
+        walker = _InliningWalker(self, context)
+        walker.feed(html_content)
+        walker.close()
+        return "".join(walker.out), walker.placeholder_contexts
+
+    def inline_fragment(self, fragment, context=()):
+        """섹션 조각에 인라인 스타일을 적용합니다. 같은 내용과 위치의 조각은 캐시된 결과를 재사용합니다."""
+        key = (hashlib.sha1(fragment.encode("utf-8")).hexdigest(), context)
+        with self._lock:
+            if key in self._fragment_cache:
+                self._fragment_cache.move_to_end(key)
+                return self._fragment_cache[key]
+        result = self.inline(fragment, context)[0]
+        with self._lock:
+            self._fragment_cache[key] = result
+            while len(self._fragment_cache) > self._fragment_cache_size:
+                self._fragment_cache.popitem(last=False)
+        return result
+
+class _InliningWalker(HTMLParser):
+    """CssInliner가 사용하는 단일 순회 파서. 원본 마크업을 최대한 그대로 유지하며 출력합니다."""
+
+    def __init__(self, inliner, context=()):
+        super().__init__(convert_charrefs=False)
+        self.inliner = inliner
+        self.stack = list(context)
+        self.out = []
+        self.placeholder_contexts = {}
+
+    def _emit_tag(self, tag, attrs, self_closing):
+        classes = frozenset()
+        existing_style = ""
+        for name, value in attrs:
+            if name == "class" and value:
+                classes = frozenset(value.split())
+            elif name == "style" and value:
+                existing_style = value
+        
+        declarations = ()
+        if tag not in _NON_INLINED_TAGS:
+            declarations = self.inliner.computed_style(tag, classes, self.stack)
+        if not declarations:
+            self.out.append(self.get_starttag_text())
+            return classes
+        
+        # 요소에 이미 있던 style 속성이 스타일시트보다 우선
+        merged = dict(declarations)
+        for declaration in existing_style.split(";"):
+            prop, _, value = declaration.partition(":")
+            if prop.strip() and value.strip():
+                merged.pop(prop.strip().lower(), None)
+                merged[prop.strip().lower()] = value.strip()
+        style = "; ".join(f"{prop}: {value}" for prop, value in merged.items())
+        style = html.escape(style, quote=False).replace('"', "&quot;")
+        
+        rendered = [f"<{tag}"]
+        for name, value in attrs:
+            if name == "style":
+                continue
+            rendered.append(f" {name}" if value is None else f' {name}="{html.escape(value, quote=True)}"')
+        rendered.append(f' style="{style}"')
+        rendered.append(" />" if self_closing else ">")
+        self.out.append("".join(rendered))
+        return classes
+
+    def handle_starttag(self, tag, attrs):
+        classes = self._emit_tag(tag, attrs, False)
+        if tag not in _VOID_TAGS:
+            self.stack.append((tag, classes))
+
+    def handle_startendtag(self, tag, attrs):
+        self._emit_tag(tag, attrs, True)
+
+    def handle_endtag(self, tag):
+        self.out.append(f"</{tag}>")
+        # 닫는 태그가 빠진 요소가 있어도 일치하는 요소까지 되돌아감
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i][0] == tag:
+                del self.stack[i:]
+                break
+
+    def handle_data(self, data):
+        self.out.append(data)
+
+    def handle_entityref(self, name):
+        self.out.append(f"&{name};")
+
+    def handle_charref(self, name):
+        self.out.append(f"&#{name};")
+
+    def handle_comment(self, data):
+        match = _PLACEHOLDER_COMMENT.fullmatch(data)
+        if match:
+            self.placeholder_contexts[match.group(1)] = tuple(self.stack)
+        self.out.append(f"<!--{data}-->")
+
+    def handle_decl(self, decl):
+        self.out.append(f"<!{decl}>")
+
+    def handle_pi(self, data):
+        self.out.append(f"<?{data}>")
+
+    def unknown_decl(self, data):
+        self.out.append(f"<![{data}]>")
+
+@st.cache_resource
+def get_css_inliner():
+    """뉴스레터 스타일시트를 파싱한 인라이너를 프로세스 전체에서 재사용합니다."""
+    return CssInliner(NEWSLETTER_CSS)
+
+def generate_email_html(newsletter_content, issue_number, date, highlight_settings, merge_slots=False, edition="ko",
+                        thumbnails="inline"):
+    """
+    스타일을 인라인으로 적용한 이메일 클라이언트용 뉴스레터 HTML을 생성합니다.
+    섹션 자리에 표시만 남긴 골격을 먼저 변환한 뒤, 각 섹션은 해당 위치의 조상 정보로 따로 변환하여
+    내용이 바뀌지 않은 섹션은 캐시된 결과를 그대로 사용합니다.
+    """
+    inliner = get_css_inliner()
+    placeholders = {key: f"<!--INLINE:{key}-->" for key in newsletter_content}
+    skeleton = generate_combined_html_template(placeholders, issue_number, date, highlight_settings, merge_slots, edition)
+    document, contexts = inliner.inline(skeleton)
+    for key, content in newsletter_content.items():
+        if key in contexts:
+            document = document.replace(placeholders[key], inliner.inline_fragment(content, contexts[key]), 1)
+    return resolve_thumbnail_sources(document, thumbnails)[0]
+
+# Gmail은 약 102KB를 넘는 메일 본문을 잘라서 표시하므로 발송 HTML의 기본 크기 예산으로 사용
+EMAIL_BYTE_BUDGET = 102 * 1024
+
+# 앞뒤 공백을 지워도 표시가 바뀌지 않는 블록 요소와 문서 구조 태그, 자리표시 주석
+_COMPACT_BLOCK_TAGS = re.compile(
+    r"\s*(<!DOCTYPE[^>]*>|<!--(?:MERGE|INLINE):\w+-->|</?(?:html|head|body|meta|title|style|link|div|p|h[1-6]|ul|ol|li|table|thead|tbody|tr|td|th|br|hr|blockquote)\b[^>]*>)\s*",
+    re.IGNORECASE
+)
+_STYLE_BLOCK = re.compile(r"(<style[^>]*>)(.*?)(</style>)", re.IGNORECASE | re.DOTALL)
+_START_TAG_WITH_STYLE = re.compile(r'<([a-zA-Z][a-zA-Z0-9]*)(\s[^<>]*?\sstyle="[^"]*"[^<>]*?|\sstyle="[^"]*"[^<>]*?)(\s*/?)>')
+_STYLE_ATTRIBUTE = re.compile(r'\sstyle="([^"]*)"')
+_CLASS_ATTRIBUTE = re.compile(r"""\sclass=(?:"([^"]*)"|'([^']*)')""")
+
+def minify_css(css):
+    """주석과 불필요한 공백을 제거합니다."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{}:;,>])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+# 공백을 그대로 표시하는 요소: <pre>, <textarea>와 white-space: pre/pre-wrap/pre-line이 적용된 요소
+_WHITESPACE_PRE = re.compile(r"white-space\s*:\s*pre", re.IGNORECASE)
+_COMMENT_OR_START_TAG = re.compile(r"<!--.*?-->|<([a-zA-Z][a-zA-Z0-9]*)\b([^<>]*)>", re.DOTALL)
+
+def _preserved_classes(markup):
+    """<style> 블록에서 white-space: pre*가 지정된 클래스 이름 (.클래스, 태그.클래스 선택자만 확인)"""
+    classes = set()
+    for match in _STYLE_BLOCK.finditer(markup):
+        css = re.sub(r"/\*.*?\*/", "", match.group(2), flags=re.DOTALL)
+        for selector_group, declarations in re.findall(r"([^{}]+)\{([^{}]*)\}", css):
+            if _WHITESPACE_PRE.search(declarations):
+                for selector in selector_group.split(","):
+                    class_match = re.fullmatch(r"\s*[a-zA-Z0-9]*\.([\w-]+)\s*", selector)
+                    if class_match:
+                        classes.add(class_match.group(1))
+    return classes
+
+def _keeps_whitespace(tag, attributes, preserved_classes):
+    if tag in ("pre", "textarea"):
+        return True
+    style = _STYLE_ATTRIBUTE.search(attributes)
+    if style and _WHITESPACE_PRE.search(style.group(1)):
+        return True
+    class_match = _CLASS_ATTRIBUTE.search(attributes)
+    return bool(class_match) and not preserved_classes.isdisjoint((class_match.group(1) or class_match.group(2) or "").split())
+
+def _element_end(markup, tag, start):
+    """start부터 tag 요소의 (같은 태그 중첩을 고려한) 닫는 태그 끝 위치. 닫히지 않으면 문서 끝."""
+    depth = 1
+    for match in re.finditer(rf"<(/?){tag}\b[^<>]*>", markup[start:], re.IGNORECASE):
+        if not match.group(1) and match.group(0).endswith("/>"):
+            continue
+        depth += -1 if match.group(1) else 1
+        if depth == 0:
+            return start + match.end()
+    return len(markup)
+
+def _split_preserved(markup, preserved_classes):
+    """markup을 [축약할 부분, 공백을 유지할 요소, 축약할 부분, ...]으로 나눕니다."""
+    parts = []
+    position = 0
+    for match in _COMMENT_OR_START_TAG.finditer(markup):
+        if match.start() < position or match.group(1) is None or match.group(2).rstrip().endswith("/"):
+            continue
+        tag = match.group(1).lower()
+        if _keeps_whitespace(tag, match.group(2), preserved_classes):
+            end = _element_end(markup, tag, match.end())
+            parts += [markup[position:match.start()], markup[match.start():end]]
+            position = end
+    parts.append(markup[position:])
+    return parts
+
+def collapse_whitespace(markup, preserved_classes=None):
+    """
+    개인화/섹션 자리표시를 제외한 주석을 지우고, 연속 공백을 하나로, 블록 요소 앞뒤 공백은 없앱니다. <style> 내용은 CSS로 축약합니다.
+    <pre>, <textarea>, white-space: pre* 요소(인라인 style 또는 preserved_classes의 클래스)의 내용은 그대로 둡니다.
+    preserved_classes를 주지 않으면 markup의 <style> 블록에서 찾습니다.
+    """
+    if preserved_classes is None:
+        preserved_classes = _preserved_classes(markup)
+    compacted = []
+    # _split_preserved 결과: [축약할 부분, 그대로 둘 요소, 축약할 부분, ...]
+    for j, text in enumerate(_split_preserved(markup, preserved_classes)):
+        if j % 2:
+            compacted.append(text)
+            continue
+        text = re.sub(r"<!--(?!(?:MERGE|INLINE):\w+-->).*?-->", "", text, flags=re.DOTALL)
+        parts = _STYLE_BLOCK.split(text)
+        # split 결과: [본문, 여는 태그, CSS, 닫는 태그, 본문, ...]
+        for i in range(0, len(parts), 4):
+            compacted.append(_COMPACT_BLOCK_TAGS.sub(r"\1", re.sub(r"\s+", " ", parts[i])))
+            if i + 3 < len(parts):
+                compacted.append(parts[i + 1] + minify_css(parts[i + 2]) + parts[i + 3])
+    return "".join(compacted).strip()
+
+def _normalize_style(style):
+    return "; ".join(declaration.strip() for declaration in style.split(";") if declaration.strip())
+
+def collect_style_classes(parts, prefix="cs"):
+    """
+    여러 조각에 두 번 이상 나오는 인라인 style 값을 클래스로 바꿀 {style 값: 클래스 이름}을 만듭니다.
+    url()이 들어간 값은 세미콜론이 섞일 수 있어 제외합니다.
+    """
+    counts = {}
+    for part in parts:
+        for style in _STYLE_ATTRIBUTE.findall(part):
+            style = _normalize_style(style)
+            if style and "url(" not in style:
+                counts[style] = counts.get(style, 0) + 1
+    repeated = sorted((style for style, count in counts.items() if count >= 2), key=lambda style: -counts[style])
+    return {style: f"{prefix}{i}" for i, style in enumerate(repeated, 1)}
+
+def replace_inline_styles(markup, style_classes):
+    """style_classes에 있는 인라인 style 속성을 클래스로 바꿉니다. 기존 class 속성이 있으면 덧붙입니다."""
+    def _replace(match):
+        tag, attributes, closing = match.groups()
+        style = _normalize_style(_STYLE_ATTRIBUTE.search(attributes).group(1))
+        class_name = style_classes.get(style)
+        if class_name is None:
+            return match.group(0)
+        attributes = _STYLE_ATTRIBUTE.sub("", attributes, count=1)
+        class_match = _CLASS_ATTRIBUTE.search(attributes)
+        if class_match:
+            existing = class_match.group(1) if class_match.group(1) is not None else class_match.group(2)
+            attributes = attributes[:class_match.start()] + f' class="{existing} {class_name}"' + attributes[class_match.end():]
+        else:
+            attributes += f' class="{class_name}"'
+        return f"<{tag}{attributes}{closing}>"
+    return _START_TAG_WITH_STYLE.sub(_replace, markup)
+
+def style_class_rules(style_classes):
+    """인라인 style을 대신할 클래스 규칙. 인라인 스타일처럼 스타일시트의 다른 규칙보다 우선하도록 !important를 붙입니다."""
+    rules = []
+    for style, class_name in style_classes.items():
+        declarations = []
+        for declaration in html.unescape(style).split(";"):
+            prop, _, value = declaration.partition(":")
+            if prop.strip() and value.strip():
+                value = value.strip()
+                declarations.append(f"{prop.strip()}:{value if value.endswith('!important') else value + '!important'}")
+        rules.append(f".{class_name}{{{';'.join(declarations)}}}")
+    return "".join(rules)
+
+def prune_unused_css(css, markup):
+    """
+    문서에 없는 태그/클래스만 가리키는 선택자와 규칙을 제거합니다.
+    의사 클래스와 속성 선택자는 무시하고 태그/클래스만으로 판단하며, @규칙이 있는 스타일시트는 그대로 둡니다.
+    """
+    if "@" in css:
+        return css
+    body = _STYLE_BLOCK.sub("", markup)
+    used_tags = {tag.lower() for tag in re.findall(r"<([a-zA-Z][a-zA-Z0-9]*)", body)}
+    used_classes = set()
+    for double_quoted, single_quoted in _CLASS_ATTRIBUTE.findall(body):
+        used_classes.update((double_quoted or single_quoted).split())
+    
+    def _selector_used(selector):
+        for compound in re.split(r"\s*[\s>+~]\s*", selector.strip()):
+            compound = re.sub(r"::?[\w-]+(\([^)]*\))?|\[[^\]]*\]", "", compound)
+            match = re.fullmatch(r"([a-zA-Z][a-zA-Z0-9]*|\*)?((?:\.[\w-]+)*)", compound)
+            if not match:
+                return True
+            tag, classes = match.group(1), set(filter(None, match.group(2).split(".")))
+            if tag and tag != "*" and tag.lower() not in used_tags:
+                return False
+            if not classes <= used_classes:
+                return False
+        return True
+    
+    rules = []
+    for selector_group, declarations in re.findall(r"([^{}]+)\{([^{}]*)\}", css):
+        selectors = [selector for selector in selector_group.split(",") if _selector_used(selector)]
+        if selectors:
+            rules.append(f"{','.join(selector.strip() for selector in selectors)}{{{declarations}}}")
+    return "".join(rules)
+
+def render_compact_issue(newsletter_content, issue_number, date, highlight_settings, merge_slots=False, edition="ko",
+                         inline_styles=False, budget_bytes=EMAIL_BYTE_BUDGET, thumbnails="inline"):
+    """
+    발송용 뉴스레터 HTML을 렌더링한 뒤 축약하여 (HTML, 크기 보고서)를 반환합니다.
+    공백을 줄이고, 반복되는 인라인 style을 클래스로 바꾸고(CSS 인라인 모드에서는 클래스를 무시하는 클라이언트를 위해 생략),
+    실제로 쓰인 섹션에 필요 없는 CSS 규칙을 지웁니다. 보고서에는 골격과 섹션별 바이트 수, 예산 초과 여부가 들어갑니다.
+    썸네일을 본문에 넣는 방식(inline)이면 예산을 넘지 않는 만큼만 넣습니다.
+    """
+    placeholders = {key: f"<!--INLINE:{key}-->" for key in newsletter_content}
+    skeleton = generate_combined_html_template(placeholders, issue_number, date, highlight_settings, merge_slots, edition)
+    fragments = dict(newsletter_content)
+    if inline_styles:
+        inliner = get_css_inliner()
+        skeleton, contexts = inliner.inline(skeleton)
+        fragments = {key: inliner.inline_fragment(content, contexts[key]) for key, content in fragments.items() if key in contexts}
+    
+    original_bytes = len(skeleton.encode("utf-8")) + sum(len(fragment.encode("utf-8")) for fragment in fragments.values())
+    # 섹션 조각에는 <style>이 없으므로 공백을 유지할 클래스는 골격의 스타일시트에서 찾음
+    preserved_classes = _preserved_classes(skeleton)
+    skeleton = collapse_whitespace(skeleton, preserved_classes)
+    fragments = {key: collapse_whitespace(fragment, preserved_classes) for key, fragment in fragments.items()}
+    style_classes = {} if inline_styles else collect_style_classes([skeleton, *fragments.values()])
+    if style_classes:
+        skeleton = replace_inline_styles(skeleton, style_classes)
+        fragments = {key: replace_inline_styles(fragment, style_classes) for key, fragment in fragments.items()}
+    
+    document = skeleton
+    for key, fragment in fragments.items():
+        document = document.replace(placeholders[key], fragment, 1)
+    # 개인화 위치에 나중에 들어갈 인사말/팀 하이라이트의 클래스 규칙도 남김
+    used_markup = document
+    if merge_slots:
+        used_markup += _GREETING_TEMPLATE + render_team_highlight({"title": "", "body": "", "link_url": "#"})
+    document = _STYLE_BLOCK.sub(
+        lambda match: match.group(1) + prune_unused_css(match.group(2) + style_class_rules(style_classes), used_markup) + match.group(3),
+        document, count=1
+    )
+    unresolved_bytes = len(document.encode("utf-8"))
+    document, thumbnail_result = resolve_thumbnail_sources(document, thumbnails, budget_bytes)
+    
+    total_bytes = len(document.encode("utf-8"))
+    section_bytes = {key: len(fragment.encode("utf-8")) for key, fragment in fragments.items()}
+    report = {
+        "original_bytes": original_bytes,
+        "total_bytes": total_bytes,
+        "skeleton_bytes": unresolved_bytes - sum(section_bytes.values()),
+        "thumbnail_bytes": sum(len(uri) for uri in re.findall(r'data:image/jpeg;base64,[^"]+', document)),
+        "section_bytes": section_bytes,
+        "style_classes": len(style_classes),
+        "thumbnails": {status: len(keys) for status, keys in thumbnail_result.items()},
+        "budget_bytes": budget_bytes,
+        "over_budget": bool(budget_bytes) and total_bytes > budget_bytes,
+    }
+    return document, report
+
+def compact_html(document, dedupe_styles=True):
+    """임의의 HTML 문서를 render_compact_issue와 같은 방식으로 축약합니다 (섹션별 보고서 없음)."""
+    document = collapse_whitespace(document)
+    style_classes = collect_style_classes([document]) if dedupe_styles and _STYLE_BLOCK.search(document) else {}
+    if style_classes:
+        document = replace_inline_styles(document, style_classes)
+    return _STYLE_BLOCK.sub(
+        lambda match: match.group(1) + prune_unused_css(match.group(2) + style_class_rules(style_classes), document) + match.group(3),
+        document, count=1
+    )
+
+# 세션별로 보관하는 생성 결과물의 최대 크기 (압축 후 기준)
+ARTIFACT_STORE_MAX_BYTES = 20 * 1024 * 1024
+
+class ArtifactStore:
+    """
+    세션에서 생성한 뉴스레터 버전들을 gzip으로 압축해 보관하는 저장소입니다.
+    전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 버전부터 제거합니다.
+    """
+
+    def __init__(self, max_bytes=ARTIFACT_STORE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+
+    def add(self, key, label, files):
+        """files({파일 이름: bytes})를 압축해 key로 저장합니다. 같은 key가 있으면 교체합니다."""
+        self.remove(key)
+        compressed = {name: gzip.compress(data, compresslevel=6) for name, data in files.items()}
+        size = sum(len(data) for data in compressed.values())
+        self._entries[key] = {"label": label, "files": compressed, "size": size}
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            self.remove(next(iter(self._entries)))
+
+    def remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry:
+            self.total_bytes -= entry["size"]
+
+    def keys(self):
+        return list(reversed(self._entries))
+
+    def label(self, key):
+        return self._entries[key]["label"]
+
+    def files(self, key):
+        """압축을 풀어 {파일 이름: bytes}로 반환하고, 최근 사용한 버전으로 표시합니다."""
+        self._entries.move_to_end(key)
+        return {name: gzip.decompress(data) for name, data in self._entries[key]["files"].items()}
+
+    def compressed_files(self, key):
+        self._entries.move_to_end(key)
+        return dict(self._entries[key]["files"])
+
+def get_artifact_store():
+    """현재 세션의 생성 결과물 저장소를 반환합니다."""
+    if "artifact_store" not in st.session_state:
+        st.session_state["artifact_store"] = ArtifactStore()
+    return st.session_state["artifact_store"]
+
+def build_issue_artifacts(issue, settings=None):
+    """뉴스레터 한 호의 내보내기 파일(HTML, 축약한 이메일용 HTML, 원본 JSON)을 만듭니다."""
+    base_name = f"중부 ATDT Weekly-제{issue['issue_number']}호"
+    if issue.get("edition", "ko") != "ko":
+        base_name += f"-{issue['edition']}"
+    source = {
+        "issue_number": issue["issue_number"],
+        "date": issue["date"],
+        "edition": issue.get("edition", "ko"),
+        "highlight_settings": issue["highlight_settings"],
+        "sections": issue["sections"],
+        "settings": settings or {},
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    email_html, size_report = render_compact_issue(
+        issue["sections"], issue["issue_number"], issue["date"], issue["highlight_settings"],
+        edition=issue.get("edition", "ko"), inline_styles=True
+    )
+    source["email_size"] = size_report
+    files = {
+        f"{base_name}.html": strip_merge_slots(issue["html"]).encode("utf-8"),
+        f"{base_name}-email.html": email_html.encode("utf-8"),
+        f"{base_name}.json": json.dumps(source, ensure_ascii=False, indent=2).encode("utf-8"),
+    }
+    # 원본 JSON의 thumbnail:<키> 참조가 가리키는 썸네일 파일도 함께 보관
+    for key in thumbnail_keys(issue["sections"]):
+        if os.path.exists(_thumbnail_path(key)):
+            with open(_thumbnail_path(key), "rb") as f:
+                files[f"{base_name}-images/{key}.jpg"] = f.read()
+    return files
+
+def build_export_bundle(store, keys, fmt="zip"):
+    """
+    저장된 버전들을 내려받을 파일로 묶어 (파일 이름, bytes, MIME 타입)을 반환합니다.
+    fmt: 'html'(첫 번째 버전의 HTML), 'gzip'(첫 번째 버전의 HTML을 gzip 압축), 'zip'(선택한 모든 버전의 HTML/JSON/자산)
+    """
+    if fmt in ("html", "gzip"):
+        for name, data in store.compressed_files(keys[0]).items():
+            if name.endswith(".html"):
+                if fmt == "gzip":
+                    # 저장소의 gzip 데이터를 그대로 사용하므로 다시 압축하지 않음
+                    return f"{name}.gz", data, "application/gzip"
+                return name, gzip.decompress(data), "text/html"
+        raise ValueError("내보낼 HTML이 없습니다.")
+    
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as bundle:
+        for key in keys:
+            folder = re.sub(r'[\\/:*?"<>|]', "_", store.label(key))
+            for name, data in store.files(key).items():
+                bundle.writestr(f"{folder}/{name}", data)
+    return f"AIDT-Weekly-export-{datetime.now().strftime('%Y%m%d-%H%M%S')}.zip", buffer.getvalue(), "application/zip"
+
+@st.fragment
+def render_export_panel():
+    """
+    세션에 보관된 뉴스레터 버전을 미리 보고 HTML, gzip, zip 묶음으로 내려받는 화면을 표시합니다.
+    프래그먼트로 분리되어 있어 이 영역의 조작은 전체 스크립트를 다시 실행하지 않습니다.
+    """
+    store = get_artifact_store()
+    keys = store.keys()
+    if not keys:
+        return
+    
+    with st.expander("내보내기", expanded=True):
+        selected = st.multiselect(
+            "내보낼 버전",
+            options=keys,
+            default=keys[:1],
+            format_func=store.label,
+            help="최근 생성한 버전부터 표시됩니다. 보관 용량을 넘으면 오래된 버전은 자동으로 삭제됩니다."
+        )
+        fmt = st.radio(
+            "형식",
+            options=["html", "gzip", "zip"],
+            format_func=lambda x: {"html": "HTML", "gzip": "HTML (gzip 압축)", "zip": "ZIP 묶음 (선택한 모든 버전, 원본 JSON 포함)"}[x],
+            horizontal=True
+        )
+        st.caption(f"보관 중인 버전: {len(keys)}개, {store.total_bytes / 1024:.0f} KB / {store.max_bytes / 1024 / 1024:.0f} MB")
+        if not selected:
+            return
+        
+        filename, data, mime = build_export_bundle(store, selected, fmt)
+        st.download_button("뉴스레터 다운로드", data=data, file_name=filename, mime=mime)
+        
+        # 미리보기는 요청할 때만 페이지에 포함
+        if st.checkbox("미리보기"):
+            preview_html = next(data for name, data in store.files(selected[0]).items() if name.endswith(".html"))
+            if hasattr(st, "iframe"):
+                st.iframe(preview_html.decode("utf-8"), height=800)
+            else:
+                components.html(preview_html.decode("utf-8"), height=800, scrolling=True)
+
+# 실행 프로파일 저장 위치 (요청한 실행만 프로파일링하며, 꺼져 있으면 아무 작업도 하지 않음)
+PROFILE_DIR = os.path.join(DATA_DIR, "profiles")
+PROFILE_SAMPLING_INTERVAL = 0.005
+PROFILE_TRACEMALLOC_FRAMES = 5
+PROFILE_FILES = {
+    "flamegraph.svg": ("플레임그래프 (SVG)", "image/svg+xml"),
+    "profile.pstats": ("pstats", "application/octet-stream"),
+    "stacks.folded": ("CPU 스택 (folded)", "text/plain"),
+    "stacks-wall.folded": ("전체 스택, 대기 포함 (folded)", "text/plain"),
+    "allocations.txt": ("메모리 할당 증가 상위", "text/plain"),
+    "allocations.tracemalloc": ("tracemalloc 스냅샷", "application/octet-stream"),
+}
+
+# 스레드별 CPU 시계를 쓸 수 없는 플랫폼에서는 맨 안쪽 Python 프레임이 이 함수이면 대기 중인 스레드로 봄
+IDLE_FRAMES = {
+    ("threading.py", "wait"), ("threading.py", "_wait_for_tstate_lock"), ("thread.py", "_worker"),
+    ("queue.py", "get"), ("selectors.py", "select"), ("socket.py", "readinto"), ("socket.py", "accept"),
+    ("socket.py", "create_connection"), ("ssl.py", "read"), ("ssl.py", "recv_into"), ("ssl.py", "do_handshake"),
+    ("socketserver.py", "serve_forever"), ("base_events.py", "_run_once"),
+}
+
+def new_run_id():
+    """생성 실행 ID (시각 + 임의 값). 프로파일과 내보내기 설정에 기록됩니다."""
+    return f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.urandom(3).hex()}"
+
+def _frame_key(code):
+    return (code.co_filename, code.co_firstlineno, code.co_name)
+
+def _frame_label(key):
+    filename, lineno, name = key
+    return f"{name} ({os.path.basename(filename)}:{lineno})"
+
+class RunProfiler:
+    """
+    실행 중 모든 스레드의 호출 스택을 별도 스레드에서 주기적으로 수집하는 샘플링 프로파일러입니다.
+    섹션 생성은 스레드 풀에서 실행되므로 호출한 스레드만 측정하는 cProfile 대신 sys._current_frames()를 사용하며,
+    샘플마다 스레드별 CPU 시계로 직전 샘플 이후 CPU를 쓴 스레드만 CPU 샘플로 세어, 잠금이나 네트워크 응답을 기다린 시간은 CPU 프로파일에서 빠집니다.
+    tracemalloc으로 실행 전후 메모리 할당을 비교합니다. 프로세스 전체를 측정하므로 동시에 실행된 다른 세션의 작업도 포함됩니다.
+    """
+
+    def __init__(self, run_id, interval=PROFILE_SAMPLING_INTERVAL, trace_memory=True):
+        self.run_id = run_id
+        self.interval = interval
+        self.trace_memory = trace_memory
+        self.stacks = {}  # (스레드 이름, 프레임 키...) -> [샘플 수, CPU 샘플 수, CPU 시간]
+        self.samples = 0
+        self.summary = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="run-profiler", daemon=True)
+
+    def start(self):
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+        self._started_tracing = False
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(PROFILE_TRACEMALLOC_FRAMES)
+                self._started_tracing = True
+            tracemalloc.reset_peak()
+            self._memory_before = tracemalloc.take_snapshot()
+        self._cpu_times = {ident: self._thread_cpu_time(ident) for ident in sys._current_frames()}
+        self._thread.start()
+        return self
+
+    @staticmethod
+    def _thread_cpu_time(ident):
+        """스레드의 CPU 사용 시간(초). 지원하지 않는 플랫폼이거나 종료된 스레드이면 None."""
+        try:
+            return time.clock_gettime(time.pthread_getcpuclockid(ident))
+        except (AttributeError, OSError):
+            return None
+
+    def _run(self):
+        own = threading.get_ident()
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                keys = []
+                while frame is not None:
+                    keys.append(_frame_key(frame.f_code))
+                    frame = frame.f_back
+                # 스레드 풀 이름의 번호를 지워 같은 풀의 스레드를 한 줄기로 모음
+                stack = (re.sub(r"[-_]\d+", "", names.get(ident, "thread")),) + tuple(reversed(keys))
+                cpu_time = self._thread_cpu_time(ident)
+                if cpu_time is None:
+                    cpu_seconds = 0.0 if self._is_idle(stack) else elapsed
+                else:
+                    cpu_seconds = max(0.0, cpu_time - self._cpu_times.get(ident, 0.0))
+                    self._cpu_times[ident] = cpu_time
+                entry = self.stacks.setdefault(stack, [0, 0, 0.0])
+                entry[0] += 1
+                if cpu_seconds > 0:
+                    entry[1] += 1
+                    entry[2] += cpu_seconds
+            self.samples += 1
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self._started
+        if self.trace_memory:
+            self._memory_after = tracemalloc.take_snapshot()
+            self.memory_peak = tracemalloc.get_traced_memory()[1]
+            if self._started_tracing:
+                tracemalloc.stop()
+
+    def _is_idle(self, stack):
+        return len(stack) == 1 or (os.path.basename(stack[-1][0]), stack[-1][2]) in IDLE_FRAMES
+
+    def folded(self, include_idle=False):
+        """flamegraph.pl 등에서 쓰는 folded 형식 {"스레드;함수;...": 샘플 수}. include_idle이면 대기 중인 샘플도 포함합니다."""
+        folded = {}
+        for stack, (samples, cpu_samples, _) in self.stacks.items():
+            count = samples if include_idle else cpu_samples
+            if count:
+                line = ";".join([stack[0]] + [_frame_label(key) for key in stack[1:]])
+                folded[line] = folded.get(line, 0) + count
+        return folded
+
+    def pstats_data(self):
+        """
+        CPU 샘플을 pstats 형식 {함수: (호출 수, 호출 수, 자체 시간, 누적 시간, 호출한 함수)}으로 바꿉니다.
+        샘플링 결과이므로 호출 수 자리에는 CPU 샘플 수가 들어가고 시간은 샘플 사이에 쓴 스레드 CPU 시간입니다.
+        """
+        stats = {}
+        def entry(key):
+            return stats.setdefault(key, [0, 0.0, 0.0, {}])
+        for stack, (_, count, seconds) in self.stacks.items():
+            if not count:
+                continue
+            frames = stack[1:]
+            leaf = entry(frames[-1])
+            leaf[1] += seconds
+            for key in set(frames):
+                current = entry(key)
+                current[0] += count
+                current[2] += seconds
+            for caller, callee in set(zip(frames, frames[1:])):
+                callers = entry(callee)[3]
+                previous = callers.get(caller, (0, 0, 0.0, 0.0))
+                callers[caller] = (previous[0] + count, previous[1] + count, previous[2], previous[3] + seconds)
+        return {key: (count, count, tt, ct, callers) for key, (count, tt, ct, callers) in stats.items()}
+
+    def _allocation_report(self):
+        filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ]
+        after = self._memory_after.filter_traces(filters)
+        growth = after.compare_to(self._memory_before.filter_traces(filters), "lineno")[:30]
+        lines = [f"실행 {self.run_id} 메모리 할당 (최대 {self.memory_peak / 1024 / 1024:.1f} MB)", "", "실행 중 증가한 할당 상위 30개:"]
+        lines.extend(str(stat) for stat in growth)
+        return after, "\n".join(lines) + "\n", [
+            {"위치": f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}", "증가(KB)": round(stat.size_diff / 1024, 1), "블록 증가": stat.count_diff}
+            for stat in growth[:10]
+        ]
+
+    def save(self, directory=None):
+        """프로파일 파일을 PROFILE_DIR/<실행 ID>/에 저장하고 요약을 반환합니다."""
+        directory = directory or os.path.join(PROFILE_DIR, self.run_id)
+        os.makedirs(directory, exist_ok=True)
+        cpu_folded = self.folded()
+        files = {
+            "stacks.folded": "".join(f"{line} {count}\n" for line, count in sorted(cpu_folded.items())),
+            "stacks-wall.folded": "".join(f"{line} {count}\n" for line, count in sorted(self.folded(include_idle=True).items())),
+            "flamegraph.svg": render_flamegraph_svg(cpu_folded, f"실행 {self.run_id} CPU 프로파일 ({self.duration:.1f}초, 샘플 간격 {self.interval * 1000:.0f}ms)"),
+        }
+        for name, text in files.items():
+            _write_atomic(os.path.join(directory, name), text.encode("utf-8"))
+        stats = self.pstats_data()
+        _write_atomic(os.path.join(directory, "profile.pstats"), marshal.dumps(stats))
+        
+        top_functions = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)[:15]
+        self.summary = {
+            "run_id": self.run_id,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "duration_seconds": round(self.duration, 3),
+            "interval_seconds": self.interval,
+            "samples": self.samples,
+            "cpu_samples": sum(cpu_folded.values()),
+            "top_functions": [
+                {"함수": _frame_label(key), "자체 시간(초)": round(tt, 3), "누적 시간(초)": round(ct, 3)}
+                for key, (_, _, tt, ct, _) in top_functions
+            ],
+            "directory": directory,
+        }
+        if self.trace_memory:
+            snapshot, report, top_allocations = self._allocation_report()
+            _write_atomic(os.path.join(directory, "allocations.txt"), report.encode("utf-8"))
+            snapshot.dump(os.path.join(directory, "allocations.tracemalloc"))
+            self.summary["memory_peak_mb"] = round(self.memory_peak / 1024 / 1024, 1)
+            self.summary["top_allocations"] = top_allocations
+        self.summary["files"] = [name for name in PROFILE_FILES if os.path.exists(os.path.join(directory, name))]
+        _write_atomic(os.path.join(directory, "summary.json"), json.dumps(self.summary, ensure_ascii=False, indent=2).encode("utf-8"))
+        return self.summary
+
+@contextmanager
+def profile_run(run_id, enabled=True, interval=PROFILE_SAMPLING_INTERVAL, trace_memory=True):
+    """
+    블록 실행을 프로파일링하고 결과를 실행 ID로 저장합니다. enabled가 False이면 None을 넘기고 아무 작업도 하지 않습니다.
+    블록에서 예외가 발생해도 그때까지의 프로파일을 저장합니다.
+    """
+    if not enabled:
+        yield None
+        return
+    profiler = RunProfiler(run_id, interval, trace_memory).start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        try:
+            profiler.save()
+        except OSError as e:
+            print(f"프로파일 저장 오류: {str(e)}")
+
+def render_flamegraph_svg(folded, title, width=1200, row_height=16):
+    """folded 스택으로 정적 SVG 플레임그래프를 만듭니다. 각 칸에 마우스를 올리면 함수 이름과 샘플 비율이 표시됩니다."""
+    root = {"count": 0, "children": {}}
+    for line, count in folded.items():
+        node = root
+        node["count"] += count
+        for name in line.split(";"):
+            node = node["children"].setdefault(name, {"count": 0, "children": {}})
+            node["count"] += count
+    
+    total = root["count"] or 1
+    scale = (width - 20) / total
+    rects = []
+    def layout(node, name, x, depth):
+        node_width = node["count"] * scale
+        if node_width < 0.3:
+            return depth
+        rects.append((name, node["count"], x, depth, node_width))
+        max_depth = depth
+        for child_name, child in sorted(node["children"].items()):
+            max_depth = max(max_depth, layout(child, child_name, x, depth + 1))
+            x += child["count"] * scale
+        return max_depth
+    max_depth = layout(root, "all", 10.0, 0)
+    
+    height = (max_depth + 1) * row_height + 50
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}" font-family="Verdana, sans-serif" font-size="11">',
+        '<rect width="100%" height="100%" fill="#f8f8f8"/>',
+        f'<text x="{width / 2}" y="22" text-anchor="middle" font-size="15">{html.escape(title)}</text>',
+    ]
+    for name, count, x, depth, rect_width in rects:
+        y = height - 10 - (depth + 1) * row_height
+        digest = hashlib.md5(name.encode("utf-8")).digest()
+        fill = f"rgb({205 + digest[0] % 50},{80 + digest[1] % 130},{digest[2] % 60})"
+        label = html.escape(f"{name} ({count}샘플, {count / total * 100:.1f}%)")
+        parts.append(f'<g><title>{label}</title><rect x="{x:.1f}" y="{y}" width="{rect_width:.1f}" height="{row_height - 1}" fill="{fill}" rx="2"/>')
+        chars = int((rect_width - 6) / 7)
+        if chars >= 3:
+            text = name if len(name) <= chars else name[:chars - 2] + ".."
+            parts.append(f'<text x="{x + 3:.1f}" y="{y + row_height - 4}">{html.escape(text)}</text>')
+        parts.append("</g>")
+    parts.append("</svg>")
+    return "\n".join(parts)
+
+def list_profiles(limit=20):
+    """저장된 실행 프로파일 요약을 최근 실행부터 반환합니다."""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    summaries = []
+    for run_id in sorted(os.listdir(PROFILE_DIR), reverse=True)[:limit]:
+        try:
+            with open(os.path.join(PROFILE_DIR, run_id, "summary.json"), encoding="utf-8") as f:
+                summaries.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return summaries
+
+@st.fragment
+def render_profile_panel():
+    """저장된 실행 프로파일의 요약을 보여주고 플레임그래프, pstats, 할당 스냅샷을 내려받게 합니다."""
+    profiles = list_profiles()
+    if not profiles:
+        return
+    
+    with st.expander("실행 프로파일"):
+        summary = st.selectbox(
+            "실행",
+            options=profiles,
+            format_func=lambda p: f"{p['run_id']} ({p['duration_seconds']:.1f}초)"
+        )
+        col1, col2, col3 = st.columns(3)
+        col1.metric("소요 시간", f"{summary['duration_seconds']:.1f}초")
+        col2.metric("CPU 샘플", f"{summary['cpu_samples']:,}", help=f"전체 샘플 {summary['samples']:,}회 (간격 {summary['interval_seconds'] * 1000:.0f}ms)")
+        if "memory_peak_mb" in summary:
+            col3.metric("최대 추적 메모리", f"{summary['memory_peak_mb']:.1f} MB")
+        if summary["top_functions"]:
+            st.write("자체 CPU 시간 상위 함수")
+            st.table(summary["top_functions"])
+        if summary.get("top_allocations"):
+            st.write("실행 중 증가한 메모리 할당 상위")
+            st.table(summary["top_allocations"])
+        
+        directory = os.path.join(PROFILE_DIR, summary["run_id"])
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as bundle:
+            for name in summary["files"] + ["summary.json"]:
+                bundle.write(os.path.join(directory, name), f"{summary['run_id']}/{name}")
+        st.download_button("프로파일 묶음 다운로드 (zip)", data=buffer.getvalue(), file_name=f"profile-{summary['run_id']}.zip", mime="application/zip")
+        for name in summary["files"]:
+            label, mime = PROFILE_FILES[name]
+            with open(os.path.join(directory, name), "rb") as f:
+                st.download_button(label, data=f.read(), file_name=f"{summary['run_id']}-{name}", mime=mime, key=f"profile-{summary['run_id']}-{name}")
+        
+        if "flamegraph.svg" in summary["files"] and st.checkbox("플레임그래프 보기"):
+            with open(os.path.join(directory, "flamegraph.svg"), encoding="utf-8") as f:
+                flamegraph = f.read()
+            if hasattr(st, "iframe"):
+                st.iframe(flamegraph, height=600)
+            else:
+                components.html(flamegraph, height=600, scrolling=True)
+
+# 발행한 호의 섹션 원본과 렌더링 결과 보관 위치 (템플릿이 바뀌면 rerender_archive로 API 호출 없이 다시 렌더링)
+ARCHIVE_DIR = os.path.join(DATA_DIR, "archive")
+ARCHIVE_OUTPUTS = ("issue.html", "issue-email.html")
+
+def _hash_json(value):
+    return hashlib.sha1(json.dumps(value, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+# 보관된 호를 모두 다시 렌더링해야 하는데 고정 예시 호의 렌더링 결과로는 드러나지 않는 템플릿 변경을 했다면 올림
+TEMPLATE_VERSION = 1
+
+def _template_fixture():
+    """템플릿 해시 계산용 고정 예시 호 (모든 섹션에 제목, 강조, 링크, 목록, 기사 썸네일 참조 포함)"""
+    sections = {
+        name: (
+            f'<h2>{name}</h2><img class="news-thumb" src="thumbnail:{"0" * 16}-{THUMBNAIL_WIDTH}" width="{THUMBNAIL_WIDTH}" height="105" alt="">'
+            f'<p><strong>요약:</strong> 예시 문단입니다. <a href="https://example.com/{name}" target="_blank">원문 보기</a></p>'
+            '<ol><li>첫 번째 단계</li><li>두 번째 단계</li></ol><hr>'
+        )
+        for name in NEWSLETTER_SECTIONS
+    }
+    highlight_settings = {"title": "예시 제목", "subtitle": "예시 부제", "link_text": "자세히 →", "link_url": "https://example.com"}
+    return sections, 1, "2000년 01월 01일", highlight_settings
+
+@st.cache_resource
+def compute_template_hash():
+    """
+    TEMPLATE_VERSION, 스타일시트, 고정 예시 호를 에디션별 웹/이메일용 HTML로 렌더링한 결과로 템플릿 해시를 계산합니다.
+    렌더링 결과만 보므로 코드의 주석/공백 수정으로는 보관된 호를 다시 렌더링하지 않습니다. 프로세스당 한 번 계산합니다.
+    """
+    parts = [str(TEMPLATE_VERSION), NEWSLETTER_CSS]
+    fixture = _template_fixture()
+    for edition in EDITION_LANGUAGES:
+        parts.append(generate_combined_html_template(*fixture, edition=edition))
+        parts.append(generate_email_html(*fixture, edition=edition))
+    return hashlib.sha1("\0".join(parts).encode("utf-8")).hexdigest()
+
+def _archive_content(issue):
+    """렌더링에 사용하는 값만 추립니다. 이 값의 해시가 섹션 내용 해시입니다."""
+    return {
+        "issue_number": issue["issue_number"],
+        "edition": issue.get("edition", "ko"),
+        "date": issue["date"],
+        "highlight_settings": issue["highlight_settings"],
+        "sections": issue["sections"],
+    }
+
+def archive_key(issue):
+    return f"{int(issue['issue_number']):04d}-{issue.get('edition', 'ko')}"
+
+def archive_issue(issue, settings=None):
+    """생성한 호의 섹션 내용을 보관하고 현재 템플릿으로 렌더링합니다. 같은 호/에디션을 다시 생성하면 덮어씁니다."""
+    issue_dir = os.path.join(ARCHIVE_DIR, archive_key(issue))
+    os.makedirs(issue_dir, exist_ok=True)
+    stored = dict(_archive_content(issue), settings=settings or {}, archived_at=datetime.now().isoformat(timespec="seconds"))
+    _write_atomic(os.path.join(issue_dir, "issue.json"), json.dumps(stored, ensure_ascii=False, indent=2).encode("utf-8"))
+    render_archived_issues([issue_dir], compute_template_hash())
+    return issue_dir
+
+def render_archived_issues(issue_dirs, template_hash):
+    """
+    보관된 호들을 섹션 원본으로 다시 렌더링하여 HTML과 렌더링 기록(render.json)을 씁니다.
+    프로세스 풀 작업 단위로 쓰이며, (보관 이름, 오류 메시지 또는 None) 목록을 반환합니다.
+    """
+    results = []
+    for issue_dir in issue_dirs:
+        key = os.path.basename(issue_dir)
+        try:
+            with open(os.path.join(issue_dir, "issue.json"), encoding="utf-8") as f:
+                content = _archive_content(json.load(f))
+            args = (content["sections"], content["issue_number"], content["date"], content["highlight_settings"])
+            outputs = {
+                "issue.html": generate_combined_html_template(*args, edition=content["edition"]),
+                "issue-email.html": generate_email_html(*args, edition=content["edition"]),
+            }
+            for name, document in outputs.items():
+                _write_atomic(os.path.join(issue_dir, name), document.encode("utf-8"))
+            manifest = {
+                "content_hash": _hash_json(content),
+                "template_hash": template_hash,
+                "rendered_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            _write_atomic(os.path.join(issue_dir, "render.json"), json.dumps(manifest, indent=2).encode("utf-8"))
+            results.append((key, None))
+        except Exception as e:
+            results.append((key, str(e)))
+    return results
+
+def _needs_render(issue_dir, template_hash):
+    """섹션 내용 해시와 템플릿 해시가 마지막 렌더링 때와 같고 결과 파일이 모두 있으면 다시 렌더링하지 않습니다."""
+    try:
+        with open(os.path.join(issue_dir, "issue.json"), encoding="utf-8") as f:
+            content_hash = _hash_json(_archive_content(json.load(f)))
+        with open(os.path.join(issue_dir, "render.json"), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError, KeyError):
+        return True
+    if manifest.get("content_hash") != content_hash or manifest.get("template_hash") != template_hash:
+        return True
+    return not all(os.path.exists(os.path.join(issue_dir, name)) for name in ARCHIVE_OUTPUTS)
+
+def rerender_archive(max_workers=None, force=False, batch_size=None):
+    """
+    보관된 모든 호를 현재 템플릿으로 다시 렌더링합니다. API 호출 없이 보관된 섹션 내용만 사용하며,
+    (섹션 내용 해시, 템플릿 해시)가 바뀌지 않은 호는 건너뛰고 나머지는 프로세스 풀에서 묶음 단위로 병렬 처리합니다.
+    """
+    started = time.perf_counter()
+    template_hash = compute_template_hash()
+    issue_dirs = []
+    if os.path.isdir(ARCHIVE_DIR):
+        issue_dirs = [
+            os.path.join(ARCHIVE_DIR, name) for name in sorted(os.listdir(ARCHIVE_DIR))
+            if os.path.isfile(os.path.join(ARCHIVE_DIR, name, "issue.json"))
+        ]
+    pending = [issue_dir for issue_dir in issue_dirs if force or _needs_render(issue_dir, template_hash)]
+    
+    results = []
+    if pending:
+        max_workers = max_workers or os.cpu_count() or 1
+        batch_size = batch_size or max(1, len(pending) // (max_workers * 4))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(render_archived_issues, batch, template_hash) for batch in _chunk(pending, batch_size)]
+            for future in futures:
+                results.extend(future.result())
+    
+    failed = {key: error for key, error in results if error}
+    for key, error in failed.items():
+        print(f"아카이브 렌더링 오류 ({key}): {error}")
+    return {
+        "total": len(issue_dirs),
+        "rendered": len(results) - len(failed),
+        "skipped": len(issue_dirs) - len(pending),
+        "failed": failed,
+        "template_hash": template_hash,
+        "duration_seconds": round(time.perf_counter() - started, 3),
+    }
+
+# 수신자별 개인화 위치 표시 (<!--MERGE:greeting-->, <!--MERGE:team_highlight-->)
+MERGE_SLOT_PATTERN = re.compile(r"<!--MERGE:(\w+)-->")
+
+def strip_merge_slots(html_content):
+    """개인화 위치 표시를 제거한 일반 뉴스레터 HTML을 반환합니다."""
+    return MERGE_SLOT_PATTERN.sub("", html_content)
+
+class CompiledMergeTemplate:
+    """
+    완성된 뉴스레터를 미리 인코딩된 불변 바이트 조각과 개인화 슬롯 이름으로 나눈 템플릿입니다.
+    수신자별 문서는 조각 사이에 슬롯 값만 끼워 넣어 만들므로 전체 HTML을 다시 생성하지 않습니다.
+    """
+    __slots__ = ("segments", "slots")
+
+    def __init__(self, html_content):
+        parts = MERGE_SLOT_PATTERN.split(html_content)
+        self.segments = tuple(part.encode("utf-8") for part in parts[0::2])
+        self.slots = tuple(parts[1::2])
+
+    def iter_chunks(self, values):
+        """슬롯 값(bytes)과 고정 조각을 순서대로 내보냅니다. 값이 없는 슬롯은 비워 둡니다."""
+        segments = self.segments
+        yield segments[0]
+        for i, slot in enumerate(self.slots):
+            yield values.get(slot, b"")
+            yield segments[i + 1]
+
+    def render(self, values):
+        return b"".join(self.iter_chunks(values))
+
+    def write_to(self, out, values):
+        """중간 문서를 만들지 않고 바이너리 파일 객체에 바로 씁니다."""
+        out.writelines(self.iter_chunks(values))
+
+@st.cache_resource(max_entries=8)
+def compile_merge_template(html_content):
+    """뉴스레터 HTML을 한 번만 컴파일하여 프로세스 전체에서 재사용합니다."""
+    return CompiledMergeTemplate(html_content)
+
+_GREETING_TEMPLATE = '<p class="greeting">{name}님, 안녕하세요.</p>'
+
+def parse_team_highlights(text):
+    """팀별 하이라이트 설정 텍스트(한 줄에 '팀,제목,내용[,링크 URL]')를 파싱합니다."""
+    highlights = {}
+    for line in (text or "").splitlines():
+        fields = [field.strip() for field in line.split(",", 3)]
+        if len(fields) >= 3 and fields[0]:
+            highlights[fields[0]] = {
+                "title": fields[1],
+                "body": fields[2],
+                "link_url": fields[3] if len(fields) > 3 else "",
+            }
+    return highlights
+
+def render_team_highlight(highlight):
+    """팀별 하이라이트 박스 HTML을 만듭니다."""
+    link = ""
+    if highlight.get("link_url"):
+        link = f'<p style="text-align: right; font-size: 9pt;"><a href="{html.escape(highlight["link_url"])}" style="color: #1a5fb4;">자세히 보기 →</a></p>'
+    return (
+        f'<div class="team-highlight">'
+        f'<div class="team-highlight-title">{html.escape(highlight.get("title", ""))}</div>'
+        f'<p>{html.escape(highlight.get("body", ""))}</p>{link}'
+        f'</div>'
+    )
+
+class MergeRenderer:
+    """
+    컴파일된 템플릿으로 수신자별 문서를 만듭니다.
+    팀별 하이라이트 박스는 처음에 한 번만 인코딩하고, 수신자마다 이름만 새로 인코딩합니다.
+    """
+
+    def __init__(self, compiled, team_highlights=None, inline_styles=False):
+        self.compiled = compiled
+        greeting = _GREETING_TEMPLATE
+        team_boxes = {team: render_team_highlight(highlight) for team, highlight in (team_highlights or {}).items()}
+        if inline_styles:
+            # 이메일용 문서에 끼워 넣는 조각도 같은 인라인 스타일을 적용
+            inliner = get_css_inliner()
+            greeting = inliner.inline_fragment(greeting)
+            team_boxes = {team: inliner.inline_fragment(box) for team, box in team_boxes.items()}
+        prefix, _, suffix = greeting.partition("{name}")
+        self._greeting_prefix = prefix.encode("utf-8")
+        self._greeting_suffix = suffix.encode("utf-8")
+        self._team_boxes = {team: box.encode("utf-8") for team, box in team_boxes.items()}
+
+    def values_for(self, recipient):
+        values = {}
+        name = recipient.get("name")
+        if name:
+            values["greeting"] = self._greeting_prefix + html.escape(name).encode("utf-8") + self._greeting_suffix
+        team_box = self._team_boxes.get(recipient.get("team"))
+        if team_box:
+            values["team_highlight"] = team_box
+        return values
+
+    def render(self, recipient):
+        return self.compiled.render(self.values_for(recipient))
+
+    def write_to(self, out, recipient):
+        self.compiled.write_to(out, self.values_for(recipient))
+
+def render_personalized_issues(html_content, recipients, team_highlights=None, inline_styles=False):
+    """수신자별 개인화 문서를 (수신자, HTML 바이트) 형태로 하나씩 생성합니다."""
+    renderer = MergeRenderer(compile_merge_template(html_content), team_highlights, inline_styles)
+    for recipient in recipients:
+        yield recipient, renderer.render(recipient)
+
+# 메일 발송 기본 설정 (로컬 디버그 SMTP 서버: python newsletter_cli.py smtp-debug)
+DEFAULT_SMTP_SETTINGS = {
+    "host": "localhost",
+    "port": 1025,
+    "username": "",
+    "password": "",
+    "use_tls": False,
+    "timeout": 10,
+}
+
+# 일시적 발송 실패의 최대 재시도 횟수와 기본 대기 시간(초, 시도마다 2배씩 증가)
+MAX_DELIVERY_ATTEMPTS = 5
+RETRY_BASE_DELAY = 60
+
+_EMAIL_PATTERN = re.compile(r"^[^@\s,;<>]+@[^@\s,;<>]+\.[^@\s,;<>]+$")
+
+def parse_recipients(text):
+    """
+    구독자 목록 텍스트(CSV 형식: 이메일[,이름[,팀]])를 파싱합니다.
+    각 줄에서 '@'가 포함된 필드를 이메일로 보고, 나머지 필드를 순서대로 이름과 팀으로 사용합니다.
+    헤더 줄이나 잘못된 주소는 건너뛰며, 같은 주소는 한 번만 포함합니다.
+    """
+    recipients = []
+    seen = set()
+    for line in (text or "").splitlines():
+        fields = [field.strip() for field in line.split(",")]
+        emails = [field for field in fields if _EMAIL_PATTERN.match(field)]
+        if not emails or emails[0].lower() in seen:
+            continue
+        others = [field for field in fields if field and field != emails[0]]
+        seen.add(emails[0].lower())
+        recipients.append({
+            "email": emails[0],
+            "name": others[0] if others else "",
+            "team": others[1] if len(others) > 1 else "",
+        })
+    return recipients
+
+def encode_mime_body(html_bytes):
+    """HTML 본문을 SMTP 전송용 base64(76자 줄바꿈, CRLF)로 인코딩합니다."""
+    return base64.encodebytes(html_bytes).replace(b"\n", b"\r\n")
+
+def encode_related_parts(html_content):
+    """
+    본문이 cid:로 참조하는 썸네일을 multipart/related 이미지 파트로 한 번만 인코딩하여 (경계 문자열, 이미지 파트 바이트)를 반환합니다.
+    참조하는 썸네일이 없으면 None.
+    """
+    boundary = f"=_aidt_related_{os.urandom(8).hex()}"
+    parts = []
+    for key in dict.fromkeys(_THUMBNAIL_CID.findall(html_content)):
+        if not os.path.exists(_thumbnail_path(key)):
+            continue
+        with open(_thumbnail_path(key), "rb") as f:
+            data = f.read()
+        headers = [
+            f"--{boundary}",
+            "Content-Type: image/jpeg",
+            "Content-Transfer-Encoding: base64",
+            f"Content-ID: <{_thumbnail_cid(key)}>",
+            f'Content-Disposition: inline; filename="{key}.jpg"',
+        ]
+        parts.append(("\r\n".join(headers) + "\r\n\r\n").encode("ascii") + encode_mime_body(data))
+    if not parts:
+        return None
+    return boundary, b"".join(parts) + f"--{boundary}--\r\n".encode("ascii")
+
+def build_mime_message(sender, recipient, subject, encoded_body, related=None):
+    """
+    미리 인코딩된 본문에 수신자별 헤더만 붙여 MIME 메시지 바이트를 만듭니다.
+    수신자마다 email 패키지로 메시지 객체를 만드는 것보다 훨씬 빠릅니다.
+    related(encode_related_parts 결과)가 있으면 본문과 썸네일 이미지를 multipart/related로 묶습니다.
+    """
+    sender_domain = parseaddr(sender)[1].rpartition("@")[2] or "localhost"
+    headers = [
+        f"From: {formataddr(parseaddr(sender), charset='utf-8')}",
+        f"To: {formataddr((recipient.get('name') or '', recipient['email']), charset='utf-8')}",
+        f"Subject: {Header(subject, 'utf-8').encode()}",
+        f"Date: {formatdate(localtime=True)}",
+        f"Message-ID: {make_msgid(domain=sender_domain)}",
+        "MIME-Version: 1.0",
+    ]
+    html_headers = ['Content-Type: text/html; charset="utf-8"', "Content-Transfer-Encoding: base64"]
+    if related is None:
+        return ("\r\n".join(headers + html_headers) + "\r\n\r\n").encode("ascii") + encoded_body
+    boundary, image_parts = related
+    headers.append(f'Content-Type: multipart/related; boundary="{boundary}"; type="text/html"')
+    html_part = "\r\n".join([f"--{boundary}"] + html_headers) + "\r\n\r\n"
+    return ("\r\n".join(headers) + "\r\n\r\n" + html_part).encode("ascii") + encoded_body + image_parts
+
+class SMTPConnectionPool:
+    """
+    SMTP 연결을 재사용하는 연결 풀입니다.
+    최대 size개까지 연결을 만들고, 반납된 연결은 다음 발송 묶음에서 그대로 사용합니다.
+    """
 
-# 통합된 뉴스레터를 위한 HTML 템플릿 생성 함수
-def generate_combined_html_template(newsletter_content, issue_number, date, highlight_settings):
-    """세 가지 API를 모두 사용한 뉴스레터 HTML 템플릿을 생성합니다."""
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>AIDT Weekly - 제{issue_number}호</title>
-        <style>
-            body {{
-                font-family: 'Segoe UI', Arial, sans-serif;
-                line-height: 1.5;
-                color: #333;
-                margin: 0;
-                padding: 0;
-                background-color: #f9f9f9;
-            }}
-            .container {{
-                max-width: 600px;
-                margin: 0 auto;
-                background-color: #ffffff;
-            }}
-            .content {{
-                padding: 20px;
-            }}
-            .header {{
-                background-color: #333333;
-                color: white;
-                padding: 15px 20px;
-                text-align: left;
-            }}
-            .title {{
-                margin: 0;
-                font-size: 20px;
-                font-weight: bold;
-            }}
-            .issue-date {{
-                margin-top: 5px;
-                font-size: 10pt;
-            }}
-            .section {{
-                margin-bottom: 25px;
-                border-bottom: 1px solid #eee;
-                padding-bottom: 20px;
-            }}
-            .section:last-child {{
-                border-bottom: none;
-            }}
-            .section-title {{
-                color: #ffffff;
-                font-size: 16px;
-                font-weight: bold;
-                margin-bottom: 10px;
-                background-color: #3e3e3e;
-                padding: 8px 10px;
-                border-radius: 4px;
-            }}
-            .section-icon {{
-                margin-right: 8px;
-            }}
-            h2, h3 {{
-                font-size: 14px;
-                margin-bottom: 5px;
-                color: #333333;
-            }}
-            .main-news h2 {{
-                color: #ff5722;
-                font-size: 14px;
-                margin-top: 15px;
-                margin-bottom: 5px;
-                border-bottom: none;
-                padding-bottom: 0;
-            }}
-            .main-news a {{
-                color: #ff5722;
-                text-decoration: none;
-            }}
-            .main-news a:hover {{
-                text-decoration: underline;
-            }}
-            .main-news p, .success-case p, p, li {{
-                font-size: 10pt;
-                margin: 0 0 8px;
-            }}
-            ul {{
-                padding-left: 20px;
-                margin-top: 5px;
-                margin-bottom: 8px;
-            }}
-            li {{
-                margin-bottom: 3px;
-            }}
-            .footer {{
-                background-color: #f1f1f1;
-                padding: 10px;
-                text-align: center;
-                font-size: 9pt;
-                color: #666;
-            }}
-            .section-container {{
-                padding: 0 15px;
-            }}
-            .highlight-box {{
-                background-color: #fff9f5;
-                border: 1px solid #ffe0cc;
-                border-radius: 5px;
-                padding: 15px;
-                margin: 10px 0;
-            }}
-            .highlight-title {{
-                color: #ff5722;
-                font-size: 16px;
-                font-weight: bold;
-                margin-bottom: 10px;
-                text-align: center;
-            }}
-            .highlight-subtitle {{
-                color: #666;
-                font-size: 12px;
-                text-align: center;
-                margin-bottom: 15px;
-            }}
-            
-            /* AT/DT 팁 섹션 스타일 */
-            .aidt-tips {{
-                font-size: 10pt;
-            }}
+    def __init__(self, host, port, username="", password="", use_tls=False, timeout=10, size=4):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
 
-            .tip-title {{
-                background-color: #f2f2f2;
-                padding: 8px 10px;
-                margin-bottom: 10px;
-                border-radius: 4px;
-                font-weight: bold;
-            }}
+    def _connect(self):
+        conn = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        conn.ehlo()
+        if self.use_tls:
+            conn.starttls()
+            conn.ehlo()
+        if self.username:
+            conn.login(self.username, self.password)
+        return conn
 
-            .prompt-examples-title {{
-                background-color: #f2f2f2;
-                padding: 8px 10px;
-                margin: 15px 0 10px 0;
-                border-radius: 4px;
-                font-weight: bold;
-            }}
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            can_create = self._created < self.size
+            if can_create:
+                self._created += 1
+        if not can_create:
+            return self._idle.get()
+        try:
+            return self._connect()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
 
-            /* 프롬프트 템플릿 스타일 */
-            .prompt-template {{
-                margin-bottom: 20px; /* 템플릿 간 간격 */
-            }}
+    def release(self, conn, broken=False):
+        if not broken:
+            self._idle.put(conn)
+            return
+        with self._lock:
+            self._created -= 1
+        try:
+            conn.close()
+        except Exception:
+            pass
 
-            .template-title {{
-                color: #ff5722; /* 제목 색상 - 오렌지 계열 */
-                font-weight: bold;
-                margin-bottom: 0; /* 제목과 내용 사이 간격 없음 */
-                padding: 0;
-            }}
+    def close_all(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                conn.quit()
+            except Exception:
+                conn.close()
+            with self._lock:
+                self._created -= 1
 
-            .template-content {{
-                margin-left: 15px;
-                margin-bottom: 10px; /* 내용 아래 여백 추가 */
-            }}
+class DomainThrottle:
+    """수신 도메인별 동시 연결 수와 초당 발송 수를 제한합니다."""
 
-            /* 예시와 프롬프트 스타일 */
-            .example-label, .prompt-label {{
-                font-weight: bold;
-                margin-top: 5px;
-                color: #333; /* 이미지와 일치하는 색상 */
-            }}
+    def __init__(self, max_concurrent=2, rate_per_second=20.0):
+        self.max_concurrent = max_concurrent
+        self.rate_per_second = rate_per_second
+        self._semaphores = {}
+        self._next_slot = {}
+        self._lock = threading.Lock()
 
-            .example-content, .prompt-content {{
-                margin-left: 15px;
-                line-height: 1.3; /* 내용 줄간격 약간 줄임 */
-                margin-bottom: 8px; /* 내용 하단 여백 증가 */
-                color: #333; /* 이미지와 일치하는 색상 */
-            }}
+    @contextmanager
+    def slot(self, domain):
+        with self._lock:
+            semaphore = self._semaphores.setdefault(domain, threading.Semaphore(self.max_concurrent))
+        with semaphore:
+            yield
 
-            .tip-footer {{
-                margin-top: 15px;
-                font-style: italic;
-                color: #666; /* 이미지와 일치하는 색상 */
-            }}
-            
-            /* 네이버 API 섹션 스타일 - 검은색으로 변경 */
-            .naver-section {{
-                background-color: #f8f8ff; /* 연한 파란색 배경 */
-                border-radius: 4px;
-                padding: 10px;
-                margin-bottom: 15px;
-            }}
-            
-            .naver-section h2, .naver-section h3 {{
-                color: #333333; /* 검은색으로 변경 */
-            }}
-            
-            /* AI 활용사례 섹션 스타일 */
-            .section ol {{
-                margin-left: 20px;
-                padding-left: 0;
-            }}
-            .section ol li {{
-                margin-bottom: 5px;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <div class="title">중부Infra AT/DT Weekly</div>
-                <div class="issue-info">제{issue_number}호 | {date}</div>
-            </div>
-            
-            <div class="content">
-                <div class="newsletter-intro">
-                    <p>중부Infra AT/DT 뉴스레터는 모두가 AI발전 속도에 뒤쳐지지 않고 업무에 적용할 수 있도록 가장 흥미로운 AI 활용법을 전합니다.</p>
-                </div>
-                
-                <div class="highlight-box">
-                    <div class="highlight-title">{highlight_settings['title']}</div>
-                    <div class="highlight-subtitle">{highlight_settings['subtitle']}</div>
-                    <p style="text-align: right; margin-top: 5px; font-size: 9pt;"><a href="{highlight_settings['link_url']}" style="color: #ff5722;">{highlight_settings['link_text']}</a></p>
-                </div>
-                
-                <!-- 글로벌 AI 뉴스 (OpenAI + NewsAPI) 섹션 -->
-                {f'''
-                <div class="section">
-                    <div class="section-title">글로벌 AI 뉴스</div>
-                    <div class="section-container main-news">
-                        {newsletter_content.get('main_news', '<p>글로벌 AI 뉴스를 불러올 수 없습니다.</p>')}
-                    </div>
-                </div>
-                ''' if 'main_news' in newsletter_content else ""}
-                
-                <!-- 네이버 API 섹션 (색상 변경) -->
-                {f'''
-                <div class="section">
-                    <div class="section-title">국내 AI 뉴스</div>
-                    <div class="section-container main-news naver-section">
-                        {newsletter_content.get('naver_news', '<p>국내 AI 뉴스를 불러올 수 없습니다.</p>')}
-                    </div>
-                </div>
-                ''' if 'naver_news' in newsletter_content else ""}
-                
-                <div class="section">
-                    <div class="section-title">이번 주 AT/DT 팁</div>
-                    <div class="section-container aidt-tips">
-                        {newsletter_content.get('aidt_tips', '<p>AT/DT 팁을 불러올 수 없습니다.</p>')}
-                    </div>
-                </div>
-                
-                <!-- AI 활용사례 섹션 (새로 추가) -->
-                <div class="section">
-                    <div class="section-title">AI 활용사례</div>
-                    <div class="section-container">
-                        {newsletter_content.get('ai_use_case', '<p>AI 활용사례를 불러올 수 없습니다.</p>')}
-                    </div>
-                </div>
-                
-                <div class="section success-case">
-                    <div class="section-title">성공 사례</div>
-                    <div class="section-container">
-                        {newsletter_content.get('success_story', '<p>성공 사례를 불러올 수 없습니다.</p>')}
-                    </div>
-                </div>
-            </div>
+    def wait_turn(self, domain):
+        """도메인의 초당 발송 한도를 넘지 않도록 필요한 만큼 대기합니다."""
+        if not self.rate_per_second:
+            return
+        with self._lock:
+            now = time.monotonic()
+            turn = max(now, self._next_slot.get(domain, now))
+            self._next_slot[domain] = turn + 1 / self.rate_per_second
+        if turn > now:
+            time.sleep(turn - now)
+
+def _classify_smtp_error(error):
+    """SMTP 오류를 일시적 실패('deferred')와 영구 실패('failed')로 구분합니다."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in error.recipients.values()]
+        return "deferred" if codes and all(400 <= code < 500 for code in codes) else "failed"
+    if isinstance(error, smtplib.SMTPResponseException):
+        return "deferred" if 400 <= error.smtp_code < 500 else "failed"
+    if isinstance(error, (smtplib.SMTPServerDisconnected, OSError)):
+        return "deferred"
+    return "failed"
+
+def _send_batch(pool, throttle, domain, batch, sender, subject, body_for, related=None):
+    """같은 도메인의 수신자 묶음을 풀의 연결 하나로 발송하고 (수신자, 결과, 오류) 목록을 반환합니다."""
+    results = []
+    envelope_sender = parseaddr(sender)[1]
+    remaining = list(batch)
+    with throttle.slot(domain):
+        while remaining:
+            try:
+                conn = pool.acquire()
+            except Exception as e:
+                # 연결 자체가 되지 않으면 남은 수신자 전체를 같은 결과로 처리
+                results.extend((recipient, _classify_smtp_error(e), str(e)) for recipient in remaining)
+                break
             
-            <div class="footer">
-                <p>© {datetime.now().year} 중부Infra All rights reserved. | 뉴스레터 구독에 감사드립니다.</p>
-                <p>문의사항이나 제안이 있으시면 언제든지 연락해 주세요^^.</p>
-            </div>
-        </div>
-    </body>
-    </html>
+            broken = False
+            current = None  # 결과를 아직 기록하지 않은 수신자
+            try:
+                while remaining:
+                    current = remaining.pop(0)
+                    throttle.wait_turn(domain)
+                    message = build_mime_message(sender, current, subject, body_for(current), related)
+                    try:
+                        conn.sendmail(envelope_sender, [current["email"]], message)
+                        results.append((current, "sent", ""))
+                        current = None
+                    except (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError, smtplib.SMTPSenderRefused) as e:
+                        results.append((current, _classify_smtp_error(e), str(e)))
+                        current = None
+                        # 거부 뒤 서버가 연결을 끊었으면 RSET이 실패하므로 아래에서 연결만 교체
+                        conn.rset()
+            except Exception as e:
+                # 연결이 끊기면 현재 수신자만 실패 처리하고 새 연결로 나머지를 계속 발송
+                broken = True
+                if current is not None:
+                    results.append((current, _classify_smtp_error(e), str(e)))
+            finally:
+                pool.release(conn, broken)
+    return results
+
+def _save_outbox(issue_id, html_bytes, personalization=None):
+    """
+    재시도 발송에 사용할 수 있도록 발송한 뉴스레터 본문과 개인화 설정을 보관합니다.
+    중간에 중단되어도 잘린 파일이 남지 않도록 원자적으로 쓰며, 본문 파일은 개인화 설정을 쓴 뒤 마지막에 만듭니다.
+    """
+    outbox_dir = os.path.join(DATA_DIR, "outbox")
+    path = os.path.join(outbox_dir, f"{issue_id}.html")
+    merge_path = os.path.join(outbox_dir, f"{issue_id}.merge.json")
+    if personalization and not os.path.exists(merge_path):
+        _write_atomic(merge_path, json.dumps(personalization, ensure_ascii=False).encode("utf-8"))
+    if not os.path.exists(path):
+        _write_atomic(path, html_bytes)
+    return path
+
+def _load_outbox(issue_id):
+    """보관된 뉴스레터 본문과 개인화 설정(없으면 None)을 반환합니다."""
+    outbox_dir = os.path.join(DATA_DIR, "outbox")
+    with open(os.path.join(outbox_dir, f"{issue_id}.html"), encoding="utf-8") as f:
+        html_content = f.read()
+    try:
+        with open(os.path.join(outbox_dir, f"{issue_id}.merge.json"), encoding="utf-8") as f:
+            personalization = json.load(f)
+    except FileNotFoundError:
+        personalization = None
+    return html_content, personalization
+
+def _save_delivery_report(report):
+    report_dir = os.path.join(DATA_DIR, "delivery_reports")
+    path = os.path.join(report_dir, f"{report['issue_id']}-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}.json")
+    _write_atomic(path, json.dumps(report, ensure_ascii=False, indent=2).encode("utf-8"))
+    return path
+
+def send_newsletter_bulk(html_content, subject, recipients, sender, smtp_settings=None, max_workers=8,
+                         batch_size=50, per_domain_concurrency=2, per_domain_rate=20.0, issue_id=None,
+                         personalization=None):
+    """
+    완성된 뉴스레터를 구독자 목록에 발송합니다.
+    수신자를 도메인별 묶음으로 나누어 재사용되는 SMTP 연결 풀에서 동시에 발송하고,
+    일시적 실패는 영구 재시도 대기열에, 결과는 발송 보고서로 저장합니다.
+    personalization({template: 개인화 위치가 있는 HTML, team_highlights, inline_styles})을 지정하면
+    수신자별 인사말과 팀 하이라이트를 넣은 본문을 보내며, 재시도 발송에서도 같은 설정을 사용하도록 함께 보관합니다.
+    본문이 cid:로 참조하는 썸네일은 한 번만 인코딩하여 모든 메시지에 첨부합니다.
+    """
+    smtp_settings = dict(DEFAULT_SMTP_SETTINGS, **(smtp_settings or {}))
+    html_bytes = html_content.encode("utf-8")
+    if not issue_id:
+        digest = hashlib.sha1(html_bytes)
+        if personalization:
+            digest.update(json.dumps(personalization, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+        issue_id = digest.hexdigest()[:12]
+    _save_outbox(issue_id, html_bytes, personalization)
+    related = encode_related_parts(html_content)
+    
+    if personalization is None:
+        shared_body = encode_mime_body(html_bytes)
+        body_for = lambda recipient: shared_body
+    else:
+        renderer = MergeRenderer(
+            compile_merge_template(personalization["template"]), personalization.get("team_highlights"),
+            personalization.get("inline_styles", False)
+        )
+        body_for = lambda recipient: encode_mime_body(renderer.render(recipient))
+    
+    # 도메인별로 묶어서 같은 연결로 연속 발송
+    by_domain = {}
+    for recipient in recipients:
+        by_domain.setdefault(recipient["email"].rpartition("@")[2].lower(), []).append(recipient)
+    batches = [(domain, batch) for domain, items in by_domain.items() for batch in _chunk(items, batch_size)]
+    
+    pool = SMTPConnectionPool(
+        smtp_settings["host"], smtp_settings["port"], smtp_settings["username"], smtp_settings["password"],
+        smtp_settings["use_tls"], smtp_settings["timeout"], size=max_workers
+    )
+    throttle = DomainThrottle(per_domain_concurrency, per_domain_rate)
+    retry_queue = get_persistent_cache("delivery_retry_queue", max_entries=200000)
+    started = time.perf_counter()
+    report = {
+        "issue_id": issue_id,
+        "subject": subject,
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "total": len(recipients),
+        "sent": 0,
+        "deferred": 0,
+        "failed": 0,
+        "per_domain": {},
+        "failures": [],
+    }
+    
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="smtp") as executor:
+            futures = [
+                executor.submit(_send_batch, pool, throttle, domain, batch, sender, subject, body_for, related)
+                for domain, batch in batches
+            ]
+            for future in futures:
+                for recipient, status, error in future.result():
+                    key = f"{issue_id}:{recipient['email'].lower()}"
+                    attempts = (retry_queue.get(key) or {}).get("attempts", 0) + 1
+                    if status == "deferred" and attempts >= MAX_DELIVERY_ATTEMPTS:
+                        status = "failed"
+                    
+                    if status == "deferred":
+                        retry_queue.set(key, {
+                            "issue_id": issue_id,
+                            "recipient": recipient,
+                            "subject": subject,
+                            "sender": sender,
+                            "attempts": attempts,
+                            "next_attempt": time.time() + RETRY_BASE_DELAY * 2 ** (attempts - 1),
+                            "last_error": error,
+                        })
+                    else:
+                        retry_queue.delete(key)
+                    
+                    report[status] += 1
+                    domain_stats = report["per_domain"].setdefault(recipient["email"].rpartition("@")[2].lower(), {"sent": 0, "deferred": 0, "failed": 0})
+                    domain_stats[status] += 1
+                    if status != "sent":
+                        report["failures"].append({"email": recipient["email"], "status": status, "error": error})
+    finally:
+        pool.close_all()
+        retry_queue.save()
+    
+    report["duration_seconds"] = round(time.perf_counter() - started, 2)
+    report["report_path"] = _save_delivery_report(report)
+    return report
+
+def process_retry_queue(smtp_settings=None, max_workers=8, **send_options):
+    """
+    재시도 시간이 된 일시적 실패 건을 뉴스레터별로 모아 다시 발송하고, 발송 보고서 목록을 반환합니다.
+    개인화하여 보낸 뉴스레터는 보관된 개인화 설정으로 수신자별 본문을 다시 만듭니다.
     """
-    return html_content
+    retry_queue = get_persistent_cache("delivery_retry_queue", max_entries=200000)
+    now = time.time()
+    groups = {}
+    for key, entry in retry_queue.items():
+        if entry["next_attempt"] <= now:
+            groups.setdefault((entry["issue_id"], entry["subject"], entry["sender"]), []).append(entry["recipient"])
+    
+    reports = []
+    for (issue_id, subject, sender), recipients in groups.items():
+        try:
+            html_content, personalization = _load_outbox(issue_id)
+        except (OSError, ValueError) as e:
+            print(f"재시도할 뉴스레터 본문을 찾을 수 없습니다 ({issue_id}): {str(e)}")
+            continue
+        reports.append(send_newsletter_bulk(
+            html_content, subject, recipients, sender, smtp_settings, max_workers, issue_id=issue_id,
+            personalization=personalization, **send_options
+        ))
+    return reports
 
-def create_download_link(html_content, filename):
-    """HTML 콘텐츠를 다운로드할 수 있는 링크를 생성합니다."""
-    b64 = base64.b64encode(html_content.encode()).decode()
-    href = f'<a href="data:text/html;base64,{b64}" download="{filename}" style="display: inline-block; margin-top: 20px; padding: 10px 20px; background-color: #ff5722; color: white; text-decoration: none; border-radius: 5px; font-weight: bold;">뉴스레터 다운로드</a>'
-    return href
+def render_run_plan(plan):
+    """실행 계획(plan_newsletter_run)을 표와 지표로 보여줍니다."""
+    st.subheader("실행 계획")
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("외부 호출", f"{plan['api_calls']}회", help=f"LLM 호출 {plan['llm_calls']}회 포함")
+    col2.metric("프롬프트 토큰", f"{plan['prompt_tokens']:,}", help=f"예상 응답 토큰 {plan['completion_tokens']:,}")
+    col3.metric("예상 비용", f"${plan['cost_usd']:.4f}")
+    col4.metric("예상 소요 시간", f"{plan['wall_seconds_p50']:.0f}초", help=f"p95 {plan['wall_seconds_p95']:.0f}초")
+    st.table([
+        {
+            "단계": call["stage"],
+            "대상": call["provider"],
+            "상태": call["status"],
+            "횟수": call["count"],
+            "모델": call.get("model", ""),
+            "프롬프트 토큰": call.get("prompt_tokens", ""),
+            "비용(USD)": call.get("cost_usd", ""),
+        }
+        for call in plan["calls"]
+    ])
+    if plan["recent_runs"]:
+        st.caption(f"최근 {plan['recent_runs']}회 실제 생성 소요 시간 중앙값: {plan['recent_run_seconds_p50']:.0f}초")
+    if plan["default_stages"]:
+        st.caption(f"기록이 없어 기본값으로 추정한 단계: {', '.join(plan['default_stages'])}")
+
+def render_circuit_breaker_status():
+    """사이드바에 제공자별 회로 차단기 상태를 표시합니다."""
+    state_labels = {"closed": "🟢 정상", "open": "🔴 차단", "half_open": "🟡 시험 중"}
+    with st.sidebar:
+        st.subheader("외부 API 상태")
+        for breaker in get_circuit_breakers().values():
+            snapshot = breaker.snapshot()
+            line = f"**{snapshot['name']}** {state_labels[snapshot['state']]} · 최근 실패율 {snapshot['failure_rate']:.0%} ({snapshot['calls']}회)"
+            if snapshot["state"] == "open":
+                line += f" · {snapshot['retry_after']}초 후 재시도"
+            st.markdown(line)
+            if snapshot["state"] != "closed" and snapshot["last_error"]:
+                st.caption(snapshot["last_error"])
+        st.caption("차단된 API는 호출하지 않고 마지막 정상 결과나 기본 콘텐츠를 사용합니다.")
+        if st.button("회로 차단기 초기화"):
+            for breaker in get_circuit_breakers().values():
+                breaker.reset()
+            st.rerun()
 
 def main():
     st.title("중부Infra AT/DT 뉴스레터 생성기")
     st.write("OpenAI, NewsAPI, 네이버 API를 활용하여 AI 디지털 트랜스포메이션 관련 뉴스레터를 자동으로 생성합니다.")
     
+    # 입력값은 폼으로 묶어 '뉴스레터 생성'을 누를 때만 스크립트가 다시 실행되도록 함
+    form = st.form("newsletter_form")
+    
     # API 키 입력
-    with st.expander("API 키 설정", expanded=True):
+    with form.expander("API 키 설정", expanded=True):
         st.info("모든 API의 키 정보를 입력하세요. 사용 가능한 API만 결과에 포함됩니다.")
         col1, col2 = st.columns(2)
         with col1:
@@ -1015,7 +4949,7 @@ def main():
             naver_client_secret = st.text_input("네이버 Client Secret 입력", type="password")
     
     # 뉴스레터 기본 설정
-    with st.expander("뉴스레터 기본 설정", expanded=True):
+    with form.expander("뉴스레터 기본 설정", expanded=True):
         issue_number = st.number_input("뉴스레터 호수", min_value=1, value=1, step=1)
         
         # 뉴스 검색 설정
@@ -1034,6 +4968,69 @@ def main():
         
         st.info("⚠️ 참고: NewsAPI 무료 플랜은 약 7일 이내의 최신 뉴스만 조회할 수 있습니다.")
         
+        editions = st.multiselect(
+            "발행 에디션 (언어)",
+            options=list(EDITION_LANGUAGES),
+            default=["ko"],
+            format_func=lambda x: EDITION_LANGUAGES[x]["name"],
+            help="선택한 언어별로 같은 호의 뉴스레터를 만듭니다. 기사 수집은 한 번만 하며, 에디션을 추가하면 해당 언어의 LLM 생성만 더 수행합니다."
+        )
+        
+        enabled_sections = st.multiselect(
+            "포함할 섹션",
+            options=list(NEWSLETTER_SECTIONS),
+            default=[name for name, spec in NEWSLETTER_SECTIONS.items() if spec["enabled"]],
+            format_func=lambda x: EDITION_LANGUAGES["ko"]["labels"][x],
+            help="선택한 섹션만 생성합니다. 빠진 섹션에 필요한 기사 검색과 LLM 호출은 수행하지 않습니다."
+        )
+        
+        main_news_mode = st.selectbox(
+            "주요 소식 생성 방식",
+            options=["top", "map_reduce"],
+            format_func=lambda x: {"top": "최신 기사 상위 5+3건", "map_reduce": "전체 기사 병렬 요약 후 선별 (map-reduce)"}[x],
+            help="map-reduce 방식은 수집된 모든 기사를 묶음별로 병렬 요약·평가한 뒤 중요도 상위 기사로 주요 소식을 작성합니다."
+        )
+        
+        use_ranking = st.checkbox(
+            "관련성 순위로 기사 선별",
+            value=True,
+            help="수집된 기사를 검색어와 뉴스레터 주제에 대한 관련성(BM25)으로 정렬하여 상위 기사만 LLM에 전달합니다. 끄면 최신순으로 선별합니다."
+        )
+        
+        use_translation_cache = st.checkbox(
+            "외국어 기사 번역 캐시 사용",
+            value=True,
+            help="외국어 기사의 제목과 설명을 묶어서 한 번에 번역하고 기사별로 저장합니다. 반복 등장하는 기사는 다시 번역하지 않습니다."
+        )
+        
+        evergreen_rows, evergreen_pending = get_evergreen_library().summary()
+        evergreen_available = ", ".join(f"{EDITION_LANGUAGES['ko']['labels'][row['section']]}({row['edition']}) {row['available']}개" for row in evergreen_rows)
+        use_evergreen_library = st.checkbox(
+            "사전 생성된 팁/성공 사례 사용",
+            value=True,
+            help="`newsletter_cli.py precompute-evergreen`으로 미리 만들어 검증을 통과한 AT/DT 팁과 성공 사례가 있으면 LLM 호출 없이 다음 미사용 항목을 씁니다. "
+                 f"남은 항목: {evergreen_available or '없음'}" + (f" (결과 대기 중인 작업 {evergreen_pending}개)" if evergreen_pending else "")
+        )
+        
+        enrich_articles = st.checkbox(
+            "기사 본문 보강",
+            value=False,
+            help="선택된 기사의 원문 페이지에서 본문을 동시에 추출하여 더 풍부한 내용으로 생성합니다. 추출 결과는 URL별로 캐시됩니다."
+        )
+        
+        use_thumbnails = st.checkbox(
+            "기사 썸네일 이미지",
+            value=True,
+            help="글로벌 뉴스와 네이버 뉴스 기사의 대표 이미지를 섹션 생성과 동시에 내려받아 작게 줄여 넣습니다. 줄인 이미지는 캐시되어 다음 생성에서 다시 내려받지 않습니다."
+        )
+        
+        profile_generation = st.checkbox(
+            "이번 실행 프로파일링",
+            value=False,
+            help="생성부터 내보내기 파일 작성까지 모든 스레드의 CPU 사용을 샘플링하고 메모리 할당을 추적하여, "
+                 "실행 ID별 플레임그래프/pstats/할당 스냅샷을 '실행 프로파일'에서 내려받을 수 있게 합니다. 측정 중에는 생성이 다소 느려집니다."
+        )
+        
         news_query_ko = st.text_input(
             "네이버 검색어 (한글)", 
             value="AI 인공지능 디지털 트랜스포메이션",
@@ -1041,22 +5038,20 @@ def main():
         )
     
     # 하이라이트 박스 설정
-    with st.expander("하이라이트 박스 설정"):
+    with form.expander("하이라이트 박스 설정"):
         highlight_title = st.text_input("하이라이트 제목", value="중부Infra AT/DT 뉴스레터 개시")
         highlight_subtitle = st.text_input("하이라이트 부제목", value="AI, 어떻게 시작할지 막막하다면?")
         highlight_link_text = st.text_input("링크 텍스트", value="AT/DT 추진방향 →")
         highlight_link_url = st.text_input("링크 URL", value="#")
     
-    # 성공 사례 사용자 입력 옵션
-    with st.expander("성공 사례 직접 입력"):
+    # 성공 사례 사용자 입력 옵션 (폼 안에서는 체크박스에 따라 입력란을 숨길 수 없으므로 항상 표시)
+    with form.expander("성공 사례 직접 입력"):
         use_custom_success = st.checkbox("성공 사례를 직접 입력하시겠습니까?")
         
-        custom_success_story = None
-        if use_custom_success:
-            st.write("아래에 성공 사례를 마크다운 형식으로 입력하세요. 한국 기업과 외국 기업 사례 각 1개씩 포함해주세요.")
-            st.write("각 사례는 3개의 단락으로 구성하고, 단락당 3-4줄로 작성해주세요.")
-            st.write("예시 형식:")
-            st.code("""
+        st.write("아래에 성공 사례를 마크다운 형식으로 입력하세요. 한국 기업과 외국 기업 사례 각 1개씩 포함해주세요.")
+        st.write("각 사례는 3개의 단락으로 구성하고, 단락당 3-4줄로 작성해주세요.")
+        st.write("예시 형식:")
+        st.code("""
 ## 삼성전자의 AI 혁신 사례
 
 첫 번째 단락 내용을 여기에 작성하세요. 3-4줄로 구성하세요.
@@ -1072,15 +5067,68 @@ def main():
 두 번째 단락 내용을 여기에 작성하세요. 3-4줄로 구성하세요.
 
 세 번째 단락 내용을 여기에 작성하세요. 3-4줄로 구성하세요.
-            """)
-            
-            custom_success_story = st.text_area("성공 사례 직접 입력", height=400)
+        """)
+        
+        custom_success_text = st.text_area("성공 사례 직접 입력", height=400)
+        custom_success_story = custom_success_text if use_custom_success and custom_success_text.strip() else None
+    
+    # 섹션별 모델 라우팅 설정
+    with form.expander("모델 라우팅 설정"):
+        st.write("섹션별로 사용할 모델 티어를 선택하세요. 정형화된 섹션은 빠른 모델로도 충분합니다.")
+        tier_options = list(MODEL_TIERS.keys())
+        section_tiers = {}
+        for section, default_tier in DEFAULT_ROUTING_POLICY["sections"].items():
+            section_tiers[section] = st.selectbox(
+                f"{section} 모델 티어",
+                options=tier_options,
+                index=tier_options.index(default_tier),
+                format_func=lambda x: f"{x} ({MODEL_TIERS[x]['model']})"
+            )
+        use_hedge = st.checkbox(
+            "지연 시 백업 요청(헤지) 사용",
+            value=DEFAULT_ROUTING_POLICY["hedge"],
+            help="주 요청이 지연 백분위수를 넘으면 백업 요청을 보내고 먼저 끝난 결과를 사용합니다."
+        )
+        hedge_percentile = st.slider("헤지 기준 백분위수", min_value=50, max_value=99, value=DEFAULT_ROUTING_POLICY["hedge_percentile"])
+        
+        latency_summary = get_latency_tracker().summary()
+        if latency_summary:
+            st.write("섹션/모델별 응답 지연 시간 (초) - 요청별 p50/p95, 사용자 체감(observed) p50/p95, 헤지 발송 비율")
+            st.table(latency_summary)
+    
+    routing_policy = dict(DEFAULT_ROUTING_POLICY, sections=section_tiers, hedge=use_hedge, hedge_percentile=hedge_percentile)
+    
+    # 하이라이트 설정 딕셔너리 생성
+    highlight_settings = {
+        "title": highlight_title,
+        "subtitle": highlight_subtitle,
+        "link_text": highlight_link_text,
+        "link_url": highlight_link_url
+    }
+    run_args = (
+        openai_api_key, news_api_key, naver_client_id, naver_client_secret, news_query_en, news_query_ko,
+        language, custom_success_story, issue_number, highlight_settings, routing_policy, enrich_articles,
+        main_news_mode, use_ranking
+    )
+    run_kwargs = {
+        "use_translation_cache": use_translation_cache,
+        "editions": editions or ["ko"],
+        "sections": enabled_sections,
+        "use_evergreen_library": use_evergreen_library,
+        "use_thumbnails": use_thumbnails,
+    }
+    
+    # 실행 계획 미리보기: 생성하지 않고 호출 목록, 토큰/비용, 예상 소요 시간만 표시
+    generate_clicked = form.form_submit_button("뉴스레터 생성")
+    if form.form_submit_button("실행 계획 미리보기"):
+        render_run_plan(plan_newsletter_run(*run_args, merge_slots=True, **run_kwargs))
     
     # 뉴스레터 생성 버튼
-    if st.button("뉴스레터 생성"):
+    if generate_clicked:
         # 필요한 API 키 확인
         if not openai_api_key and (not naver_client_id or not naver_client_secret):
             st.error("최소한 OpenAI API 키 또는 네이버 API 키(Client ID + Client Secret) 중 하나는 입력해야 합니다.")
+            render_circuit_breaker_status()
             return
         
         if not openai_api_key:
@@ -1092,37 +5140,199 @@ def main():
         if not naver_client_id or not naver_client_secret:
             st.warning("네이버 API 키가 제공되지 않아 국내 뉴스 검색 기능이 제한됩니다.")
         
-        with st.spinner("뉴스레터 생성 중... (약 1-2분 소요될 수 있습니다)"):
+        # 최근 실행 소요 시간 기록(중앙값)으로 예상 시간 안내 - 기록이 없으면 일반 안내
+        predicted = get_stage_history().percentile("run:total", 50)
+        if predicted is not None:
+            spinner_text = f"뉴스레터 생성 중... (예상 소요 시간 약 {predicted:.0f}초)"
+        else:
+            spinner_text = "뉴스레터 생성 중... (약 1-2분 소요될 수 있습니다)"
+        
+        run_id = new_run_id()
+        with st.spinner(spinner_text):
             try:
-                # 하이라이트 설정 딕셔너리 생성
-                highlight_settings = {
-                    "title": highlight_title,
-                    "subtitle": highlight_subtitle,
-                    "link_text": highlight_link_text,
-                    "link_url": highlight_link_url
-                }
-                
-                # 사용 가능한 API로 뉴스레터 생성
-                html_content = generate_combined_newsletter(
-                    openai_api_key,
-                    news_api_key,
-                    naver_client_id,
-                    naver_client_secret,
-                    news_query_en,
-                    news_query_ko,
-                    language,
-                    custom_success_story,
-                    issue_number,
-                    highlight_settings
-                )
+                with profile_run(run_id, enabled=profile_generation) as profiler:
+                    # 사용 가능한 API로 뉴스레터 생성 (기사 수집은 한 번, 에디션별 생성은 병렬)
+                    issues = generate_newsletter_editions(*run_args, merge_slots=True, **run_kwargs)
                 
-                filename = f"중부 ATDT Weekly-제{issue_number}호.html"
+                    # 발송 등 이후 동작에서도 사용할 수 있도록 세션에 보관
+                    st.session_state["generated_editions"] = issues
+                    st.session_state["generated_newsletter"] = next(iter(issues.values()))
                 
+                    # 내보내기용 버전 저장 (압축 후 세션 용량 한도 내에서 보관)
+                    settings = {
+                        "news_query_en": news_query_en,
+                        "news_query_ko": news_query_ko,
+                        "language": language,
+                        "main_news_mode": main_news_mode,
+                        "use_ranking": use_ranking,
+                        "enrich_articles": enrich_articles,
+                        "use_translation_cache": use_translation_cache,
+                        "use_evergreen_library": use_evergreen_library,
+                        "use_thumbnails": use_thumbnails,
+                        "sections": enabled_sections,
+                        "routing_policy": routing_policy,
+                        "run_id": run_id,
+                    }
+                    for edition, issue in issues.items():
+                        # 템플릿이 바뀌어도 다시 렌더링할 수 있도록 섹션 원본 보관
+                        try:
+                            archive_issue(issue, dict(settings, edition=edition))
+                        except OSError as e:
+                            print(f"아카이브 저장 오류: {str(e)}")
+                        version_key = f"{issue_number}-{edition}-{datetime.now().strftime('%H%M%S%f')}"
+                        edition_label = f" {EDITION_LANGUAGES[edition]['name']}" if len(issues) > 1 else ""
+                        get_artifact_store().add(
+                            version_key,
+                            f"제{issue_number}호{edition_label} ({datetime.now().strftime('%H:%M:%S')})",
+                            build_issue_artifacts(issue, dict(settings, edition=edition))
+                        )
                 st.success("✅ 뉴스레터가 성공적으로 생성되었습니다!")
-                st.markdown(create_download_link(html_content, filename), unsafe_allow_html=True)
+                if profiler is not None and profiler.summary:
+                    st.info(f"실행 {run_id}의 프로파일이 저장되었습니다. 아래 '실행 프로파일'에서 내려받을 수 있습니다.")
                 
             except Exception as e:
                 st.error(f"오류가 발생했습니다: {e}")
+    
+    # 이번 생성 결과가 반영된 차단기 상태 표시
+    render_circuit_breaker_status()
+    render_export_panel()
+    render_profile_panel()
+    
+    generated = st.session_state.get("generated_newsletter")
+    generated_editions = st.session_state.get("generated_editions") or {}
+    if len(generated_editions) > 1:
+        delivery_edition = st.selectbox(
+            "발송할 에디션",
+            options=list(generated_editions),
+            format_func=lambda x: EDITION_LANGUAGES[x]["name"]
+        )
+        generated = generated_editions[delivery_edition]
+    if generated:
+        render_delivery_panel(generated)
+
+@st.fragment
+def render_delivery_panel(generated):
+    """생성된 뉴스레터를 구독자 목록에 발송하는 화면을 표시합니다. 입력값은 발송 버튼을 누를 때만 반영됩니다."""
+    with st.expander("뉴스레터 발송"), st.form("delivery_form"):
+        col1, col2 = st.columns(2)
+        with col1:
+            smtp_host = st.text_input("SMTP 서버", value=DEFAULT_SMTP_SETTINGS["host"])
+            smtp_port = st.number_input("SMTP 포트", min_value=1, max_value=65535, value=DEFAULT_SMTP_SETTINGS["port"])
+            smtp_use_tls = st.checkbox("STARTTLS 사용", value=DEFAULT_SMTP_SETTINGS["use_tls"])
+        with col2:
+            smtp_username = st.text_input("SMTP 사용자", value=DEFAULT_SMTP_SETTINGS["username"])
+            smtp_password = st.text_input("SMTP 비밀번호", type="password")
+            sender = st.text_input("보내는 사람", value="AIDT Weekly <newsletter@example.com>")
+        
+        subject = st.text_input("메일 제목", value=f"중부Infra AT/DT Weekly 제{generated['issue_number']}호")
+        recipients_text = st.text_area(
+            "구독자 목록",
+            height=150,
+            help="한 줄에 한 명씩 '이메일,이름,팀' 형식(CSV)으로 입력하세요. 이름과 팀은 생략할 수 있습니다."
+        )
+        uploaded = st.file_uploader("또는 구독자 CSV 업로드", type=["csv", "txt"])
+        if uploaded is not None:
+            recipients_text += "\n" + uploaded.getvalue().decode("utf-8", errors="replace")
+        
+        inline_css = st.checkbox("이메일 클라이언트용 CSS 인라인", value=True, help="Gmail 등 <style>을 무시하는 클라이언트에서도 서식이 유지되도록 스타일을 각 요소에 적용합니다.")
+        compact = st.checkbox(
+            "발송 HTML 축약",
+            value=True,
+            help="공백을 줄이고 포함된 섹션에 쓰이지 않는 CSS 규칙을 지웁니다. CSS 인라인을 끄면 반복되는 인라인 스타일도 클래스로 바꿉니다."
+        )
+        budget_kb = st.number_input(
+            "본문 크기 예산 (KB)",
+            min_value=0,
+            value=EMAIL_BYTE_BUDGET // 1024,
+            help="Gmail은 약 102KB를 넘는 메일을 잘라서 표시합니다. 넘으면 섹션별 크기를 보여주고 발송하지 않습니다 (0이면 검사 안 함)."
+        )
+        allow_over_budget = st.checkbox("예산을 넘어도 발송", value=False)
+        thumbnail_mode = st.radio(
+            "기사 썸네일",
+            options=["inline", "cid", "none"],
+            format_func=lambda x: {"inline": "본문에 포함 (예산 안에서)", "cid": "이미지 첨부 (CID)", "none": "넣지 않음"}[x],
+            horizontal=True,
+            help="본문에 포함하면 크기 예산을 넘지 않는 만큼만 넣습니다. Gmail 등 본문 포함 이미지를 표시하지 않는 클라이언트에는 첨부 방식이 적합합니다."
+        )
+        personalize = st.checkbox("수신자별 개인화 (이름 인사말, 팀별 하이라이트)", value=False)
+        team_highlights_text = st.text_area(
+            "팀별 하이라이트 (개인화 사용 시)",
+            height=100,
+            help="한 줄에 한 팀씩 '팀,제목,내용[,링크 URL]' 형식으로 입력하세요. 구독자 목록의 팀 이름과 일치해야 합니다."
+        )
+        
+        smtp_settings = {
+            "host": smtp_host,
+            "port": int(smtp_port),
+            "username": smtp_username,
+            "password": smtp_password,
+            "use_tls": smtp_use_tls,
+        }
+        
+        col_send, col_retry = st.columns(2)
+        with col_send:
+            send_clicked = st.form_submit_button("발송")
+        with col_retry:
+            retry_clicked = st.form_submit_button("재시도 대기열 처리")
+        
+        if send_clicked:
+            recipients = parse_recipients(recipients_text)
+            if not recipients:
+                st.error("발송할 수신자가 없습니다.")
+                return
+            with st.spinner(f"{len(recipients)}명에게 발송 중..."):
+                try:
+                    render_args = (generated["sections"], generated["issue_number"], generated["date"], generated["highlight_settings"])
+                    if compact:
+                        base_html, size_report = render_compact_issue(
+                            *render_args, merge_slots=True, edition=generated.get("edition", "ko"),
+                            inline_styles=inline_css, budget_bytes=int(budget_kb) * 1024, thumbnails=thumbnail_mode
+                        )
+                    elif inline_css:
+                        base_html = generate_email_html(*render_args, merge_slots=True, edition=generated.get("edition", "ko"), thumbnails=thumbnail_mode)
+                    else:
+                        base_html = generate_combined_html_template(*render_args, merge_slots=True, edition=generated.get("edition", "ko"), thumbnails=thumbnail_mode)
+                    if not compact:
+                        total_bytes = len(base_html.encode("utf-8"))
+                        size_report = {"total_bytes": total_bytes, "budget_bytes": int(budget_kb) * 1024,
+                                       "over_budget": bool(budget_kb) and total_bytes > int(budget_kb) * 1024}
+                    st.caption(f"본문 크기: {size_report['total_bytes'] / 1024:.1f}KB" + (f" (축약 전 {size_report['original_bytes'] / 1024:.1f}KB)" if compact else ""))
+                    thumbnail_counts = size_report.get("thumbnails")
+                    if thumbnail_counts and any(thumbnail_counts.values()):
+                        st.caption(
+                            f"썸네일: 본문 포함 {thumbnail_counts['inlined']}개 ({size_report['thumbnail_bytes'] / 1024:.1f}KB), "
+                            f"첨부 {thumbnail_counts['attached']}개, 제외 {thumbnail_counts['dropped']}개"
+                        )
+                    if size_report["over_budget"]:
+                        st.error(f"본문 크기 {size_report['total_bytes'] / 1024:.1f}KB가 예산 {budget_kb}KB를 넘습니다. 섹션별 크기를 확인하세요.")
+                        if "section_bytes" in size_report:
+                            st.table([{"섹션": name, "KB": round(size / 1024, 1)} for name, size in size_report["section_bytes"].items()])
+                        if not allow_over_budget:
+                            return
+                    personalization = None
+                    if personalize:
+                        personalization = {
+                            "template": base_html,
+                            "team_highlights": parse_team_highlights(team_highlights_text),
+                            "inline_styles": inline_css,
+                        }
+                    report = send_newsletter_bulk(
+                        strip_merge_slots(base_html), subject, recipients, sender, smtp_settings,
+                        personalization=personalization
+                    )
+                except Exception as e:
+                    st.error(f"발송 중 오류가 발생했습니다: {e}")
+                    return
+            st.success(f"발송 완료: 성공 {report['sent']}건, 재시도 대기 {report['deferred']}건, 실패 {report['failed']}건 ({report['duration_seconds']}초)")
+            st.json(report)
+        
+        if retry_clicked:
+            with st.spinner("재시도 대기열 처리 중..."):
+                reports = process_retry_queue(smtp_settings)
+            if not reports:
+                st.info("재시도할 발송 건이 없습니다.")
+            for report in reports:
+                st.json(report)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
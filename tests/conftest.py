@@ -0,0 +1,75 @@
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# streamlit_app은 가져올 때 데이터 디렉터리를 정하므로 가져오기 전에 임시 디렉터리로 지정
+os.environ["NEWSLETTER_DATA_DIR"] = tempfile.mkdtemp(prefix="newsletter-test-")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class _StaticHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests[self.path] = server.requests.get(self.path, 0) + 1
+        if self.path not in server.pages:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        content_type, body = server.pages[self.path]
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class StaticServer(ThreadingHTTPServer):
+    """경로별로 정해진 (Content-Type, 바이트)를 돌려주고 요청 횟수를 세는 테스트용 정적 파일 서버"""
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _StaticHandler)
+        self.pages = {}
+        self.requests = {}
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def handle_error(self, request, client_address):
+        # 클라이언트가 다운로드를 중간에 끊는 경우(본문 추출의 조기 종료)는 정상 동작
+        pass
+
+
+@pytest.fixture
+def static_server():
+    server = StaticServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def stub_backend():
+    """지연 없이 응답하는 대체 백엔드 (NewsAPI, 네이버, OpenAI, 기사 페이지와 이미지)"""
+    from newsletter_cli import StubBackendServer
+    server = StubBackendServer(port=0, newsapi_latency=0, naver_latency=0, openai_latency=0, jitter=0, image_latency=0).start()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,73 @@
+import streamlit_app as app
+from newsletter_cli import StubBackendServer
+
+PARAGRAPH = "통신 분야 AI 도입 사례와 성과를 설명하는 기사 본문 문단입니다. 충분히 긴 문장으로 채웁니다."
+
+
+def page(paragraphs, head=""):
+    return f"<html><head>{head}</head><body><nav><p>메뉴</p></nav><article>{paragraphs}</article></body></html>"
+
+
+def test_extracts_paragraphs(static_server):
+    body = page(f"<p>{PARAGRAPH} 첫째</p><p>짧음</p><p>{PARAGRAPH} 둘째</p>")
+    static_server.pages["/a"] = ("text/html; charset=utf-8", body.encode("utf-8"))
+    text = app.extract_article_body(static_server.url + "/a")
+    assert text.splitlines() == [f"{PARAGRAPH} 첫째", f"{PARAGRAPH} 둘째"]
+
+
+def test_stops_at_max_chars(static_server):
+    body = page("".join(f"<p>{PARAGRAPH} {i}</p>" for i in range(200)))
+    static_server.pages["/long"] = ("text/html", body.encode("utf-8"))
+    text = app.extract_article_body(static_server.url + "/long", max_chars=300)
+    assert 0 < len(text) <= 300
+
+
+def test_stops_at_max_bytes(static_server):
+    padding = "<div>" + "x" * 100_000 + "</div>"
+    body = page(f"<p>{PARAGRAPH} 앞</p>{padding}<p>{PARAGRAPH} 뒤</p>")
+    static_server.pages["/big"] = ("text/html", body.encode("utf-8"))
+    text = app.extract_article_body(static_server.url + "/big", max_bytes=16 * 1024)
+    assert "앞" in text
+    assert "뒤" not in text
+
+
+def test_non_html_content_type(static_server):
+    static_server.pages["/file.pdf"] = ("application/pdf", b"%PDF-1.4 " + PARAGRAPH.encode("utf-8"))
+    assert app.extract_article_body(static_server.url + "/file.pdf") == ""
+
+
+def test_charset_from_header_and_meta(static_server):
+    body = page(f"<p>{PARAGRAPH}</p>")
+    static_server.pages["/header"] = ("text/html; charset=euc-kr", body.encode("euc-kr"))
+    static_server.pages["/meta"] = ("text/html", page(f"<p>{PARAGRAPH}</p>", '<meta charset="euc-kr">').encode("euc-kr"))
+    assert app.extract_article_body(static_server.url + "/header") == PARAGRAPH
+    assert app.extract_article_body(static_server.url + "/meta") == PARAGRAPH
+
+
+def test_multibyte_character_split_across_chunks(static_server):
+    # 16KB 청크 경계에 문단의 첫 한글 글자가 걸치도록 배치
+    prefix = page("")[:-len("</article></body></html>")]
+    filler = "<div>" + "x" * (16 * 1024 - len(prefix.encode("utf-8")) - len("<div></div><p>") - 1) + "</div><p>"
+    body = (prefix + filler + PARAGRAPH + "</p></article></body></html>").encode("utf-8")
+    static_server.pages["/split"] = ("text/html; charset=utf-8", body)
+    assert app.extract_article_body(static_server.url + "/split") == PARAGRAPH
+
+
+def test_bodies_are_cached_but_empty_results_are_not(static_server):
+    static_server.pages["/cached"] = ("text/html", page(f"<p>{PARAGRAPH}</p>").encode("utf-8"))
+    static_server.pages["/empty"] = ("text/html", page("").encode("utf-8"))
+    urls = [static_server.url + "/cached", static_server.url + "/empty"]
+    assert app.fetch_article_bodies(urls) == {urls[0]: PARAGRAPH, urls[1]: ""}
+    assert app.fetch_article_bodies(urls) == {urls[0]: PARAGRAPH, urls[1]: ""}
+    assert static_server.requests == {"/cached": 1, "/empty": 2}
+
+
+def test_stub_backend_article_page():
+    server = StubBackendServer("127.0.0.1", 0, 0, 0, 0, jitter=0, image_latency=0).start()
+    try:
+        text = app.extract_article_body(f"{server.url}/articles/12/3")
+        assert text.startswith("스텁 기사 3의 본문 1번째 문단입니다.")
+        assert len(text.splitlines()) == 5
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,104 @@
+import pytest
+
+import streamlit_app as app
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """time.monotonic 대신 쓰는 수동 시계 (now[0]을 바꿔 시간을 진행)"""
+    now = [1000.0]
+    monkeypatch.setattr(app.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def newsapi_breaker():
+    breaker = app.get_circuit_breaker("newsapi")
+    breaker.reset()
+    yield breaker
+    breaker.reset()
+
+
+def test_opens_only_after_minimum_calls_and_failure_rate(clock):
+    breaker = app.CircuitBreaker("test", failure_rate=0.5, minimum_calls=4, window_size=10, cooldown=60)
+    for _ in range(3):
+        breaker.record_failure(RuntimeError("500"))
+    # 최소 호출 수 전에는 모두 실패해도 차단하지 않음
+    assert breaker.state == "closed" and breaker.allow()
+
+    breaker.record_success()
+    breaker.record_failure(RuntimeError("500"))
+    assert breaker.state == "open"
+    assert breaker.open_count == 1
+    assert not breaker.allow()
+    assert breaker.retry_after() == 60
+
+    clock[0] += 30
+    assert not breaker.allow()
+    assert breaker.snapshot()["retry_after"] == 30
+
+
+def test_half_open_allows_one_trial_then_closes_or_reopens(clock):
+    breaker = app.CircuitBreaker("test", failure_rate=0.5, minimum_calls=2, window_size=10, cooldown=60)
+    breaker.record_failure(RuntimeError("500"))
+    breaker.record_failure(RuntimeError("500"))
+    assert breaker.state == "open"
+
+    # cooldown이 지나면 시험 호출 하나만 허용하고, 실패하면 다시 차단
+    clock[0] += 60
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+    assert not breaker.allow()
+    breaker.record_failure(RuntimeError("timeout"))
+    assert breaker.state == "open"
+    assert breaker.open_count == 2
+    assert breaker.last_error == "timeout"
+
+    # 시험 호출이 성공하면 기록을 비우고 정상으로 복귀
+    clock[0] += 60
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.snapshot()["calls"] == 0
+    assert breaker.allow() and breaker.allow()
+
+
+def test_news_api_needs_as_many_calls_as_openai_before_opening():
+    settings = app.CIRCUIT_BREAKER_SETTINGS
+    assert settings["newsapi"]["minimum_calls"] >= settings["openai"]["minimum_calls"]
+
+
+def test_open_circuit_falls_back_to_last_good_result(newsapi_breaker):
+    ctx = app.SectionContext()
+    calls = []
+
+    def fetch():
+        with app.circuit_guard("newsapi"):
+            calls.append(1)
+            return ["기사"]
+
+    assert app.call_with_last_good(ctx, "newsapi", "breaker-test", fetch) == ["기사"]
+    for _ in range(4):
+        newsapi_breaker.record_failure(RuntimeError("500"))
+    assert newsapi_breaker.state == "open"
+
+    assert app.call_with_last_good(ctx, "newsapi", "breaker-test", fetch) == ["기사"]
+    assert len(calls) == 1
+    assert "대신 사용합니다" in ctx.errors[0]
+    # 마지막 정상 결과가 없으면 차단 오류를 그대로 전달하여 기본 콘텐츠로 대체
+    with pytest.raises(app.CircuitOpenError):
+        app.call_with_last_good(ctx, "newsapi", "breaker-test-missing", fetch)
+
+
+def test_last_good_results_are_written_once_per_run(monkeypatch):
+    writes = []
+    monkeypatch.setattr(app, "_write_atomic", lambda path, data: writes.append(path))
+    ctx = app.SectionContext()
+    for key in ("a", "b", "c"):
+        app.call_with_last_good(ctx, "naver", f"write-once-{key}", lambda: [key])
+    assert writes == []
+
+    app.save_last_good_results()
+    assert len(writes) == 1
+    app.save_last_good_results()
+    assert len(writes) == 1
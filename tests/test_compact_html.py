@@ -0,0 +1,100 @@
+import re
+
+import streamlit_app as app
+from newsletter_cli import build_sample_issue
+
+
+def test_collapse_whitespace_keeps_placeholders_and_preformatted_text():
+    markup = """
+    <div>
+      <!-- 지울 주석 --><!--MERGE:greeting-->
+      <p>첫    줄
+         이어서</p>
+      <pre><code>def f():
+    return 1</code></pre>
+      <textarea>  그대로  <!-- 글자 --></textarea>
+      <div style="white-space: pre-wrap">  <div>안쪽</div>  끝  </div>
+      <p>다음   문단</p>
+    </div>
+    """
+    assert app.collapse_whitespace(markup) == (
+        "<div><!--MERGE:greeting--><p>첫 줄 이어서</p>"
+        "<pre><code>def f():\n    return 1</code></pre> "
+        "<textarea>  그대로  <!-- 글자 --></textarea> "
+        '<div style="white-space: pre-wrap">  <div>안쪽</div>  끝  </div>'
+        "<p>다음 문단</p></div>"
+    )
+
+
+def test_preserved_classes_come_from_the_stylesheet():
+    document = """<html><head><style>
+      /* 코드 블록 */
+      .code, p.poem { white-space: pre; }
+      .note { color: gray; }
+    </style></head><body>
+      <span class="code">  a   b  </span> <p class="poem">  가
+      나  </p> <span class="note">  c   d  </span>
+    </body></html>"""
+    assert app._preserved_classes(document) == {"code", "poem"}
+    compacted = app.collapse_whitespace(document)
+    assert '<span class="code">  a   b  </span>' in compacted
+    assert '<p class="poem">  가\n      나  </p>' in compacted
+    assert '<span class="note"> c d </span>' in compacted
+    assert "<style>.code,p.poem{white-space:pre}.note{color:gray}</style>" in compacted
+    # 섹션 조각처럼 <style>이 없으면 골격에서 찾은 클래스를 넘겨받음
+    assert app.collapse_whitespace('<span class="code">  x  </span>', {"code"}) == '<span class="code">  x  </span>'
+
+
+def test_repeated_inline_styles_become_important_classes():
+    document = (
+        "<html><head><style>p { margin: 0; }</style></head><body>"
+        '<p style="color: red;  font-weight: bold">가</p>'
+        '<p class="lead" style="color: red; font-weight: bold;">나</p>'
+        '<p style="color: blue">다</p>'
+        "</body></html>"
+    )
+    compacted = app.compact_html(document)
+    assert '<p class="cs1">가</p>' in compacted
+    assert '<p class="lead cs1">나</p>' in compacted
+    # 한 번만 나오는 style은 그대로 둠
+    assert '<p style="color: blue">다</p>' in compacted
+    assert ".cs1{color:red!important;font-weight:bold!important}" in compacted
+
+    assert app.compact_html(document, dedupe_styles=False).count('style="color: red') == 2
+
+
+def test_prune_unused_css_keeps_only_rules_for_used_tags_and_classes():
+    css = app.minify_css("""
+        h2, blockquote { color: navy; }
+        .used a:hover { color: red; }
+        .unused p { margin: 0; }
+        table td, input[type=text] { padding: 0; }
+    """)
+    markup = '<div class="used"><h2>제목</h2><a href="#">링크</a></div><input type="text">'
+    assert app.prune_unused_css(css, markup) == "h2{color:navy}.used a:hover{color:red}input[type=text]{padding:0}"
+    # @규칙이 있으면 안전하게 그대로 둠
+    media = "@media (max-width:600px){.unused{display:none}}"
+    assert app.prune_unused_css(media, markup) == media
+
+
+def test_compact_issue_report_and_budget():
+    sections, highlight_settings, date, _ = build_sample_issue()
+    document, report = app.render_compact_issue(sections, 1, date, highlight_settings, merge_slots=True)
+
+    assert report["total_bytes"] == len(document.encode("utf-8"))
+    assert report["total_bytes"] < report["original_bytes"]
+    assert set(report["section_bytes"]) == set(sections)
+    assert report["skeleton_bytes"] + sum(report["section_bytes"].values()) == report["total_bytes"]
+    assert report["style_classes"] > 0
+    assert report["budget_bytes"] == app.EMAIL_BYTE_BUDGET and not report["over_budget"]
+    assert "<!--INLINE:" not in document and "<!--MERGE:" in document
+    # 골격에서 쓰지 않는 스타일 규칙은 빠짐
+    assert len(re.search(r"<style[^>]*>(.*?)</style>", document, re.DOTALL).group(1)) < len(app.minify_css(app.NEWSLETTER_CSS))
+
+    _, small = app.render_compact_issue(sections, 1, date, highlight_settings, budget_bytes=1024)
+    assert small["over_budget"] and small["budget_bytes"] == 1024
+    _, unlimited = app.render_compact_issue(sections, 1, date, highlight_settings, budget_bytes=None)
+    assert not unlimited["over_budget"]
+
+    _, inlined = app.render_compact_issue(sections, 1, date, highlight_settings, inline_styles=True)
+    assert inlined["style_classes"] == 0
@@ -0,0 +1,77 @@
+import re
+
+import streamlit_app as app
+from newsletter_cli import build_sample_issue
+
+CSS = """
+p.note { color: green; }
+p { color: red; margin: 4px; }
+.note { color: blue; font-weight: bold; }
+.box p { margin: 0; }
+.box .inner p { padding: 2px; }
+h2 { color: navy; }
+h2 { color: teal; }
+"""
+
+
+def styles(markup):
+    """출력 HTML의 style 속성을 순서대로 {속성: 값} 목록으로 반환합니다."""
+    return [
+        dict(part.split(": ", 1) for part in style.split("; "))
+        for style in re.findall(r'style="([^"]*)"', markup)
+    ]
+
+
+def test_specificity_then_source_order():
+    inliner = app.CssInliner(CSS)
+    html_content, _ = inliner.inline('<h2>제목</h2><p>본문</p><p class="note">참고</p><span class="note">표시</span>')
+    h2, p, note, span = styles(html_content)
+    # 같은 명시도는 나중 규칙, 다르면 명시도가 높은 규칙이 우선 (선언 순서와 무관)
+    assert h2 == {"color": "teal"}
+    assert p == {"color": "red", "margin": "4px"}
+    assert note == {"color": "green", "margin": "4px", "font-weight": "bold"}
+    assert span == {"color": "blue", "font-weight": "bold"}
+
+
+def test_descendant_selectors_use_ancestors():
+    inliner = app.CssInliner(CSS)
+    html_content, _ = inliner.inline(
+        '<p>밖</p><div class="box"><section><p>안</p></section><div class="inner"><p>깊은 곳</p></div></div><p>다시 밖</p>'
+    )
+    outside, inside, deep, outside_again = styles(html_content)
+    assert outside == outside_again == {"color": "red", "margin": "4px"}
+    assert inside == {"color": "red", "margin": "0"}
+    assert deep == {"color": "red", "margin": "0", "padding": "2px"}
+
+
+def test_existing_style_attribute_wins():
+    inliner = app.CssInliner(CSS)
+    html_content, _ = inliner.inline('<p class="note" style="color: black; line-height: 1.5">참고</p>')
+    assert styles(html_content) == [{"margin": "4px", "font-weight": "bold", "color": "black", "line-height": "1.5"}]
+
+
+def test_placeholder_context_and_fragment_cache(monkeypatch):
+    inliner = app.CssInliner(CSS)
+    skeleton, contexts = inliner.inline('<div class="box"><!--INLINE:main--></div><!--INLINE:footer-->')
+    assert "<!--INLINE:main-->" in skeleton
+    assert contexts == {"main": (("div", frozenset({"box"})),), "footer": ()}
+
+    calls = []
+    original = inliner.inline
+    monkeypatch.setattr(inliner, "inline", lambda markup, context=(): calls.append(context) or original(markup, context))
+
+    fragment = "<p>섹션</p>"
+    inside = inliner.inline_fragment(fragment, contexts["main"])
+    assert styles(inside) == [{"color": "red", "margin": "0"}]
+    # 같은 내용과 위치는 캐시 사용, 위치가 다르면 따로 계산
+    assert inliner.inline_fragment(fragment, contexts["main"]) == inside
+    outside = inliner.inline_fragment(fragment, contexts["footer"])
+    assert styles(outside) == [{"color": "red", "margin": "4px"}]
+    assert calls == [contexts["main"], ()]
+
+
+def test_email_html_inlines_newsletter_styles():
+    sections, highlight_settings, date, _ = build_sample_issue()
+    email_html = app.generate_email_html(sections, 1, date, highlight_settings)
+    assert "<!--INLINE:" not in email_html
+    assert email_html.count('style="') > 20
@@ -0,0 +1,140 @@
+import email
+import os
+import smtplib
+from email.utils import parseaddr
+
+import pytest
+
+import streamlit_app as app
+from newsletter_cli import LocalDebugSMTPServer, build_sample_issue
+
+TEAM_HIGHLIGHTS = {"인프라": {"title": "인프라팀 이번 주 소식", "body": "장애 보고서 요약 자동화를 시작했습니다.", "link_url": ""}}
+
+
+@pytest.fixture
+def smtp_server(tmp_path):
+    server = LocalDebugSMTPServer(
+        "127.0.0.1", 0, str(tmp_path / "maildir"),
+        tempfail_domains=["later.test"], reject_domains=["rejected.test"]
+    ).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def received_bodies(server):
+    """받은 메시지를 {수신자: HTML 본문}으로 반환합니다."""
+    bodies = {}
+    for name in sorted(os.listdir(server.maildir)):
+        with open(os.path.join(server.maildir, name), "rb") as f:
+            message = email.message_from_bytes(f.read())
+        part = next(part for part in message.walk() if part.get_content_type() == "text/html")
+        bodies[parseaddr(message["To"])[1]] = part.get_payload(decode=True).decode("utf-8")
+    return bodies
+
+
+def send(server, recipients, **kwargs):
+    _, _, _, template = build_sample_issue(merge_slots=True)
+    return app.send_newsletter_bulk(
+        app.strip_merge_slots(template), "AIDT Weekly 테스트", recipients, "AIDT Weekly <news@example.com>",
+        {"host": "127.0.0.1", "port": server.server_address[1]}, max_workers=2, per_domain_rate=0,
+        personalization={"template": template, "team_highlights": TEAM_HIGHLIGHTS, "inline_styles": False}, **kwargs
+    )
+
+
+def test_delivered_rejected_and_deferred(smtp_server):
+    recipients = app.parse_recipients(
+        "ok1@example.com,홍길동,인프라\nok2@example.com\nnobody@rejected.test,거부\nsoon@later.test,김철수,인프라"
+    )
+    report = send(smtp_server, recipients)
+
+    assert (report["total"], report["sent"], report["failed"], report["deferred"]) == (4, 2, 1, 1)
+    assert {failure["email"]: failure["status"] for failure in report["failures"]} == {
+        "nobody@rejected.test": "failed", "soon@later.test": "deferred",
+    }
+    assert report["per_domain"]["example.com"] == {"sent": 2, "deferred": 0, "failed": 0}
+    assert smtp_server.recipient_count == 2
+
+    retry_queue = app.get_persistent_cache("delivery_retry_queue", max_entries=200000)
+    entry = retry_queue.get(f"{report['issue_id']}:soon@later.test")
+    assert entry["attempts"] == 1
+    assert entry["recipient"] == {"email": "soon@later.test", "name": "김철수", "team": "인프라"}
+    assert retry_queue.get(f"{report['issue_id']}:nobody@rejected.test") is None
+
+
+def test_personalized_bodies(smtp_server):
+    send(smtp_server, app.parse_recipients("ok1@example.com,홍길동,인프라\nok2@example.com"))
+    bodies = received_bodies(smtp_server)
+
+    assert '<p class="greeting">홍길동님, 안녕하세요.</p>' in bodies["ok1@example.com"]
+    assert "인프라팀 이번 주 소식" in bodies["ok1@example.com"]
+    assert "님, 안녕하세요." not in bodies["ok2@example.com"]
+    assert "인프라팀 이번 주 소식" not in bodies["ok2@example.com"]
+
+
+def test_retry_keeps_personalization(smtp_server):
+    report = send(smtp_server, app.parse_recipients("soon@later.test,김철수,인프라"))
+    assert report["deferred"] == 1
+
+    # 재시도 시간이 된 것으로 만들고 수신 도메인의 일시적 장애를 해소
+    retry_queue = app.get_persistent_cache("delivery_retry_queue", max_entries=200000)
+    key = f"{report['issue_id']}:soon@later.test"
+    retry_queue.set(key, dict(retry_queue.get(key), next_attempt=0))
+    smtp_server.tempfail_domains.clear()
+
+    reports = app.process_retry_queue({"host": "127.0.0.1", "port": smtp_server.server_address[1]}, per_domain_rate=0)
+    assert [(r["issue_id"], r["sent"]) for r in reports] == [(report["issue_id"], 1)]
+    assert retry_queue.get(key) is None
+    body = received_bodies(smtp_server)["soon@later.test"]
+    assert '<p class="greeting">김철수님, 안녕하세요.</p>' in body
+    assert "인프라팀 이번 주 소식" in body
+
+
+class _DroppingConnection:
+    """수신자를 거부한 뒤 연결을 끊는 서버를 흉내 내는 SMTP 연결"""
+
+    def sendmail(self, sender, recipients, message):
+        if recipients[0].startswith("refused"):
+            raise smtplib.SMTPRecipientsRefused({recipients[0]: (550, b"Mailbox unavailable")})
+
+    def rset(self):
+        raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+
+
+class _Pool:
+    def __init__(self):
+        self.released = []
+
+    def acquire(self):
+        return _DroppingConnection()
+
+    def release(self, conn, broken=False):
+        self.released.append(broken)
+
+
+def test_refused_recipient_counted_once_when_rset_fails():
+    recipients = [{"email": "refused@example.com"}, {"email": "next@example.com"}]
+    pool = _Pool()
+    results = app._send_batch(
+        pool, app.DomainThrottle(1, 0), "example.com", recipients, "news@example.com", "제목", lambda recipient: b""
+    )
+    assert [(recipient["email"], status) for recipient, status, _ in results] == [
+        ("refused@example.com", "failed"), ("next@example.com", "sent"),
+    ]
+    assert pool.released == [True, False]
+
+
+def test_interrupted_outbox_write_leaves_no_partial_body(monkeypatch):
+    def interrupted(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(app.os, "replace", interrupted)
+    with pytest.raises(OSError):
+        app._save_outbox("interrupted-issue", b"<html>full body</html>", {"template": "<html>{{name}}</html>"})
+    monkeypatch.undo()
+
+    outbox_dir = os.path.join(app.DATA_DIR, "outbox")
+    assert not [name for name in os.listdir(outbox_dir) if name.startswith("interrupted-issue")]
+    # 다음 발송에서 온전한 본문을 다시 저장
+    app._save_outbox("interrupted-issue", b"<html>full body</html>", {"template": "<html>{{name}}</html>"})
+    assert app._load_outbox("interrupted-issue") == ("<html>full body</html>", {"template": "<html>{{name}}</html>"})
@@ -0,0 +1,68 @@
+import gzip
+import io
+import json
+import os
+import zipfile
+
+import streamlit_app as app
+from newsletter_cli import build_sample_issue
+
+
+def sample_issue():
+    sections, highlight_settings, date, issue_html = build_sample_issue(merge_slots=True)
+    return {
+        "issue_number": 7, "edition": "ko", "date": date, "highlight_settings": highlight_settings,
+        "sections": sections, "html": issue_html,
+    }
+
+
+def test_store_evicts_least_recently_used_versions():
+    store = app.ArtifactStore(max_bytes=3500)
+    # 압축되지 않는 약 1KB 데이터 (gzip 머리글 포함 버전당 약 1KB)
+    for key in ("a", "b", "c"):
+        store.add(key, key, {"data.bin": os.urandom(1000)})
+    assert store.keys() == ["c", "b", "a"]
+
+    store.files("a")  # 최근 사용으로 표시
+    store.add("d", "d", {"data.bin": os.urandom(1000)})
+    assert store.keys() == ["d", "a", "c"]
+    assert store.total_bytes <= store.max_bytes
+    assert store.total_bytes == sum(len(data) for key in store.keys() for data in store.compressed_files(key).values())
+
+    # 같은 key는 교체되고 한도보다 큰 버전 하나는 그대로 보관
+    store.add("d", "d", {"data.bin": os.urandom(5000)})
+    assert store.keys() == ["d"]
+    assert store.total_bytes > store.max_bytes
+
+
+def test_issue_artifacts_round_trip_through_store_and_bundles():
+    issue = sample_issue()
+    files = app.build_issue_artifacts(issue, {"news_query_en": "AI"})
+    base_name = "중부 ATDT Weekly-제7호"
+    assert set(files) == {f"{base_name}.html", f"{base_name}-email.html", f"{base_name}.json"}
+
+    source = json.loads(files[f"{base_name}.json"])
+    assert source["sections"] == issue["sections"]
+    assert source["settings"] == {"news_query_en": "AI"}
+    assert source["email_size"]["total_bytes"] == len(files[f"{base_name}-email.html"])
+    assert "{{" not in files[f"{base_name}.html"].decode("utf-8")
+
+    store = app.ArtifactStore()
+    store.add("v1", "제7호 (ko)", files)
+    # 텍스트 자료는 압축되어 보관
+    assert store.total_bytes < sum(len(data) for data in files.values()) / 2
+    assert store.files("v1") == files
+
+    name, data, mime = app.build_export_bundle(store, ["v1"], "html")
+    assert (name, data, mime) == (f"{base_name}.html", files[f"{base_name}.html"], "text/html")
+
+    name, data, mime = app.build_export_bundle(store, ["v1"], "gzip")
+    assert name == f"{base_name}.html.gz" and mime == "application/gzip"
+    assert gzip.decompress(data) == files[f"{base_name}.html"]
+
+    name, data, mime = app.build_export_bundle(store, ["v1"], "zip")
+    assert mime == "application/zip"
+    with zipfile.ZipFile(io.BytesIO(data)) as bundle:
+        assert {info.filename: bundle.read(info) for info in bundle.infolist()} == {
+            f"제7호 (ko)/{file_name}": content for file_name, content in files.items()
+        }
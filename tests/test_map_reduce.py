@@ -0,0 +1,101 @@
+import json
+import re
+from types import SimpleNamespace
+
+import streamlit_app as app
+from newsletter_cli import StubBackendServer
+
+
+def article(i, group="news"):
+    return {
+        "title": f"{group} headline {i}", "description": f"{group} description {i}",
+        "url": f"https://example.com/{group}/{i}", "publishedAt": "2025-01-01T00:00:00Z", "source": {"name": "Example"},
+    }
+
+
+class ScoringClient:
+    """map 단계 요청마다 기사 번호로 정한 점수를 돌려주는 가짜 OpenAI 클라이언트 (broken에 든 번호가 있는 묶음은 깨진 응답)"""
+
+    def __init__(self, scores, broken=()):
+        self.scores = scores
+        self.broken = set(broken)
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, temperature):
+        ids = [int(i) for i in re.findall(r"^\s*\[(\d+)\]", messages[-1]["content"], re.MULTILINE)]
+        self.requests.append(ids)
+        if self.broken & set(ids):
+            content = "요약을 생성할 수 없습니다."
+        else:
+            content = json.dumps([{"id": i, "score": self.scores.get(i, 0), "summary": f"요약 {i}"} for i in ids], ensure_ascii=False)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=None)
+
+
+def test_fetch_paginates_up_to_page_limit():
+    server = StubBackendServer(port=0, newsapi_latency=0, naver_latency=0, openai_latency=0, jitter=0, articles=250).start()
+    original = app.NEWSAPI_BASE_URL
+    app.NEWSAPI_BASE_URL = server.url
+    try:
+        assert len(app.fetch_real_time_news("key", "AI")) == 20
+        assert server.request_counts["newsapi"] == 1
+
+        articles = app.fetch_real_time_news("key", "AI", page_size=100, pages=3)
+        assert len(articles) == 250
+        assert len({a["url"] for a in articles}) == 250
+        # 마지막 페이지가 덜 찼으므로 더 요청하지 않음
+        assert server.request_counts["newsapi"] == 4
+
+        assert len(app.fetch_real_time_news("key", "AI", page_size=100, pages=2)) == 200
+    finally:
+        app.NEWSAPI_BASE_URL = original
+        server.shutdown()
+        server.server_close()
+
+
+def test_map_reduce_chunks_and_selects_top_scores():
+    openai_articles = [article(i, "openai") for i in range(12)]
+    news_articles = [article(i) for i in range(30)] + [article(0)]  # URL 중복은 한 번만 평가
+    # 전역 번호: OpenAI 0~11, 일반 12~41
+    scores = {3: 9, 7: 8, 1: 7, 20: 10, 35: 9, 13: 8, 40: 7, 22: 6}
+    client = ScoringClient(scores)
+
+    result = app.summarize_news_map_reduce(client, news_articles, openai_articles, chunk_size=10)
+
+    assert sorted(len(ids) for ids in client.requests) == [2, 10, 10, 10, 10]
+    assert result["chunks"] == 5 and result["failed_chunks"] == 0
+    assert result["candidates"] == (12, 31)
+    assert [a["url"] for a in result["top_openai_news"]] == [f"https://example.com/openai/{i}" for i in (3, 7, 1)]
+    assert [a["url"] for a in result["top_news"]] == [f"https://example.com/news/{i}" for i in (8, 23, 1, 28, 10)]
+    assert result["top_news"][0]["description"] == "요약 20"
+    assert result["summary_language"] == "ko"
+
+
+def test_failed_chunk_is_counted_and_keeps_original_descriptions(capsys):
+    news_articles = [article(i) for i in range(20)]
+    client = ScoringClient({i: 5 for i in range(20)}, broken={0})
+
+    result = app.summarize_news_map_reduce(client, news_articles, [], chunk_size=10, top_general=20)
+
+    assert result["failed_chunks"] == 1
+    assert "기사 묶음 요약 실패 (기사 0~9번)" in capsys.readouterr().out
+    # 실패한 묶음의 기사는 점수 0, 원래 설명으로 뒤쪽에 배치
+    descriptions = [a["description"] for a in result["top_news"]]
+    assert descriptions[:10] == [f"요약 {i}" for i in range(10, 20)]
+    assert descriptions[10:] == [f"news description {i}" for i in range(10)]
+
+
+def test_news_info_headers_follow_the_edition():
+    global_news = {"top_news": [article(0)], "top_openai_news": [article(0, "openai")], "summary_language": "ko", "bodies": {}, "candidates": (12, 31)}
+    ctx = SimpleNamespace(resolve=lambda name: global_news, params={"use_translation_cache": False})
+    openai_news_info, news_info = app.build_news_info(ctx, "en")
+    assert openai_news_info.startswith("Summaries of the most important of 12 OpenAI-related")
+    assert news_info.startswith("Summaries of the most important of 31 news")
+
+    del global_news["candidates"]
+    assert app.build_news_info(ctx, "ko")[1].startswith("최근 7일 내 수집된 실제 뉴스 기사:")
+
+    def failing(name):
+        raise RuntimeError("NewsAPI 오류")
+    failed = SimpleNamespace(resolve=failing, params={})
+    assert app.build_news_info(failed, "en") == ("Failed to fetch OpenAI-related news from NewsAPI.", "Failed to fetch news from NewsAPI.")
@@ -0,0 +1,69 @@
+import json
+import os
+
+import streamlit_app as app
+
+
+def article(title, description="", url=None):
+    return {"title": title, "description": description, "url": url or f"https://example.com/{abs(hash(title))}"}
+
+
+def test_tokenize_english_words_and_korean_bigrams():
+    tokens = app.tokenize("OpenAI's <b>GPT</b>-4o launches in the 통신사, 인공지능을 a I")
+    # 영어는 소문자 단어(불용어, 한 글자 제외), 한국어는 조사가 붙은 어절도 매칭되도록 음절 bigram
+    assert tokens == ["openai", "gpt", "4o", "launches", "통신", "신사", "인공", "공지", "지능", "능을"]
+    assert set(app.tokenize("인공지능")) <= set(tokens)
+
+
+def test_bm25_orders_by_relevance_and_keeps_original_order_for_ties():
+    articles = [
+        article("Quarterly earnings roundup"),
+        article("Weather update for the weekend"),
+        article("Telecom operator expands network", "Operator adds generative AI assistant to network operations"),
+        article("Generative AI assistant launched", "A generative AI assistant for enterprise customers"),
+    ]
+    ranked = app.rank_articles(articles, "generative AI assistant", profile="", profile_weight=0)
+    assert ranked[:2] == [articles[3], articles[2]]
+    # 관련 없는 기사는 원래 순서(최신순) 유지
+    assert ranked[2:] == [articles[0], articles[1]]
+    assert app.rank_articles(articles, "generative AI assistant", top_k=1, profile="", profile_weight=0) == [articles[3]]
+
+
+def test_korean_query_matches_inflected_words():
+    articles = [article("반도체 수출 동향"), article("통신사들이 인공지능을 도입했다")]
+    assert app.rank_articles(articles, "인공지능 도입", profile="", profile_weight=0)[0] is articles[1]
+
+
+def test_evicted_documents_leave_document_frequency():
+    stats = app.IdfStatistics(name="idf_eviction_test", max_seen=2)
+    stats.update([("a", ["x", "y", "y"]), ("b", ["y"]), ("c", ["z"])])
+    assert stats.n_docs == 2
+    assert stats.df == {"y": 1, "z": 1}
+
+    # 빠졌던 문서를 다시 보면 한 번만 집계
+    stats.update([("a", ["x", "y"]), ("a", ["x", "y"])])
+    assert stats.n_docs == 2
+    assert stats.df == {"x": 1, "y": 1, "z": 1}
+
+
+def test_idf_statistics_persist_and_skip_clean_saves(monkeypatch):
+    stats = app.IdfStatistics(name="idf_persistence_test")
+    stats.update([("a", ["x", "y"]), ("b", ["y"])])
+    stats.save()
+
+    loaded = app.IdfStatistics(name="idf_persistence_test")
+    assert (loaded.n_docs, loaded.df) == (2, {"x": 1, "y": 2})
+    assert list(loaded.idf(["x", "y"])) == list(stats.idf(["x", "y"]))
+
+    writes = []
+    monkeypatch.setattr(app, "_write_atomic", lambda path, data: writes.append(path))
+    loaded.update([("a", ["x", "y"])])
+    loaded.save()
+    assert writes == []
+
+
+def test_old_idf_file_without_document_tokens_starts_fresh():
+    with open(os.path.join(app.DATA_DIR, "idf_old_format_test.json"), "w", encoding="utf-8") as f:
+        json.dump({"n_docs": 3, "df": {"x": 5}, "seen": ["a", "b", "c"]}, f)
+    stats = app.IdfStatistics(name="idf_old_format_test")
+    assert (stats.n_docs, stats.df) == (0, {})
@@ -0,0 +1,73 @@
+import time
+from types import SimpleNamespace
+
+import streamlit_app as app
+
+SECTION = "hedge_test"
+STRONG = app.MODEL_TIERS["strong"]["model"]
+FAST = app.MODEL_TIERS["fast"]["model"]
+POLICY = dict(
+    app.DEFAULT_ROUTING_POLICY, sections={SECTION: "strong"}, hedge=True, hedge_tier="fast",
+    hedge_percentile=95, hedge_min_samples=5, hedge_default_delay=0.05,
+)
+
+
+class FakeClient:
+    """주 모델(strong)은 느리고 백업 모델(fast)은 바로 응답하는 가짜 OpenAI 클라이언트"""
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, temperature):
+        time.sleep(self.delays[model])
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=model))],
+            usage=SimpleNamespace(completion_tokens=10),
+        )
+
+
+def wait_for_samples(tracker, key, count, timeout=5):
+    deadline = time.time() + timeout
+    while tracker.count(key) < count and time.time() < deadline:
+        time.sleep(0.01)
+    return tracker.count(key)
+
+
+def test_slow_primary_is_recorded_even_when_backup_wins():
+    app.get_latency_tracker.clear()
+    tracker = app.get_latency_tracker()
+    client = FakeClient({STRONG: 0.4, FAST: 0.0})
+    messages = [{"role": "user", "content": "hi"}]
+
+    for _ in range(5):
+        assert app.chat_completion(client, SECTION, messages, POLICY) == FAST
+
+    # 진 주 요청도 끝나는 대로 자기 지연 시간으로 기록됨
+    assert wait_for_samples(tracker, (SECTION, STRONG), 5) == 5
+    assert tracker.percentile((SECTION, STRONG), 50) >= 0.4
+    assert tracker.count((SECTION, FAST)) == 5
+    assert tracker.percentile((SECTION, FAST), 95) < 0.1
+
+    # 사용자 체감 지연 시간은 헤지 대기 시간 + 백업 응답 시간
+    observed = (SECTION, STRONG, "observed")
+    assert tracker.count(observed) == 5
+    assert 0.05 <= tracker.percentile(observed, 50) < 0.3
+
+    # 헤지 기준은 주 모델의 실제 지연 분포(p95)를 따르며 빠른 응답 쪽으로 줄어들지 않음
+    assert app.get_hedge_delay(SECTION, POLICY) >= 0.4
+
+    row = next(row for row in tracker.summary() if row["section"] == SECTION and row["model"] == STRONG)
+    assert row["calls"] == 5 and row["hedged"] == 5 and row["hedge_rate"] == 1.0
+    assert row["observed_p50"] < row["p50"]
+
+
+def test_fast_primary_does_not_hedge():
+    app.get_latency_tracker.clear()
+    tracker = app.get_latency_tracker()
+    client = FakeClient({STRONG: 0.0, FAST: 0.0})
+
+    assert app.chat_completion(client, SECTION, [{"role": "user", "content": "hi"}], POLICY) == STRONG
+    wait_for_samples(tracker, (SECTION, STRONG), 1)
+    row = next(row for row in tracker.summary() if row["section"] == SECTION)
+    assert (row["model"], row["count"], row["calls"], row["hedged"], row["hedge_rate"]) == (STRONG, 1, 1, 0, 0.0)
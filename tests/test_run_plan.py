@@ -0,0 +1,77 @@
+import uuid
+from collections import Counter
+
+import pytest
+
+import streamlit_app as app
+
+KEYS = ("sk-test", "news-key", "naver-id", "naver-secret", "AI", "AI 인공지능")
+
+
+def test_every_registry_entry_has_plan_hook():
+    # 실행 계획은 섹션/의존성마다 등록된 plan 훅으로만 계산됨
+    for name, spec in list(app.NEWSLETTER_SECTIONS.items()) + list(app.SECTION_DEPENDENCIES.items()):
+        assert callable(spec.get("plan")), name
+
+
+def test_plan_makes_no_requests_and_counts_calls_per_edition(monkeypatch, stub_backend):
+    monkeypatch.setattr(app, "NEWSAPI_BASE_URL", stub_backend.url)
+    monkeypatch.setattr(app, "NAVER_API_BASE_URL", stub_backend.url)
+    monkeypatch.setenv("OPENAI_BASE_URL", stub_backend.url + "/v1")
+    plan = app.plan_newsletter_run(*KEYS, issue_num=3, editions=("ko", "en"), use_evergreen_library=False)
+    assert sum(stub_backend.request_counts.values()) == 0
+
+    sections = [call for call in plan["calls"] if call["provider"] == "openai" and call["stage"].endswith(")") and "번역" not in call["stage"]]
+    # 주요 소식, AT/DT 팁, AI 활용사례, 성공 사례 x 에디션 2개
+    assert len(sections) == 8
+    assert all(call["status"] == "호출" for call in sections)
+    assert plan["llm_calls"] >= 8
+    assert plan["prompt_tokens"] > 0 and plan["cost_usd"] > 0
+    assert plan["wall_seconds_p95"] >= plan["wall_seconds_p50"] > 0
+
+
+def test_plan_reports_fallback_for_sections_without_api():
+    plan = app.plan_newsletter_run(None, None, "naver-id", "naver-secret", "AI", "AI 인공지능")
+    statuses = {call["stage"]: call["status"] for call in plan["calls"] if call["provider"] == "openai"}
+    assert statuses == {"이번 주 AT/DT 팁 (ko)": "기본 콘텐츠", "AI 활용사례 (ko)": "기본 콘텐츠", "성공 사례 (ko)": "기본 콘텐츠"}
+    assert plan["llm_calls"] == 0
+
+
+def _planned_llm_calls(plan):
+    counts = Counter()
+    for call in plan["calls"]:
+        if call["provider"] == "openai" and call["status"] == "호출":
+            counts[call["section"]] += call["count"]
+    return counts
+
+
+@pytest.mark.parametrize("main_news_mode", ["top", "map_reduce"])
+@pytest.mark.parametrize("section", list(app.NEWSLETTER_SECTIONS))
+def test_plan_hooks_match_a_real_run(section, main_news_mode, monkeypatch, stub_backend):
+    # plan 훅은 generate/resolve와 같은 분기를 손으로 따라가므로, 섹션마다 실제 실행(스텁 백엔드)의 호출과 비교
+    monkeypatch.setattr(app, "NEWSAPI_BASE_URL", stub_backend.url)
+    monkeypatch.setattr(app, "NAVER_API_BASE_URL", stub_backend.url)
+    monkeypatch.setenv("OPENAI_BASE_URL", stub_backend.url + "/v1")
+    run = uuid.uuid4().hex[:8]
+    # 검색어와 키를 매번 새로 정해 다른 테스트의 캐시(마지막 정상 결과, 번역, 클라이언트)와 섞이지 않게 함
+    keys = (f"sk-{run}", "news-key", "naver-id", "naver-secret", f"AI {run}", f"AI 인공지능 {run}")
+    options = dict(
+        issue_num=3, editions=("ko", "en"), sections=[section], main_news_mode=main_news_mode,
+        use_evergreen_library=False, use_thumbnails=False,
+    )
+    # 첫 실행으로 마지막 정상 결과를 남겨 계획이 실제와 같은 기사로 계산되게 하고, 번역 캐시는 비움
+    app.generate_newsletter_editions(*keys, **options)
+    translations = app.get_persistent_cache("translations", max_entries=20000)
+    for key, _ in translations.items():
+        translations.delete(key)
+
+    plan = app.plan_newsletter_run(*keys, **options)
+    called = Counter()
+    original = app.chat_completion
+    monkeypatch.setattr(app, "chat_completion", lambda client, name, messages, policy=None: called.update([name]) or original(client, name, messages, policy))
+    before = dict(stub_backend.request_counts)
+    app.generate_newsletter_editions(*keys, **options)
+
+    assert _planned_llm_calls(plan) == called
+    searched = {provider for provider in ("newsapi", "naver") if stub_backend.request_counts[provider] > before[provider]}
+    assert {call["provider"] for call in plan["calls"] if call["status"] == "호출" and call["provider"] in ("newsapi", "naver")} == searched
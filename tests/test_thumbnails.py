@@ -0,0 +1,98 @@
+import email
+
+from PIL import Image
+
+import streamlit_app as app
+
+
+def thumbnail_document(key):
+    return f'<h3>기사 제목</h3><img class="news-thumb" src="thumbnail:{key}" alt=""><p><a href="https://example.com/a">원문 보기</a></p>'
+
+
+def test_thumbnail_is_resized_to_thumbnail_width(stub_backend):
+    url = f"{stub_backend.url}/images/101/1.jpg"
+    thumbnails = app.fetch_thumbnails([url])
+
+    entry = thumbnails[url]
+    # 1200x630 원본을 비율을 유지하며 폭 THUMBNAIL_WIDTH로 축소
+    assert (entry["width"], entry["height"]) == (app.THUMBNAIL_WIDTH, 105)
+    with Image.open(app._thumbnail_path(entry["key"])) as image:
+        assert image.format == "JPEG"
+        assert image.size == (app.THUMBNAIL_WIDTH, 105)
+    assert entry["bytes"] < len(stub_backend.image("/images/101/1.jpg"))
+
+
+def test_second_run_uses_disk_cache(stub_backend):
+    urls = [f"{stub_backend.url}/images/102/{i}.jpg" for i in range(3)]
+    first = app.fetch_thumbnails(urls)
+    assert stub_backend.request_counts["images"] == 3
+
+    second = app.fetch_thumbnails(urls)
+    assert second == first
+    assert stub_backend.request_counts["images"] == 3
+
+
+def test_broken_and_non_image_urls_are_skipped(stub_backend):
+    good = f"{stub_backend.url}/images/103/1.jpg"
+    missing = f"{stub_backend.url}/images/103/missing.png"
+    page = f"{stub_backend.url}/articles/103/1"
+    thumbnails = app.fetch_thumbnails([good, missing, page, "not-a-url"])
+
+    assert list(thumbnails) == [good]
+    # 실패한 URL은 일정 시간 동안 다시 요청하지 않음
+    before = dict(stub_backend.request_counts)
+    assert list(app.fetch_thumbnails([missing, page])) == []
+    assert stub_backend.request_counts == before
+
+
+def test_page_image_from_article_page(stub_backend):
+    page = f"{stub_backend.url}/naver/104/2"
+    images = app.fetch_page_images([page])
+    assert images == {page: f"{stub_backend.url}/images/104/2.jpg"}
+
+    thumbnails = app.fetch_thumbnails(list(images.values()))
+    assert thumbnails[images[page]]["width"] == app.THUMBNAIL_WIDTH
+
+
+def test_inline_embedding_respects_budget(stub_backend):
+    url = f"{stub_backend.url}/images/105/1.jpg"
+    key = app.fetch_thumbnails([url])[url]["key"]
+    document = thumbnail_document(key)
+
+    inlined, result = app.resolve_thumbnail_sources(document, "inline")
+    assert result["inlined"] == [key]
+    assert 'src="data:image/jpeg;base64,' in inlined and "thumbnail:" not in inlined
+
+    dropped, result = app.resolve_thumbnail_sources(document, "inline", budget_bytes=len(document.encode("utf-8")) + 100)
+    assert result["dropped"] == [key]
+    assert "<img" not in dropped and "원문 보기" in dropped
+
+
+def test_cid_embedding_builds_multipart_related(stub_backend):
+    url = f"{stub_backend.url}/images/106/1.jpg"
+    key = app.fetch_thumbnails([url])[url]["key"]
+
+    html_content, result = app.resolve_thumbnail_sources(thumbnail_document(key), "cid")
+    assert result["attached"] == [key]
+    assert f'src="cid:thumb-{key}@aidt-weekly"' in html_content
+
+    related = app.encode_related_parts(html_content)
+    message = app.build_mime_message(
+        "뉴스레터 <newsletter@example.com>", {"email": "reader@example.com", "name": ""}, "제목",
+        app.encode_mime_body(html_content.encode("utf-8")), related
+    )
+    parsed = email.message_from_bytes(message)
+    assert parsed.get_content_type() == "multipart/related"
+    html_part, image_part = parsed.get_payload()
+    assert html_part.get_content_type() == "text/html"
+    assert image_part.get_content_type() == "image/jpeg"
+    assert image_part["Content-ID"] == f"<thumb-{key}@aidt-weekly>"
+    with open(app._thumbnail_path(key), "rb") as f:
+        assert image_part.get_payload(decode=True) == f.read()
+
+
+def test_missing_thumbnail_file_is_dropped():
+    document, result = app.resolve_thumbnail_sources(thumbnail_document("0123456789abcdef-200"), "cid")
+    assert result["dropped"] == ["0123456789abcdef-200"]
+    assert "<img" not in document
+    assert app.encode_related_parts(document) is None
@@ -0,0 +1,96 @@
+import json
+import re
+import uuid
+
+import pytest
+from openai import OpenAI
+
+import streamlit_app as app
+
+
+def articles(count):
+    run = uuid.uuid4().hex[:8]
+    return [
+        {"title": f"Headline {i}", "description": f"Description {i}", "url": f"https://example.com/{run}/{i}"}
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def translator(stub_backend, monkeypatch):
+    """스텁 OpenAI 클라이언트와 번역 요청마다 보낸 기사 번호 목록"""
+    requests = []
+    original = stub_backend.openai_response
+
+    def recording(request):
+        requests.append([int(i) for i in re.findall(r'"id": (\d+)', request["messages"][-1]["content"])])
+        return original(request)
+
+    monkeypatch.setattr(stub_backend, "openai_response", recording)
+    return OpenAI(api_key="sk-test", base_url=stub_backend.url + "/v1", max_retries=0), requests
+
+
+def reply_with(stub_backend, monkeypatch, content):
+    """스텁이 다음 번역 요청 한 번에만 content를 그대로 응답하게 합니다."""
+    original = stub_backend.openai_response
+    replies = [content]
+
+    def fixed(request):
+        response = original(request)
+        if replies:
+            response["choices"][0]["message"]["content"] = replies.pop()
+        return response
+
+    monkeypatch.setattr(stub_backend, "openai_response", fixed)
+
+
+def test_cached_articles_skip_the_llm_call(translator):
+    client, requests = translator
+    batch = articles(3)
+
+    first = app.translate_articles(client, batch, "ko")
+    assert requests == [[0, 1, 2]]
+    assert [a["title"] for a in first] == ["스텁 제목 0", "스텁 제목 1", "스텁 제목 2"]
+    assert [a["original_title"] for a in first] == ["Headline 0", "Headline 1", "Headline 2"]
+
+    assert app.translate_articles(client, batch, "ko") == first
+    assert len(requests) == 1
+
+
+def test_one_batched_call_covers_only_the_misses(translator):
+    client, requests = translator
+    cached, new = articles(3), articles(2)
+    app.translate_articles(client, cached, "ko")
+
+    translated = app.translate_articles(client, cached[:2] + new + cached[2:], "ko")
+    # 두 번째 호출은 캐시에 없는 2건만 한 번에 번역
+    assert requests[1:] == [[0, 1]]
+    assert [a["original_title"] for a in translated] == ["Headline 0", "Headline 1", "Headline 0", "Headline 1", "Headline 2"]
+
+    app.translate_articles(client, articles(45), "ko", batch_size=20)
+    assert sorted(len(ids) for ids in requests[2:]) == [5, 20, 20]
+
+
+def test_partial_reply_keeps_untranslated_originals(translator, stub_backend, monkeypatch):
+    client, requests = translator
+    batch = articles(3)
+    reply_with(stub_backend, monkeypatch, json.dumps([{"id": 1, "title": "번역된 제목", "description": "번역된 설명"}], ensure_ascii=False))
+
+    translated = app.translate_articles(client, batch, "ko")
+    assert [a["title"] for a in translated] == ["Headline 0", "번역된 제목", "Headline 2"]
+    assert "original_title" not in translated[0]
+
+    # 응답에서 빠진 기사만 다음 실행에서 다시 번역
+    translated = app.translate_articles(client, batch, "ko")
+    assert requests == [[0, 1, 2], [0, 1]]
+    assert [a["title"] for a in translated] == ["스텁 제목 0", "번역된 제목", "스텁 제목 1"]
+
+
+def test_malformed_reply_leaves_originals_and_caches_nothing(translator, stub_backend, monkeypatch):
+    client, _ = translator
+    batch = articles(2)
+    reply_with(stub_backend, monkeypatch, '[{"id": 0, "title": "잘린 응답')
+
+    assert app.translate_articles(client, batch, "ko") == batch
+    cache = app.get_persistent_cache("translations", max_entries=20000)
+    assert not any(app._translation_cache_key(article, "ko") in cache for article in batch)